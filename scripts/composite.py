@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Composite Group Engine
+Builds composite groups (Appendix C) from long-format shot data.
+
+Input is one row per shot, as in data/simulated/group_size_simulation.csv:
+    group_id, shot_id, x_inches, y_inches
+
+Each group is moved so its own center sits at the origin, and then all the
+shots are pooled. Nothing here loops over groups in Python: group labels
+are turned into integer codes once, and per-group sums, centers and radii
+come from np.bincount. Per-group ES uses padded blocks of groups with
+similar shot counts.
+
+An optional `by` column (rifle, session, load, ...) builds one composite
+per value in the same pass, so a whole season of range days can be
+processed at once.
+
+Usage:
+    from composite import composite_groups, composite_from_csv
+    result = composite_from_csv('data/simulated/group_size_simulation.csv')
+    print(result.es, result.mr, result.sigma)
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from group_metrics import as_shots, extreme_spread
+
+
+class CompositeResult(NamedTuple):
+    """Composite and per-group statistics from composite_groups()."""
+    # Composite statistics, one entry per composite (scalar-like arrays
+    # of length 1 when `by` is not given)
+    composite_labels: np.ndarray   # Value of `by` for each composite
+    n_shots: np.ndarray            # Shots in each composite
+    n_groups: np.ndarray           # Groups in each composite
+    es: np.ndarray                 # Composite extreme spread
+    mr: np.ndarray                 # Composite mean radius
+    sigma: np.ndarray              # Pooled per-axis σ (n - groups degrees of freedom)
+
+    # Per-group statistics, one entry per group
+    group_labels: np.ndarray       # Group id of each group
+    group_composite: np.ndarray    # Index into composite_labels for each group
+    group_n: np.ndarray            # Shots in each group
+    group_centers: np.ndarray      # Center of each group, shape (n_groups, 2)
+    group_es: np.ndarray           # ES of each group
+    group_mr: np.ndarray           # MR of each group about its own center
+    group_sigma: np.ndarray        # Per-axis σ of each group (n - 1 degrees of freedom)
+
+    # Per-shot data, in input order
+    shots: np.ndarray              # Shots re-centered on their group center, (n, 2)
+    shot_group: np.ndarray         # Index into group_labels for each shot
+
+
+def factorize(labels):
+    """Integer codes 0..k-1 and the k unique labels for an array of labels."""
+    uniques, codes = np.unique(np.asarray(labels), return_inverse=True)
+    return codes.ravel(), uniques
+
+
+def segment_extreme_spread(shots, codes, n_segments):
+    """
+    ES of each segment of a ragged set of shots, where codes[i] says which
+    segment shot i belongs to.
+
+    Segments are bucketed by shot count (powers of two) and each bucket is
+    padded into one (segments, width, 2) block by repeating a segment's last
+    shot, which cannot change its ES. Each block then goes through
+    extreme_spread(), which picks all-pairs or convex hull by width.
+    """
+    shots = as_shots(shots)
+    order = np.argsort(codes, kind='stable')
+    sorted_shots = shots[order]
+    counts = np.bincount(codes, minlength=n_segments)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    es = np.zeros(n_segments)
+    occupied = counts > 0
+    buckets = np.zeros(n_segments, dtype=int)
+    buckets[occupied] = np.ceil(np.log2(counts[occupied])).astype(int)
+    for bucket in np.unique(buckets[occupied]):
+        segments = np.flatnonzero(occupied & (buckets == bucket))
+        width = counts[segments].max()
+        index = offsets[segments, np.newaxis] + np.minimum(
+            np.arange(width), counts[segments, np.newaxis] - 1)
+        es[segments] = extreme_spread(sorted_shots[index])
+    return es
+
+
+def composite_groups(group_ids, shots, by=None):
+    """
+    Re-center every group on its own center and pool the shots.
+
+    group_ids: label of the group each shot belongs to, shape (n,)
+    shots:     shot coordinates, shape (n, 2)
+    by:        optional label per shot (rifle, session, ...). One composite
+               is built per distinct value; groups are identified by the
+               (by, group_id) pair so group ids may repeat across composites.
+    """
+    shots = as_shots(shots)
+    if shots.ndim != 2:
+        raise ValueError(f"shots must have shape (n, 2), got {shots.shape}")
+    n = len(shots)
+
+    if by is None:
+        composite_codes = np.zeros(n, dtype=np.intp)
+        composite_labels = np.array([None], dtype=object)
+    else:
+        composite_codes, composite_labels = factorize(by)
+    raw_group_codes, raw_group_labels = factorize(group_ids)
+
+    # Groups are (composite, group id) pairs
+    pair = composite_codes * len(raw_group_labels) + raw_group_codes
+    unique_pairs, shot_group = np.unique(pair, return_inverse=True)
+    shot_group = shot_group.ravel()
+    n_groups_total = len(unique_pairs)
+    group_composite = unique_pairs // len(raw_group_labels)
+    group_labels = raw_group_labels[unique_pairs % len(raw_group_labels)]
+    n_composites = len(composite_labels)
+
+    # Per-group centers and radii through segmented sums
+    group_n = np.bincount(shot_group, minlength=n_groups_total)
+    group_centers = np.stack([
+        np.bincount(shot_group, weights=shots[:, 0], minlength=n_groups_total),
+        np.bincount(shot_group, weights=shots[:, 1], minlength=n_groups_total),
+    ], axis=-1) / group_n[:, np.newaxis]
+
+    centered = shots - group_centers[shot_group]
+    r2 = np.einsum('ij,ij->i', centered, centered)
+    radius = np.sqrt(r2)
+    group_r2 = np.bincount(shot_group, weights=r2, minlength=n_groups_total)
+    group_mr = np.bincount(shot_group, weights=radius,
+                           minlength=n_groups_total) / group_n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        group_sigma = np.sqrt(group_r2 / (2 * (group_n - 1)))
+    group_es = segment_extreme_spread(shots, shot_group, n_groups_total)
+
+    # Composite statistics. Every group is centered, so each composite's
+    # center is the origin and its MR is the mean of the centered radii.
+    n_shots = np.bincount(composite_codes, minlength=n_composites)
+    n_groups = np.bincount(group_composite, minlength=n_composites)
+    mr = np.bincount(composite_codes, weights=radius, minlength=n_composites) / n_shots
+    pooled_r2 = np.bincount(group_composite, weights=group_r2, minlength=n_composites)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sigma = np.sqrt(pooled_r2 / (2 * (n_shots - n_groups)))
+    es = segment_extreme_spread(centered, composite_codes, n_composites)
+
+    return CompositeResult(
+        composite_labels=composite_labels,
+        n_shots=n_shots,
+        n_groups=n_groups,
+        es=es,
+        mr=mr,
+        sigma=sigma,
+        group_labels=group_labels,
+        group_composite=group_composite,
+        group_n=group_n,
+        group_centers=group_centers,
+        group_es=group_es,
+        group_mr=group_mr,
+        group_sigma=group_sigma,
+        shots=centered,
+        shot_group=shot_group,
+    )
+
+
+def composite_from_csv(path, group_column='group_id', x_column='x_inches',
+                       y_column='y_inches', by=None):
+    """Build composites from a long-format CSV (one row per shot)."""
+    import pandas as pd
+
+    columns = [group_column, x_column, y_column] + ([by] if by else [])
+    data = pd.read_csv(path, usecols=columns)
+    shots = data[[x_column, y_column]].to_numpy(dtype=float)
+    return composite_groups(
+        data[group_column].to_numpy(),
+        shots,
+        by=data[by].to_numpy() if by else None,
+    )
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Compiled Group Kernels
+Optional Numba backend for the group computations that do not vectorize.
+
+Most of group_metrics is broadcast NumPy, but a few steps walk one group at
+a time in Python: the convex hull and rotating-calipers ES of large groups,
+Welzl's enclosing circle, and the running (prefix) ES. When Numba is
+importable, this module compiles those loops and group_metrics /
+prefix_metrics call them instead; the results are the same numbers, since
+each kernel follows the NumPy code's arithmetic step for step. Without
+Numba nothing changes, and nothing here is needed to run the lessons.
+
+The backend is chosen by:
+- set_backend('numba' | 'numpy' | 'auto') from code, or
+- the GROUP_METRICS_BACKEND environment variable (same values).
+'auto' (the default) uses Numba when it is installed. Asking for 'numba'
+through set_backend() without Numba installed raises ImportError; through
+the environment variable it quietly falls back to NumPy, so a shared
+setting never breaks a machine without Numba.
+
+Usage:
+    import group_kernels
+    group_kernels.set_backend('numpy')      # force the reference implementation
+    print(group_kernels.get_backend())
+"""
+
+import math
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('auto', 'numpy', 'numba')
+BACKEND_VARIABLE = 'GROUP_METRICS_BACKEND'
+
+_backend = None
+
+
+def available_backends():
+    """Backends that can run here."""
+    return ('numpy', 'numba') if numba is not None else ('numpy',)
+
+
+def set_backend(name):
+    """Select 'numba', 'numpy' or 'auto' (Numba when installed)."""
+    if name not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {name!r}")
+    if name == 'numba' and numba is None:
+        raise ImportError("the 'numba' backend needs the numba package")
+    global _backend
+    _backend = _resolve(name)
+
+
+def get_backend():
+    """The active backend: 'numba' or 'numpy'."""
+    global _backend
+    if _backend is None:
+        name = os.environ.get(BACKEND_VARIABLE, 'auto').lower()
+        if name not in BACKENDS:
+            raise ValueError(f"{BACKEND_VARIABLE} must be one of {BACKENDS}, got {name!r}")
+        _backend = _resolve(name)
+    return _backend
+
+
+def compiled():
+    """True when group computations should use the compiled kernels."""
+    return get_backend() == 'numba'
+
+
+def _resolve(name):
+    if name == 'numpy' or numba is None:
+        return 'numpy'
+    return 'numba'
+
+
+def _jit(function):
+    """Compile with Numba when available; otherwise keep the plain function."""
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+# Kernels. Plain loops over float64 arrays, written in the subset of Python
+# that Numba compiles. Flat inputs are (n_groups, n_shots, 2).
+
+@_jit
+def _dist2(ax, ay, bx, by):
+    return (ax - bx)**2 + (ay - by)**2
+
+
+@_jit
+def _cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+@_jit
+def es_pairs(flat):
+    """All-pairs ES of every group."""
+    n_groups, n_shots = flat.shape[0], flat.shape[1]
+    es = np.zeros(n_groups)
+    for g in range(n_groups):
+        best = 0.0
+        for i in range(n_shots):
+            for j in range(i + 1, n_shots):
+                dx = flat[g, i, 0] - flat[g, j, 0]
+                dy = flat[g, i, 1] - flat[g, j, 1]
+                d2 = dx * dx + dy * dy
+                if d2 > best:
+                    best = d2
+        es[g] = math.sqrt(best)
+    return es
+
+
+@_jit
+def convex_hull(points):
+    """
+    Counter-clockwise hull of one group (Andrew's monotone chain), starting
+    at the lowest-x, lowest-y shot, as group_metrics.convex_hull() returns it.
+    """
+    n = points.shape[0]
+    # Sort by x, then y (stable sort on y, then on x)
+    order = np.argsort(points[:, 1], kind='mergesort')
+    order = order[np.argsort(points[order, 0], kind='mergesort')]
+    # Drop exact duplicates
+    unique = np.empty((n, 2))
+    count = 0
+    for k in range(n):
+        x, y = points[order[k], 0], points[order[k], 1]
+        if count == 0 or x != unique[count - 1, 0] or y != unique[count - 1, 1]:
+            unique[count, 0] = x
+            unique[count, 1] = y
+            count += 1
+    if count <= 2:
+        return unique[:count].copy()
+
+    chain = np.empty((2 * count, 2))
+    size = 0
+    for k in range(count):  # Lower hull
+        while size >= 2 and _cross(chain[size - 2, 0], chain[size - 2, 1],
+                                   chain[size - 1, 0], chain[size - 1, 1],
+                                   unique[k, 0], unique[k, 1]) <= 0:
+            size -= 1
+        chain[size] = unique[k]
+        size += 1
+    lower = size
+    for k in range(count - 1, -1, -1):  # Upper hull
+        while size >= lower + 2 and _cross(chain[size - 2, 0], chain[size - 2, 1],
+                                           chain[size - 1, 0], chain[size - 1, 1],
+                                           unique[k, 0], unique[k, 1]) <= 0:
+            size -= 1
+        chain[size] = unique[k]
+        size += 1
+    # Both chains end on the other's first point
+    hull = np.empty((size - 2, 2))
+    hull[:lower - 1] = chain[:lower - 1]
+    hull[lower - 1:] = chain[lower:size - 1]
+    return hull
+
+
+@_jit
+def hull_diameter(hull):
+    """Rotating-calipers diameter of a counter-clockwise hull."""
+    h = hull.shape[0]
+    if h < 2:
+        return 0.0
+    if h == 2:
+        return math.hypot(hull[1, 0] - hull[0, 0], hull[1, 1] - hull[0, 1])
+    best = 0.0
+    j = 1
+    for i in range(h):
+        i_next = (i + 1) % h
+        ax, ay = hull[i, 0], hull[i, 1]
+        bx, by = hull[i_next, 0], hull[i_next, 1]
+        while (_cross(ax, ay, bx, by, hull[(j + 1) % h, 0], hull[(j + 1) % h, 1])
+               > _cross(ax, ay, bx, by, hull[j, 0], hull[j, 1])):
+            j = (j + 1) % h
+        best = max(best, _dist2(ax, ay, hull[j, 0], hull[j, 1]),
+                   _dist2(bx, by, hull[j, 0], hull[j, 1]))
+    return math.sqrt(best)
+
+
+@_jit
+def es_hull(flat):
+    """Convex-hull ES of every group."""
+    es = np.empty(flat.shape[0])
+    for g in range(flat.shape[0]):
+        es[g] = hull_diameter(convex_hull(flat[g]))
+    return es
+
+
+@_jit
+def welzl(points):
+    """
+    Minimum enclosing circle (center x, center y, radius) of points already
+    in visiting order; the same iteration as group_metrics._welzl().
+    """
+    n = points.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan
+    eps = 1e-12
+    cx, cy, r2 = points[0, 0], points[0, 1], 0.0
+    for i in range(1, n):
+        if _dist2(points[i, 0], points[i, 1], cx, cy) <= r2 * (1 + 1e-10) + eps:
+            continue
+        cx, cy, r2 = points[i, 0], points[i, 1], 0.0
+        for j in range(i):
+            if _dist2(points[j, 0], points[j, 1], cx, cy) <= r2 * (1 + 1e-10) + eps:
+                continue
+            cx = (points[i, 0] + points[j, 0]) / 2
+            cy = (points[i, 1] + points[j, 1]) / 2
+            r2 = _dist2(points[i, 0], points[i, 1], cx, cy)
+            for k in range(j):
+                if _dist2(points[k, 0], points[k, 1], cx, cy) <= r2 * (1 + 1e-10) + eps:
+                    continue
+                cx, cy = _circle_through(points[i], points[j], points[k])
+                r2 = _dist2(points[i, 0], points[i, 1], cx, cy)
+    return cx, cy, math.sqrt(r2)
+
+
+@_jit
+def _circle_through(a, b, c):
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    d = 2 * (bx * cy - by * cx)
+    if d == 0:
+        # Collinear: the circle spans the two points furthest apart
+        p, q = a, b
+        if _dist2(a[0], a[1], c[0], c[1]) > _dist2(p[0], p[1], q[0], q[1]):
+            p, q = a, c
+        if _dist2(b[0], b[1], c[0], c[1]) > _dist2(p[0], p[1], q[0], q[1]):
+            p, q = b, c
+        return (p[0] + q[0]) / 2, (p[1] + q[1]) / 2
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    return a[0] + (cy * b2 - by * c2) / d, a[1] + (bx * c2 - cx * b2) / d
+
+
+@_jit
+def prefix_es(flat, centers):
+    """
+    Running ES after every shot, (n_strings, n_shots), with the same bound
+    as prefix_metrics._prefix_es(): shot n can only raise ES if its distance
+    from the string's center plus the largest earlier one exceeds it.
+    """
+    n_strings, n_shots = flat.shape[0], flat.shape[1]
+    es = np.zeros((n_strings, n_shots))
+    for g in range(n_strings):
+        mx, my = centers[g, 0], centers[g, 1]
+        current = 0.0
+        prior_reach = math.sqrt(_dist2(flat[g, 0, 0], flat[g, 0, 1], mx, my))
+        for n in range(1, n_shots):
+            reach = math.sqrt(_dist2(flat[g, n, 0], flat[g, n, 1], mx, my))
+            bound = reach + prior_reach
+            if bound * bound > current:
+                for i in range(n):
+                    dx = flat[g, i, 0] - flat[g, n, 0]
+                    dy = flat[g, i, 1] - flat[g, n, 1]
+                    d2 = dx * dx + dy * dy
+                    if d2 > current:
+                        current = d2
+            es[g, n] = math.sqrt(current)
+            prior_reach = max(prior_reach, reach)
+    return es
@@ -0,0 +1,597 @@
+#!/usr/bin/env python3
+"""
+Shared Group Metrics Engine
+Vectorized extreme spread (ES), mean radius (MR) and group centers.
+
+Every simulation script used to carry its own `for i / for j` loop to find
+the two shots furthest apart, one group at a time. This module does the same
+math for a whole stack of groups in one broadcast pass.
+
+Shot arrays are shaped (..., n_shots, 2), where the last axis holds (x, y).
+A single group is simply shape (n_shots, 2); a batch is (n_groups, n_shots, 2).
+Groups of different sizes can share one batch by padding the shorter ones
+with rows of NaN, which ES, MR and the group centers skip.
+
+Small groups use a vectorized all-pairs search. Large groups (such as the
+composite groups in Appendix C, which can hold thousands of shots) switch
+to a convex hull followed by a rotating-calipers diameter search, which is
+O(n log n) in time and O(n) in memory.
+
+The per-group loops that do not vectorize (hull ES, Welzl's circle) run as
+compiled kernels when Numba is installed; see group_kernels.py.
+
+Usage from a plot script (scripts/ is on sys.path when a script is run):
+    from group_metrics import extreme_spread, group_metrics
+"""
+
+import itertools
+from typing import NamedTuple
+
+import numpy as np
+from scipy.special import gammaln
+
+import group_kernels
+
+# Upper bound on the number of pairwise differences held in memory at once.
+# Large batches are processed in slices of groups so the all-pairs ES stays
+# within a few tens of megabytes regardless of how many groups are passed.
+PAIR_CHUNK_SIZE = 2**22
+
+# Groups with more shots than this use the convex hull ES path when
+# extreme_spread() is called with method='auto'.
+HULL_THRESHOLD = 64
+
+# Groups with at most this many shots get their minimum enclosing circle by
+# testing every 2- and 3-shot candidate circle at once (vectorized across
+# groups); larger groups use Welzl's algorithm on their convex hull.
+ENCLOSING_BRUTE_FORCE_MAX = 8
+
+
+class EnclosingCircle(NamedTuple):
+    """Minimum enclosing circle of each group, from enclosing_circle()."""
+    center: np.ndarray       # Circle center (x, y), shape (..., 2)
+    radius: np.ndarray       # Circle radius, shape (...)
+
+
+class SigmaEstimates(NamedTuple):
+    """Dispersion estimates for each group, from estimate_sigma()."""
+    rsd: np.ndarray          # Radial standard deviation sqrt(var_x + var_y)
+    rayleigh_sigma: np.ndarray   # Per-axis σ, bias-corrected (unbiased under normality)
+    rayleigh_sigma_raw: np.ndarray   # Per-axis σ before the bias correction
+    sd_major: np.ndarray     # SD along the covariance ellipse's major axis
+    sd_minor: np.ndarray     # SD along the minor axis
+    angle: np.ndarray        # Major-axis direction, radians from +x in (-π/2, π/2]
+    cov: np.ndarray          # Sample covariance matrix, shape (..., 2, 2)
+
+
+class ShapeMetrics(NamedTuple):
+    """Bounding-box and per-axis shape of each group, from shape_metrics()."""
+    width: np.ndarray        # Horizontal extent (max x - min x)
+    height: np.ndarray       # Vertical extent (max y - min y)
+    figure_of_merit: np.ndarray  # (width + height) / 2
+    aspect_ratio: np.ndarray     # height / width; above 1 means vertical stringing, 1 for one hole
+    sd_x: np.ndarray         # Horizontal sample SD
+    sd_y: np.ndarray         # Vertical sample SD
+
+
+class GroupMetrics(NamedTuple):
+    """Per-group results from group_metrics()."""
+    es: np.ndarray           # Extreme spread, shape (...)
+    mr: np.ndarray           # Mean radius about the group center, shape (...)
+    mr_aim: np.ndarray       # Mean radius about the aim point, shape (...)
+    center: np.ndarray       # Group center (x, y), shape (..., 2)
+
+
+def as_shots(shots):
+    """Return `shots` as a float array of shape (..., n_shots, 2)."""
+    shots = np.asarray(shots, dtype=float)
+    if shots.ndim < 2 or shots.shape[-1] != 2:
+        raise ValueError(
+            f"shots must have shape (..., n_shots, 2), got {shots.shape}"
+        )
+    return shots
+
+
+def shots_from_xy(x, y):
+    """Stack separate x and y arrays of shape (..., n_shots) into shots."""
+    return np.stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)], axis=-1)
+
+
+def group_centers(shots):
+    """Center (mean point of impact) of each group, shape (..., 2)."""
+    return _nan_mean(as_shots(shots), axis=-2)
+
+
+def _nan_mean(values, axis):
+    """Mean skipping NaN padding; NaN where nothing is left, without a warning."""
+    present = ~np.isnan(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(present, values, 0.0).sum(axis=axis) / present.sum(axis=axis)
+
+
+def convex_hull(points):
+    """
+    Convex hull of one group's shots, shape (n_points, 2), returned as hull
+    vertices in counter-clockwise order (Andrew's monotone chain).
+
+    Shots strictly inside the quadrilateral spanned by the left-, right-,
+    top- and bottom-most shots can never be on the hull, so they are
+    discarded in one vectorized pass before the O(n log n) chain is built.
+    """
+    points = as_shots(points)
+    if points.ndim != 2:
+        raise ValueError(f"convex_hull takes one group, got shape {points.shape}")
+    points = _discard_interior(points)
+    points = np.unique(points, axis=0)  # Sorted by x, then y
+    if len(points) <= 2:
+        return points
+
+    pts = [tuple(p) for p in points]
+
+    def build(sequence):
+        chain = []
+        for p in sequence:
+            while len(chain) >= 2 and _cross(chain[-2], chain[-1], p) <= 0:
+                chain.pop()
+            chain.append(p)
+        return chain
+
+    lower = build(pts)
+    upper = build(reversed(pts))
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def hull_diameter(hull):
+    """
+    Largest distance between two vertices of a counter-clockwise convex
+    hull, found with rotating calipers in O(h) steps.
+    """
+    hull = np.asarray(hull, dtype=float)
+    h = len(hull)
+    if h < 2:
+        return 0.0
+    if h == 2:
+        return float(np.hypot(*(hull[1] - hull[0])))
+
+    pts = [tuple(p) for p in hull]
+    best = 0.0
+    j = 1
+    for i in range(h):
+        i_next = (i + 1) % h
+        # Advance the opposite caliper while the triangle area keeps growing
+        while (_cross(pts[i], pts[i_next], pts[(j + 1) % h])
+               > _cross(pts[i], pts[i_next], pts[j])):
+            j = (j + 1) % h
+        best = max(best, _dist2(pts[i], pts[j]), _dist2(pts[i_next], pts[j]))
+    return float(np.sqrt(best))
+
+
+def extreme_spread(shots, method='auto'):
+    """
+    Extreme spread of each group: the largest center-to-center distance
+    between any two shots. Groups with fewer than two shots (NaN padding
+    rows do not count) have ES = 0.
+
+    method='pairs' checks every pair of shots (vectorized, O(n²) per group),
+    method='hull' uses convex_hull() + hull_diameter() (O(n log n) per group)
+    and method='auto' picks 'hull' when groups hold more than HULL_THRESHOLD
+    shots.
+    """
+    shots = as_shots(shots)
+    n_shots = shots.shape[-2]
+    if method == 'auto':
+        method = 'hull' if n_shots > HULL_THRESHOLD else 'pairs'
+    if method not in ('pairs', 'hull'):
+        raise ValueError(f"method must be 'auto', 'pairs' or 'hull', got {method!r}")
+    if n_shots < 2 or shots.size == 0:
+        return np.zeros(shots.shape[:-2])
+    shots = _fill_padding(shots)
+    if group_kernels.compiled():
+        kernel = group_kernels.es_pairs if method == 'pairs' else group_kernels.es_hull
+        flat = np.ascontiguousarray(shots.reshape(-1, n_shots, 2))
+        return kernel(flat).reshape(shots.shape[:-2])
+    if method == 'pairs':
+        return _extreme_spread_pairs(shots)
+    return _extreme_spread_hull(shots)
+
+
+def _fill_padding(shots):
+    """
+    Replace NaN padding rows with the group's first real shot, which cannot
+    change its ES (an all-padding group becomes one hole at the origin).
+    """
+    padded = np.isnan(shots).any(axis=-1)
+    if not padded.any():
+        return shots
+    first = np.argmax(~padded, axis=-1)[..., np.newaxis, np.newaxis]
+    fill = np.nan_to_num(np.take_along_axis(shots, first, axis=-2))
+    return np.where(padded[..., np.newaxis], fill, shots)
+
+
+def _extreme_spread_pairs(shots):
+    batch_shape = shots.shape[:-2]
+    n_shots = shots.shape[-2]
+    if n_shots < 2:
+        return np.zeros(batch_shape)
+
+    flat = shots.reshape(-1, n_shots, 2)
+    first, second = np.triu_indices(n_shots, k=1)
+    groups_per_chunk = max(1, PAIR_CHUNK_SIZE // len(first))
+
+    es = np.empty(len(flat))
+    for start in range(0, len(flat), groups_per_chunk):
+        chunk = flat[start:start + groups_per_chunk]
+        diff = chunk[:, first, :] - chunk[:, second, :]
+        es[start:start + groups_per_chunk] = np.sqrt(
+            np.max(np.einsum('gpk,gpk->gp', diff, diff), axis=-1)
+        )
+    return es.reshape(batch_shape)
+
+
+def _extreme_spread_hull(shots):
+    batch_shape = shots.shape[:-2]
+    flat = shots.reshape(-1, shots.shape[-2], 2)
+    es = np.array([hull_diameter(convex_hull(group)) for group in flat])
+    return es.reshape(batch_shape)
+
+
+def _discard_interior(points):
+    """Drop shots strictly inside the Akl-Toussaint extreme-point quadrilateral."""
+    if len(points) < 8:
+        return points
+    corners = points[[np.argmin(points[:, 0]), np.argmin(points[:, 1]),
+                      np.argmax(points[:, 0]), np.argmax(points[:, 1])]]
+    edges = np.roll(corners, -1, axis=0) - corners
+    rel = points[:, np.newaxis, :] - corners[np.newaxis, :, :]
+    cross = edges[:, 0] * rel[..., 1] - edges[:, 1] * rel[..., 0]
+    return points[~np.all(cross > 0, axis=1)]
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _dist2(a, b):
+    return (a[0] - b[0])**2 + (a[1] - b[1])**2
+
+
+def mean_radius(shots, about='center', aim_point=(0.0, 0.0)):
+    """
+    Mean radius of each group: the average distance of every shot from
+    the group center (about='center') or from the aim point (about='aim').
+    """
+    shots = as_shots(shots)
+    if about == 'center':
+        reference = group_centers(shots)[..., np.newaxis, :]
+    elif about == 'aim':
+        reference = np.asarray(aim_point, dtype=float)
+    else:
+        raise ValueError(f"about must be 'center' or 'aim', got {about!r}")
+    offsets = shots - reference
+    return _nan_mean(np.sqrt(np.einsum('...k,...k->...', offsets, offsets)), axis=-1)
+
+
+def containment_radius(shots, fraction=0.5, about='center', aim_point=(0.0, 0.0)):
+    """
+    Radius of the smallest circle that holds at least `fraction` of each
+    group's shots: R50 (fraction=0.5, the empirical CEP), R90 and so on.
+
+    about='center' centers the circle on the group center, about='aim' on
+    the aim point. about='minimal' lets the circle move anywhere: the
+    smallest circle holding k shots is the minimum enclosing circle of some
+    k of them, so it passes through two shots as a diameter or through
+    three, and every such candidate is tested (O(n^4) per group, fine for
+    the usual 3-30 shots). With fraction=1 that is enclosing_circle().
+
+    `fraction` may be a sequence; the result then has a trailing axis with
+    one radius per fraction. The fixed-center cases use np.partition along
+    the shot axis, so each group costs O(n) rather than a full sort.
+    """
+    shots = as_shots(shots)
+    n_shots = shots.shape[-2]
+    fractions = np.atleast_1d(np.asarray(fraction, dtype=float))
+    if np.any((fractions <= 0) | (fractions > 1)):
+        raise ValueError("fraction must be in (0, 1]")
+    kth = np.ceil(fractions * n_shots - 1e-9).astype(int) - 1
+
+    if about in ('center', 'aim'):
+        if about == 'center':
+            reference = shots.mean(axis=-2, keepdims=True)
+        else:
+            reference = np.asarray(aim_point, dtype=float)
+        offsets = shots - reference
+        radii = np.sqrt(np.einsum('...k,...k->...', offsets, offsets))
+        result = np.partition(radii, kth, axis=-1)[..., kth]
+    elif about == 'minimal':
+        batch_shape = shots.shape[:-2]
+        flat = shots.reshape(int(np.prod(batch_shape)), n_shots, 2)
+        result = np.empty((len(flat), len(kth)))
+        everything = kth == n_shots - 1
+        if np.any(everything):
+            result[:, everything] = enclosing_circle(flat).radius[:, np.newaxis]
+        if not np.all(everything):
+            result[:, ~everything] = _minimal_containment(flat, kth[~everything] + 1)
+        result = result.reshape(batch_shape + (len(kth),))
+    else:
+        raise ValueError(f"about must be 'center', 'aim' or 'minimal', got {about!r}")
+
+    return result[..., 0] if np.ndim(fraction) == 0 else result
+
+
+def _minimal_containment(flat, counts):
+    """
+    Smallest radius of a circle through two shots (as diameter) or three
+    shots that holds at least counts[f] shots of each group, shape
+    (n_groups, len(counts)). Groups and candidates are processed in slices
+    of about PAIR_CHUNK_SIZE candidate-to-shot offsets.
+    """
+    n_groups, n_shots, _ = flat.shape
+    result = np.zeros((n_groups, len(counts)))  # One shot needs radius 0
+    if n_shots < 2 or np.all(counts <= 1):
+        return result
+
+    i, j = np.triu_indices(n_shots, k=1)
+    triples = np.array(list(itertools.combinations(range(n_shots), 3)),
+                       dtype=int).reshape(-1, 3)
+    n_candidates = len(i) + len(triples)
+    groups_per_chunk = max(1, PAIR_CHUNK_SIZE // (n_candidates * n_shots))
+    candidates_per_slice = max(1, PAIR_CHUNK_SIZE // (groups_per_chunk * n_shots))
+    several = counts > 1
+
+    for start in range(0, n_groups, groups_per_chunk):
+        chunk = flat[start:start + groups_per_chunk]
+        best = np.full((len(chunk), np.sum(several)), np.inf)
+        for first in range(0, n_candidates, candidates_per_slice):
+            last = min(first + candidates_per_slice, n_candidates)
+            centers, on_circle = [], []
+            if first < len(i):
+                pair = slice(first, min(last, len(i)))
+                centers.append((chunk[:, i[pair]] + chunk[:, j[pair]]) / 2)
+                on_circle.append(chunk[:, i[pair]])
+            if last > len(i):
+                triple = triples[max(first - len(i), 0):last - len(i)]
+                a, b, c = (chunk[:, triple[:, k]] for k in range(3))
+                centers.append(_circumcenter(a, b, c))
+                on_circle.append(a)
+            centers = np.concatenate(centers, axis=1)         # (groups, candidates, 2)
+            edge = np.concatenate(on_circle, axis=1) - centers
+            r2 = np.einsum('gck,gck->gc', edge, edge)
+
+            diff = chunk[:, np.newaxis, :, :] - centers[:, :, np.newaxis, :]
+            d2 = np.einsum('gcnk,gcnk->gcn', diff, diff)
+            with np.errstate(invalid='ignore'):
+                inside = np.sum(d2 <= (r2 * (1 + 1e-10) + 1e-12)[..., np.newaxis], axis=-1)
+            radius = np.where(np.isfinite(r2), np.sqrt(r2), np.inf)[..., np.newaxis]
+            holds = inside[..., np.newaxis] >= counts[several]
+            best = np.minimum(best, np.where(holds, radius, np.inf).min(axis=1))
+        result[start:start + groups_per_chunk, several] = best
+    return result
+
+
+def enclosing_circle(shots):
+    """
+    Minimum enclosing circle of each group: the smallest circle that holds
+    every shot. Some scoring systems grade groups by its diameter rather
+    than by center-to-center ES; it is never smaller than ES and at most
+    2/sqrt(3) times larger.
+
+    Small groups test every circle through two or three shots in one
+    vectorized pass. Larger groups run Welzl's randomized incremental
+    algorithm (expected linear time) on their convex hull vertices. Groups
+    with no shots get a zero circle at the origin.
+    """
+    shots = as_shots(shots)
+    batch_shape = shots.shape[:-2]
+    n_shots = shots.shape[-2]
+    flat = shots.reshape(int(np.prod(batch_shape)), n_shots, 2)
+
+    if n_shots <= ENCLOSING_BRUTE_FORCE_MAX:
+        center, radius = _enclosing_circle_brute(flat)
+    else:
+        if group_kernels.compiled():
+            circles = [_welzl_compiled(group) for group in np.ascontiguousarray(flat)]
+        else:
+            circles = [_welzl(convex_hull(group)) for group in flat]
+        center = np.array([c for c, _ in circles]).reshape(-1, 2)
+        radius = np.array([r for _, r in circles])
+    return EnclosingCircle(center=center.reshape(batch_shape + (2,)),
+                           radius=radius.reshape(batch_shape))
+
+
+def enclosing_diameter(shots):
+    """Diameter of each group's minimum enclosing circle."""
+    return 2 * enclosing_circle(shots).radius
+
+
+def _enclosing_circle_brute(flat):
+    """Every circle through two shots (as diameter) or three shots; keep the
+    smallest that holds the whole group. Groups are processed in slices so
+    that at most about PAIR_CHUNK_SIZE candidate-to-shot offsets are held
+    in memory at once."""
+    n_groups, n_shots, _ = flat.shape
+    if n_shots == 0:
+        return np.zeros((n_groups, 2)), np.zeros(n_groups)
+    if n_shots == 1:
+        return flat[:, 0, :].copy(), np.zeros(n_groups)
+
+    i, j = np.triu_indices(n_shots, k=1)
+    triples = np.array([(a, b, c) for a in range(n_shots)
+                        for b in range(a + 1, n_shots)
+                        for c in range(b + 1, n_shots)], dtype=int).reshape(-1, 3)
+    n_candidates = len(i) + len(triples)
+    groups_per_chunk = max(1, PAIR_CHUNK_SIZE // (n_candidates * n_shots))
+
+    center = np.empty((n_groups, 2))
+    radius = np.empty(n_groups)
+    for start in range(0, n_groups, groups_per_chunk):
+        chunk = flat[start:start + groups_per_chunk]
+        centers = [(chunk[:, i] + chunk[:, j]) / 2]
+        if len(triples):
+            a, b, c = (chunk[:, triples[:, k]] for k in range(3))
+            centers.append(_circumcenter(a, b, c))
+        centers = np.concatenate(centers, axis=1)            # (groups, candidates, 2)
+
+        diff = chunk[:, np.newaxis, :, :] - centers[:, :, np.newaxis, :]
+        reach = np.sqrt(np.max(np.einsum('gcnk,gcnk->gcn', diff, diff), axis=-1))
+        best = np.argmin(np.where(np.isfinite(reach), reach, np.inf), axis=1)
+        rows = np.arange(len(chunk))
+        center[start:start + groups_per_chunk] = centers[rows, best]
+        radius[start:start + groups_per_chunk] = reach[rows, best]
+    return center, radius
+
+
+def _circumcenter(a, b, c):
+    """Circumcenters of triangles abc (arrays of points); NaN when collinear."""
+    bx, by = b[..., 0] - a[..., 0], b[..., 1] - a[..., 1]
+    cx, cy = c[..., 0] - a[..., 0], c[..., 1] - a[..., 1]
+    d = 2 * (bx * cy - by * cx)
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ux = np.where(d != 0, (cy * b2 - by * c2) / d, np.nan)
+        uy = np.where(d != 0, (bx * c2 - cx * b2) / d, np.nan)
+    return np.stack([a[..., 0] + ux, a[..., 1] + uy], axis=-1)
+
+
+def _welzl(points):
+    """
+    Iterative form of Welzl's algorithm for one group. Points are visited
+    in a fixed pseudo-random order so results are reproducible.
+    """
+    if len(points) == 0:
+        return (np.nan, np.nan), np.nan
+    order = np.random.default_rng(0).permutation(len(points))
+    pts = [tuple(points[k]) for k in order]
+    eps = 1e-12
+
+    def outside(p, center, r2):
+        return _dist2(p, center) > r2 * (1 + 1e-10) + eps
+
+    center, r2 = pts[0], 0.0
+    for i in range(1, len(pts)):
+        if not outside(pts[i], center, r2):
+            continue
+        center, r2 = pts[i], 0.0
+        for j in range(i):
+            if not outside(pts[j], center, r2):
+                continue
+            center = ((pts[i][0] + pts[j][0]) / 2, (pts[i][1] + pts[j][1]) / 2)
+            r2 = _dist2(pts[i], center)
+            for k in range(j):
+                if not outside(pts[k], center, r2):
+                    continue
+                center = _circle_through(pts[i], pts[j], pts[k])
+                r2 = _dist2(pts[i], center)
+    return center, float(np.sqrt(r2))
+
+
+def _welzl_compiled(group):
+    """_welzl(convex_hull(group)) through the compiled kernels."""
+    hull = group_kernels.convex_hull(group)
+    order = np.random.default_rng(0).permutation(len(hull))
+    x, y, r = group_kernels.welzl(np.ascontiguousarray(hull[order]))
+    return (x, y), r
+
+
+def _circle_through(a, b, c):
+    """Center of the smallest circle with a, b and c on or inside it, where
+    a and b are known to lie on its boundary."""
+    bx, by = b[0] - a[0], b[1] - a[1]
+    cx, cy = c[0] - a[0], c[1] - a[1]
+    d = 2 * (bx * cy - by * cx)
+    if d == 0:
+        # Collinear: the circle spans the two points furthest apart
+        pairs = [(a, b), (a, c), (b, c)]
+        p, q = max(pairs, key=lambda pq: _dist2(*pq))
+        return ((p[0] + q[0]) / 2, (p[1] + q[1]) / 2)
+    b2, c2 = bx * bx + by * by, cx * cx + cy * cy
+    return (a[0] + (cy * b2 - by * c2) / d, a[1] + (bx * c2 - cx * b2) / d)
+
+
+def estimate_sigma(shots):
+    """
+    Estimate dispersion back from measured groups, all groups in one pass.
+
+    Every estimate uses the sample covariance about the group center
+    (n - 1 degrees of freedom per axis). The Rayleigh σ pools both axes,
+    giving 2(n - 1) degrees of freedom. Its square is unbiased, but σ
+    itself is biased low for small groups, so it is divided by
+    c(k) = E[sqrt(χ²_k / k)] with k = 2(n - 1). For a 5-shot group the
+    raw estimate reads about 3% low.
+    """
+    shots = as_shots(shots)
+    n_shots = shots.shape[-2]
+    if n_shots < 2:
+        raise ValueError("need at least 2 shots per group to estimate sigma")
+
+    centered = shots - shots.mean(axis=-2, keepdims=True)
+    cov = np.einsum('...ni,...nj->...ij', centered, centered) / (n_shots - 1)
+    var_x, var_y, cov_xy = cov[..., 0, 0], cov[..., 1, 1], cov[..., 0, 1]
+
+    rsd = np.sqrt(var_x + var_y)
+    rayleigh_raw = rsd / np.sqrt(2)
+    rayleigh = rayleigh_raw / chi_bias_factor(2 * (n_shots - 1))
+
+    # Closed-form eigen-decomposition of the 2x2 covariance matrices
+    half_trace = (var_x + var_y) / 2
+    spread = np.sqrt(((var_x - var_y) / 2)**2 + cov_xy**2)
+    sd_major = np.sqrt(half_trace + spread)
+    sd_minor = np.sqrt(np.maximum(half_trace - spread, 0.0))
+    angle = 0.5 * np.arctan2(2 * cov_xy, var_x - var_y)
+
+    return SigmaEstimates(rsd=rsd, rayleigh_sigma=rayleigh,
+                          rayleigh_sigma_raw=rayleigh_raw, sd_major=sd_major,
+                          sd_minor=sd_minor, angle=angle, cov=cov)
+
+
+def chi_bias_factor(k):
+    """c(k) = E[sqrt(χ²_k / k)]; divide a k-degree-of-freedom SD by this to unbias it."""
+    k = np.asarray(k, dtype=float)
+    return np.sqrt(2 / k) * np.exp(gammaln((k + 1) / 2) - gammaln(k / 2))
+
+
+def shape_metrics(shots):
+    """
+    Width, height, figure of merit, aspect ratio and horizontal/vertical
+    SD of each group in one pass. The SDs use n - 1 and are NaN for
+    single-shot groups. The aspect ratio is infinite for zero-width groups
+    and 1 when all shots went through one hole (zero width and height).
+    """
+    shots = as_shots(shots)
+    n_shots = shots.shape[-2]
+    extent = shots.max(axis=-2) - shots.min(axis=-2)
+    width, height = extent[..., 0], extent[..., 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        aspect_ratio = np.where((width == 0) & (height == 0), 1.0, height / width)
+        sd = (shots.std(axis=-2, ddof=1) if n_shots > 1
+              else np.full(shots.shape[:-2] + (2,), np.nan))
+    return ShapeMetrics(width=width, height=height,
+                        figure_of_merit=(width + height) / 2,
+                        aspect_ratio=aspect_ratio,
+                        sd_x=sd[..., 0], sd_y=sd[..., 1])
+
+
+def group_metrics(shots, aim_point=(0.0, 0.0)):
+    """
+    ES, MR about the group center, MR about the aim point and the group
+    center for every group in one pass. Returns a GroupMetrics tuple.
+    """
+    shots = as_shots(shots)
+    center = group_centers(shots)
+
+    offsets = shots - center[..., np.newaxis, :]
+    mr = _nan_mean(np.sqrt(np.einsum('...k,...k->...', offsets, offsets)), axis=-1)
+
+    aim_offsets = shots - np.asarray(aim_point, dtype=float)
+    mr_aim = _nan_mean(np.sqrt(np.einsum('...k,...k->...', aim_offsets, aim_offsets)), axis=-1)
+
+    return GroupMetrics(es=extreme_spread(shots), mr=mr, mr_aim=mr_aim, center=center)
+
+
+def calculate_es(x, y):
+    """Extreme spread of one group given separate x and y coordinates."""
+    return float(extreme_spread(shots_from_xy(x, y)))
+
+
+def calculate_mr(x, y):
+    """Mean radius about the group center given separate x and y coordinates."""
+    return float(mean_radius(shots_from_xy(x, y)))
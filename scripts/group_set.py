@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Compact Group Storage
+GroupSet: many groups of shots in one contiguous float32 block.
+
+Group data used to travel as pairs of float64 arrays or as pandas frames
+with object-typed labels, which costs several times the memory of the
+coordinates themselves. A GroupSet holds:
+
+    coords   float32, shape (n_shots, 2), shots of group 0, then group 1, ...
+    offsets  int64,   shape (n_groups + 1,), group i is coords[offsets[i]:offsets[i+1]]
+    labels   shape (n_groups,), one label per group (integers by default)
+
+That is 8 bytes per shot plus 16 bytes per group (an int64 offset and, with
+the default integer labels, an int64 label). Indexing a group returns a
+view into `coords`, never a copy. Metrics are computed in float64, a slice
+of groups at a time, so the working memory stays bounded on 50M-shot
+archives.
+
+Usage:
+    from group_set import GroupSet
+    groups = GroupSet.from_csv('data/simulated/group_size_simulation.csv')
+    es = groups.extreme_spread()
+"""
+
+import numpy as np
+
+from composite import composite_groups, factorize, segment_extreme_spread
+
+# Shots converted to float64 at a time when computing metrics
+WORKING_CHUNK_SHOTS = 2**20
+
+
+class GroupSet:
+    """Groups of shots stored as one float32 coordinate block plus offsets."""
+
+    __slots__ = ('coords', 'offsets', 'labels')
+
+    def __init__(self, coords, offsets, labels=None):
+        coords = np.ascontiguousarray(coords, dtype=np.float32)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if coords.ndim != 2 or coords.shape[1] != 2:
+            raise ValueError(f"coords must have shape (n_shots, 2), got {coords.shape}")
+        if (offsets.ndim != 1 or len(offsets) < 1 or offsets[0] != 0
+                or offsets[-1] != len(coords) or np.any(np.diff(offsets) < 0)):
+            raise ValueError("offsets must rise from 0 to n_shots")
+        if labels is None:
+            labels = np.arange(len(offsets) - 1)
+        labels = np.asarray(labels)
+        if len(labels) != len(offsets) - 1:
+            raise ValueError("need exactly one label per group")
+        self.coords = coords
+        self.offsets = offsets
+        self.labels = labels
+
+    @classmethod
+    def from_batch(cls, shots, labels=None):
+        """GroupSet from an equal-size batch shaped (n_groups, n_shots, 2)."""
+        shots = np.asarray(shots)
+        if shots.ndim != 3 or shots.shape[-1] != 2:
+            raise ValueError(f"shots must have shape (n_groups, n_shots, 2), got {shots.shape}")
+        n_groups, n_shots, _ = shots.shape
+        offsets = np.arange(n_groups + 1, dtype=np.int64) * n_shots
+        return cls(shots.reshape(-1, 2), offsets, labels)
+
+    @classmethod
+    def from_long(cls, group_ids, shots):
+        """GroupSet from one row per shot (group label, x, y) in any order."""
+        codes, labels = factorize(group_ids)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes, minlength=len(labels))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        coords = np.asarray(shots)[order].astype(np.float32)
+        return cls(coords, offsets, labels)
+
+    @classmethod
+    def from_csv(cls, path, group_column='group_id', x_column='x_inches',
+                 y_column='y_inches'):
+        """GroupSet from a long-format CSV, read with float32 coordinates."""
+        import pandas as pd
+
+        data = pd.read_csv(path, usecols=[group_column, x_column, y_column],
+                           dtype={x_column: np.float32, y_column: np.float32})
+        return cls.from_long(data[group_column].to_numpy(),
+                             data[[x_column, y_column]].to_numpy())
+
+    @classmethod
+    def load(cls, path):
+        """Read a GroupSet written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['coords'], data['offsets'], data['labels'])
+
+    def save(self, path):
+        """Write coords, offsets and labels to an .npz file."""
+        np.savez(path, coords=self.coords, offsets=self.offsets, labels=self.labels)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """Shots of one group as a (n, 2) view into coords."""
+        if index < 0:
+            index += len(self)
+        return self.coords[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return (f"GroupSet({len(self)} groups, {self.n_shots} shots, "
+                f"{self.nbytes / 2**20:.1f} MiB)")
+
+    @property
+    def n_shots(self):
+        return len(self.coords)
+
+    @property
+    def counts(self):
+        """Shots in each group."""
+        return np.diff(self.offsets)
+
+    @property
+    def group_index(self):
+        """Group number of every shot, shape (n_shots,)."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    @property
+    def nbytes(self):
+        return self.coords.nbytes + self.offsets.nbytes + self.labels.nbytes
+
+    def is_uniform(self):
+        """True when every group has the same number of shots."""
+        counts = self.counts
+        return len(counts) == 0 or bool(np.all(counts == counts[0]))
+
+    def as_batch(self):
+        """Zero-copy (n_groups, n_shots, 2) view; groups must be equal size."""
+        if not self.is_uniform():
+            raise ValueError("groups have different shot counts")
+        return self.coords.reshape(len(self), -1, 2)
+
+    def centers(self):
+        """Center of each group, shape (n_groups, 2)."""
+        return self._per_group(_centers)
+
+    def extreme_spread(self):
+        """ES of each group."""
+        return self._per_group(segment_extreme_spread)
+
+    def mean_radius(self):
+        """MR of each group about its own center."""
+        def chunk_mr(shots, index, n):
+            centered = shots - _centers(shots, index, n)[index]
+            radius = np.sqrt(np.einsum('ij,ij->i', centered, centered))
+            return np.bincount(index, weights=radius, minlength=n) / np.bincount(index, minlength=n)
+        return self._per_group(chunk_mr)
+
+    def composite(self):
+        """Composite of all groups (see composite.composite_groups)."""
+        return composite_groups(self.labels[self.group_index], self.coords)
+
+    def _per_group(self, function):
+        """
+        Apply function(shots_float64, local_group_index, n_local_groups) to
+        consecutive slices of whole groups holding about WORKING_CHUNK_SHOTS
+        shots each, and concatenate the per-group results.
+        """
+        results = []
+        start = 0
+        while start < len(self):
+            stop = int(np.searchsorted(self.offsets, self.offsets[start] + WORKING_CHUNK_SHOTS,
+                                       side='right')) - 1
+            stop = min(max(stop, start + 1), len(self))
+            lo, hi = self.offsets[start], self.offsets[stop]
+            shots = self.coords[lo:hi].astype(float)
+            index = np.repeat(np.arange(stop - start), np.diff(self.offsets[start:stop + 1]))
+            results.append(function(shots, index, stop - start))
+            start = stop
+        if not results:
+            return np.zeros(0)
+        return np.concatenate(results)
+
+
+def _centers(shots, index, n_groups):
+    counts = np.bincount(index, minlength=n_groups)
+    return np.stack([
+        np.bincount(index, weights=shots[:, 0], minlength=n_groups),
+        np.bincount(index, weights=shots[:, 1], minlength=n_groups),
+    ], axis=-1) / counts[:, np.newaxis]
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Group Size Lookup Tables
+Mean, variance and quantiles of ES/σ, MR/σ and MR/ES for 2-200 shot groups.
+
+Scripts used to re-simulate these ratios on every run or hard-code rules of
+thumb such as "E[5-shot ES] ≈ 3.0 * sigma". The numbers depend only on the
+shot count, so they are simulated once, stored in a small versioned .npz
+file (data/simulated/group_size_ratio_tables.npz) and read back through an
+interpolating API.
+
+All ratios are for a circular bivariate normal with per-axis σ = 1, with MR
+measured about the group center.
+
+Regenerate the table (takes well under a minute):
+    python scripts/group_tables.py
+
+Usage:
+    from group_tables import ratio_mean, ratio_quantile, sigma_from_es
+    sigma = TRUE_MOA / ratio_mean('es', 5)
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+TABLE_PATH = (Path(__file__).parent.parent / 'data' / 'simulated'
+              / 'group_size_ratio_tables.npz')
+# Bump whenever the generation changes the stored numbers (version 2: the
+# simulation draws from MonteCarloKernel block streams). The generation
+# settings themselves are stored as seed, n_strings and chunk_size.
+TABLE_VERSION = 2
+
+METRICS = ('es', 'mr', 'mr_es')
+MIN_SHOTS = 2
+MAX_SHOTS = 200
+QUANTILE_LEVELS = np.array([
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.35,
+    0.40, 0.45, 0.50, 0.55, 0.60, 0.65, 0.70, 0.75, 0.80, 0.85, 0.90, 0.95,
+    0.975, 0.99, 0.995, 0.999,
+])
+
+DEFAULT_STRINGS = 100_000
+DEFAULT_SEED = 20240601
+
+
+def generate_tables(n_strings=DEFAULT_STRINGS, seed=DEFAULT_SEED,
+                    path=TABLE_PATH, chunk_size=10_000, max_workers=None):
+    """
+    Simulate `n_strings` strings of MAX_SHOTS shots and write the table.
+
+    Each string is read as a sequence of prefixes (first 2 shots, first 3,
+    ..., first 200), so one simulation covers every group size. Each row of
+    the table is an exact sample of its own group size; neighbouring rows
+    share shots, which keeps the table smooth in n.
+
+    Chunks of `chunk_size` strings are simulated across `max_workers`
+    processes (see simulation.MonteCarloKernel.run); the table is the same
+    for any number of workers.
+    """
+    from simulation import MonteCarloKernel
+
+    n_values = np.arange(MIN_SHOTS, MAX_SHOTS + 1)
+    kernel = MonteCarloKernel(seed, block_size=chunk_size)
+    es, mr, mr_es = kernel.run(n_strings, _simulate_ratios, max_workers=max_workers)
+    samples = {'es': es, 'mr': mr, 'mr_es': mr_es}
+
+    table = {
+        'version': np.int64(TABLE_VERSION),
+        'seed': np.int64(seed),
+        'n_strings': np.int64(n_strings),
+        'chunk_size': np.int64(chunk_size),
+        'n': n_values,
+        'quantile_levels': QUANTILE_LEVELS,
+    }
+    for metric in METRICS:
+        values = samples[metric].astype(float)
+        table[f'{metric}_mean'] = values.mean(axis=0).astype(np.float32)
+        table[f'{metric}_var'] = values.var(axis=0, ddof=1).astype(np.float32)
+        table[f'{metric}_quantiles'] = np.quantile(
+            values, QUANTILE_LEVELS, axis=0).T.astype(np.float32)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, **table)
+    load_tables.cache_clear()
+    return path
+
+
+def _simulate_ratios(rng, size):
+    """ES/σ, MR/σ and MR/ES of every prefix of `size` simulated strings."""
+    from prefix_metrics import prefix_curves
+
+    curves = prefix_curves(rng.standard_normal((size, MAX_SHOTS, 2)))
+    es = curves.es[:, MIN_SHOTS - 1:]
+    mr = curves.mr[:, MIN_SHOTS - 1:]
+    return es.astype(np.float32), mr.astype(np.float32), (mr / es).astype(np.float32)
+
+
+@lru_cache(maxsize=None)
+def load_tables(path=TABLE_PATH):
+    """Load the table once per process. Raises if it is missing or stale."""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"{path} not found; run `python scripts/group_tables.py` to build it"
+        )
+    with np.load(path) as data:
+        table = {key: data[key] for key in data.files}
+    if int(table['version']) != TABLE_VERSION:
+        raise ValueError(
+            f"{path} is table version {int(table['version'])}, expected "
+            f"{TABLE_VERSION}; run `python scripts/group_tables.py` to rebuild it"
+        )
+    return table
+
+
+def ratio_mean(metric, n):
+    """E[metric] for n-shot groups (ES/σ, MR/σ or MR/ES), interpolated in n."""
+    return _interp_n(_column(metric, 'mean'), n)
+
+
+def ratio_sd(metric, n):
+    """Standard deviation of the metric for n-shot groups."""
+    return np.sqrt(_interp_n(_column(metric, 'var'), n))
+
+
+def ratio_quantile(metric, n, p):
+    """
+    p-quantile of the metric for n-shot groups. Interpolates linearly
+    between the stored quantile levels and between group sizes. The result
+    has shape n.shape + p.shape.
+    """
+    table = load_tables()
+    levels = table['quantile_levels']
+    p = np.asarray(p, dtype=float)
+    if np.any((p < levels[0]) | (p > levels[-1])):
+        raise ValueError(f"p must be between {levels[0]} and {levels[-1]}")
+    quantiles = table[f'{_check_metric(metric)}_quantiles']   # (n, level)
+    per_n = np.array([np.interp(p, levels, row) for row in quantiles])
+    return _interp_n(per_n, n)
+
+
+def sigma_from_es(es, n):
+    """Estimate per-axis σ from an n-shot extreme spread."""
+    return np.asarray(es, dtype=float) / ratio_mean('es', n)
+
+
+def sigma_from_mr(mr, n):
+    """Estimate per-axis σ from an n-shot mean radius."""
+    return np.asarray(mr, dtype=float) / ratio_mean('mr', n)
+
+
+def es_from_sigma(sigma, n):
+    """Expected n-shot extreme spread for a rifle with per-axis σ."""
+    return np.asarray(sigma, dtype=float) * ratio_mean('es', n)
+
+
+def mr_from_sigma(sigma, n):
+    """Expected n-shot mean radius for a rifle with per-axis σ."""
+    return np.asarray(sigma, dtype=float) * ratio_mean('mr', n)
+
+
+def mr_from_es(es, n):
+    """Convert an n-shot ES to the MR expected from the same rifle."""
+    return sigma_from_es(es, n) * ratio_mean('mr', n)
+
+
+def es_from_mr(mr, n):
+    """Convert an n-shot MR to the ES expected from the same rifle."""
+    return sigma_from_mr(mr, n) * ratio_mean('es', n)
+
+
+def _check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    return metric
+
+
+def _column(metric, stat):
+    return load_tables()[f'{_check_metric(metric)}_{stat}']
+
+
+def _interp_n(column, n):
+    """Interpolate a per-group-size column (first axis) at shot count(s) n."""
+    n_grid = load_tables()['n']
+    n = np.asarray(n, dtype=float)
+    if np.any((n < n_grid[0]) | (n > n_grid[-1])):
+        raise ValueError(f"n must be between {n_grid[0]} and {n_grid[-1]}")
+    column = np.asarray(column, dtype=float)
+    if column.ndim == 1:
+        result = np.interp(n, n_grid, column)
+    else:
+        flat = column.reshape(len(n_grid), -1)
+        result = np.stack([np.interp(n, n_grid, c) for c in flat.T], axis=-1)
+        result = result.reshape(n.shape + column.shape[1:])
+    return float(result) if result.ndim == 0 else result
+
+
+if __name__ == '__main__':
+    output = generate_tables()
+    print(f"Saved: {output}")
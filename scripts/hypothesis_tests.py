@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Batched Hypothesis Tests
+Two-sample tests applied to whole stacks of simulated comparisons at once.
+
+The error-rate studies (Notebook 10) simulate thousands to millions of
+"load A vs load B" comparisons. Calling scipy.stats once per comparison
+spends nearly all the time in Python overhead. Every test here takes
+sample matrices shaped (n_sim, n) (or any shape, with the samples along
+`axis`) and returns one statistic and one p-value per comparison, using
+the same formulas as scipy.stats.ttest_ind, the two-sided F-test for
+equal variances, and scipy.stats.levene.
+
+Usage:
+    from hypothesis_tests import ttest_ind, rejection_rate
+    samples = np.random.normal(2850, 15, (1_000_000, 2, 10))
+    result = ttest_ind(samples[:, 0], samples[:, 1])
+    print(rejection_rate(result.pvalue, alpha=0.05))
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy import stats
+
+
+class TestResult(NamedTuple):
+    """Statistic and p-value of every comparison in a batch."""
+    statistic: np.ndarray
+    pvalue: np.ndarray
+
+
+def ttest_ind(a, b, axis=-1, equal_var=True):
+    """
+    Two-sided two-sample t-test of equal means for every pair of samples.
+    equal_var=False gives Welch's test.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n_a, n_b = a.shape[axis], b.shape[axis]
+    var_a = a.var(axis=axis, ddof=1)
+    var_b = b.var(axis=axis, ddof=1)
+    difference = a.mean(axis=axis) - b.mean(axis=axis)
+
+    if equal_var:
+        df = n_a + n_b - 2.0
+        pooled = ((n_a - 1) * var_a + (n_b - 1) * var_b) / df
+        se = np.sqrt(pooled * (1.0 / n_a + 1.0 / n_b))
+    else:
+        se_a, se_b = var_a / n_a, var_b / n_b
+        se = np.sqrt(se_a + se_b)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df = (se_a + se_b)**2 / (se_a**2 / (n_a - 1) + se_b**2 / (n_b - 1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = difference / se
+    return TestResult(statistic=t, pvalue=2 * stats.t.sf(np.abs(t), df))
+
+
+def f_test(a, b, axis=-1):
+    """
+    Two-sided F-test of equal variances: F = var(a) / var(b) with
+    (n_a - 1, n_b - 1) degrees of freedom.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    df_a, df_b = a.shape[axis] - 1, b.shape[axis] - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f = a.var(axis=axis, ddof=1) / b.var(axis=axis, ddof=1)
+    tail = np.minimum(stats.f.cdf(f, df_a, df_b), stats.f.sf(f, df_a, df_b))
+    return TestResult(statistic=f, pvalue=np.minimum(2 * tail, 1.0))
+
+
+def levene(*samples, axis=-1, center='median'):
+    """
+    Levene's test of equal variances across two or more samples
+    (center='median' is the Brown-Forsythe variant, scipy's default).
+    """
+    if len(samples) < 2:
+        raise ValueError("need at least two samples")
+    if center not in ('median', 'mean'):
+        raise ValueError(f"center must be 'median' or 'mean', got {center!r}")
+    locate = np.median if center == 'median' else np.mean
+
+    # Absolute deviations from each sample's center, samples on the last axis
+    deviations = []
+    for sample in samples:
+        sample = np.moveaxis(np.asarray(sample, dtype=float), axis, -1)
+        deviations.append(np.abs(sample - locate(sample, axis=-1, keepdims=True)))
+    counts = np.array([d.shape[-1] for d in deviations], dtype=float)
+    k, n_total = len(deviations), counts.sum()
+
+    group_means = [d.mean(axis=-1) for d in deviations]
+    grand_mean = sum(n * m for n, m in zip(counts, group_means)) / n_total
+    between = sum(n * (m - grand_mean)**2 for n, m in zip(counts, group_means))
+    within = sum(((d - m[..., np.newaxis])**2).sum(axis=-1)
+                 for d, m in zip(deviations, group_means))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        w = (n_total - k) / (k - 1) * between / within
+    return TestResult(statistic=w, pvalue=stats.f.sf(w, k - 1, n_total - k))
+
+
+def rejection_rate(pvalues, alpha=0.05):
+    """Fraction of comparisons with p < alpha (false alarms or detections)."""
+    return float(np.mean(np.asarray(pvalues) < alpha))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Best-of-k Order Statistics
+Distribution of the best, worst or r-th smallest of k groups, without
+simulating sets of groups.
+
+If one n-shot group has size CDF F(x), the smallest of k independent groups
+has CDF 1 - (1 - F(x))^k, the largest F(x)^k, and the r-th smallest
+I_F(x)(r, k - r + 1) (the regularized incomplete beta function, i.e. the
+beta(r, k - r + 1) CDF evaluated at F(x)). So once F is known for a shot
+count, the best-group bias for any number of groups is a few array
+operations instead of a fresh simulation of n_sets * k groups.
+
+F has no closed form for more than two shots. group_size_distribution()
+simulates it once per (metric, shot count): 10^6 groups by default, reduced
+to a quantile function on a grid that is dense in both tails. The result is
+kept in the simulation cache on disk (simulation_cache) and in memory for
+the rest of the process, and is interpolated linearly from then on. All
+sizes are in units of the per-axis σ, like group_tables.
+
+The simulated sets in plot_06_19 stay as the check on these numbers.
+
+Usage:
+    from order_statistics import best_of, best_of_bias
+    best = best_of([2, 5, 10, 20], n_shots=5)
+    print(best.mean(), best.quantile(0.5))
+    print(best_of_bias(20, n_shots=5))   # ≈ 0.45: the best of 20 looks 45% smaller
+"""
+
+import functools
+
+import numpy as np
+from scipy import stats
+
+from group_metrics import extreme_spread, mean_radius
+from simulation import MonteCarloKernel
+from simulation_cache import cached
+
+DEFAULT_GROUPS = 1_000_000
+DEFAULT_SEED = 20240601
+METRICS = ('es', 'mr')
+
+# Quantile levels kept per distribution: 0 and 1 (sample min and max),
+# log-spaced tails down to 1e-6 and a linear middle
+LEVELS = np.unique(np.concatenate([
+    [0.0], np.geomspace(1e-6, 1e-2, 41), np.linspace(0.01, 0.99, 197),
+    1 - np.geomspace(1e-2, 1e-6, 41), [1.0],
+]))
+
+
+class GroupSizeDistribution:
+    """Distribution of one n-shot group-size metric, held as its quantile function."""
+
+    __slots__ = ('metric', 'n_shots', 'levels', 'quantiles')
+
+    def __init__(self, metric, n_shots, levels, quantiles):
+        self.metric = metric
+        self.n_shots = n_shots
+        self.levels = np.asarray(levels, dtype=float)
+        self.quantiles = np.asarray(quantiles, dtype=float)
+
+    def __repr__(self):
+        return (f"GroupSizeDistribution({self.metric!r}, n_shots={self.n_shots}, "
+                f"mean={self.mean():.4g})")
+
+    def cdf(self, x):
+        """P(size <= x)."""
+        return np.interp(x, self.quantiles, self.levels, left=0.0, right=1.0)[()]
+
+    def quantile(self, p):
+        """p-quantile(s) of the size, p in [0, 1]."""
+        return np.interp(p, self.levels, self.quantiles)[()]
+
+    def mean(self):
+        return self.order_statistic(1).mean()
+
+    def sd(self):
+        return self.order_statistic(1).sd()
+
+    def order_statistic(self, k, rank=1):
+        """The rank-th smallest of k groups (rank=1 best, rank=k worst)."""
+        return OrderStatistic(self, k, rank)
+
+
+class OrderStatistic:
+    """
+    The rank-th smallest size among k independent groups. k and rank may be
+    arrays (they broadcast), giving one distribution per element.
+    """
+
+    __slots__ = ('base', 'k', 'rank')
+
+    def __init__(self, base, k, rank=1):
+        k, rank = np.broadcast_arrays(np.asarray(k), np.asarray(rank))
+        if np.any(k < 1) or np.any(rank < 1) or np.any(rank > k):
+            raise ValueError("need k >= 1 and 1 <= rank <= k")
+        self.base = base
+        self.k = k
+        self.rank = rank
+
+    def __repr__(self):
+        return (f"OrderStatistic({self.base.metric!r}, n_shots={self.base.n_shots}, "
+                f"k={self.k.tolist()}, rank={self.rank.tolist()})")
+
+    def cdf(self, x):
+        """P(rank-th smallest of k <= x); x broadcasts against k."""
+        return stats.beta.cdf(self.base.cdf(x), self.rank, self.k - self.rank + 1)[()]
+
+    def quantile(self, p):
+        """p-quantile(s); p broadcasts against k."""
+        return self.base.quantile(stats.beta.ppf(p, self.rank, self.k - self.rank + 1))
+
+    def mean(self):
+        return self._moment(1)
+
+    def sd(self):
+        return np.sqrt(np.maximum(self._moment(2) - self._moment(1)**2, 0.0))
+
+    def _moment(self, power):
+        """
+        E[X^power] = integral of Q(u)^power over the beta(rank, k - rank + 1)
+        distribution of u = F(X), with Q linear between stored levels.
+        """
+        weights = np.diff(stats.beta.cdf(self.base.levels, self.rank[..., np.newaxis],
+                                         (self.k - self.rank + 1)[..., np.newaxis]), axis=-1)
+        q = self.base.quantiles**power
+        return (weights * (q[1:] + q[:-1]) / 2).sum(axis=-1)[()]
+
+
+def group_size_distribution(n_shots, metric='es', n_groups=DEFAULT_GROUPS, seed=DEFAULT_SEED):
+    """Distribution of ES/σ or MR/σ for n-shot groups (simulated once, then cached)."""
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}, got {metric!r}")
+    if n_shots < 2:
+        raise ValueError("n_shots must be at least 2")
+    return _distribution(int(n_shots), metric, int(n_groups), seed)
+
+
+def best_of(k, n_shots, metric='es'):
+    """Distribution of the smallest of k n-shot groups."""
+    return group_size_distribution(n_shots, metric).order_statistic(k, 1)
+
+
+def worst_of(k, n_shots, metric='es'):
+    """Distribution of the largest of k n-shot groups."""
+    return group_size_distribution(n_shots, metric).order_statistic(k, k)
+
+
+def best_of_bias(k, n_shots, metric='es'):
+    """
+    Fraction by which the best of k groups understates the expected group
+    size: 1 - E[best of k] / E[one group]. Positive means optimistic.
+    """
+    return 1 - best_of(k, n_shots, metric).mean() / group_size_distribution(n_shots, metric).mean()
+
+
+@functools.lru_cache(maxsize=None)
+def _distribution(n_shots, metric, n_groups, seed):
+    quantiles = _simulated_quantiles(metric, n_shots, n_groups, seed)
+    return GroupSizeDistribution(metric, n_shots, LEVELS, quantiles)
+
+
+@cached(global_rng=False)
+def _simulated_quantiles(metric, n_shots, n_groups, seed):
+    """Quantiles of the metric at LEVELS from n_groups simulated groups."""
+    sizes = MonteCarloKernel(seed).run(
+        n_groups, functools.partial(_simulate_sizes, metric=metric, n_shots=n_shots))
+    return np.quantile(sizes, LEVELS)
+
+
+def _simulate_sizes(rng, size, metric, n_shots):
+    shots = rng.standard_normal((size, n_shots, 2))
+    return extreme_spread(shots) if metric == 'es' else mean_radius(shots)
+
+
+if __name__ == '__main__':
+    k_values = np.array([1, 2, 3, 5, 10, 20, 50])
+    print("Best-of-k bias of 5-shot extreme spread")
+    best = best_of(k_values, 5)
+    for k, mean, median, bias in zip(k_values, best.mean(), best.quantile(0.5),
+                                     best_of_bias(k_values, 5)):
+        print(f"  k={k:3d}  E[best]={mean:.3f}σ  median={median:.3f}σ  bias={bias:6.1%}")
@@ -14,6 +14,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from prefix_metrics import prefix_curves
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -23,46 +25,15 @@ TRUE_MR = TRUE_SIGMA * np.sqrt(np.pi / 2)  # Theoretical mean radius
 MAX_SHOTS = 50
 N_SIMULATIONS = 20  # Number of simulation runs to show
 
-# Function to calculate extreme spread
-def calculate_es(x, y):
-    """Calculate extreme spread (maximum distance between any two shots)."""
-    n = len(x)
-    max_dist = 0
-    for i in range(n):
-        for j in range(i + 1, n):
-            dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-            max_dist = max(max_dist, dist)
-    return max_dist
-
-# Function to calculate mean radius
-def calculate_mr(x, y):
-    """Calculate mean radius (average distance from center)."""
-    radii = np.sqrt(x**2 + y**2)
-    return np.mean(radii)
-
 # Run multiple simulations
-all_es_curves = []
-all_mr_curves = []
-
-for sim in range(N_SIMULATIONS):
-    # Generate shots from 2D normal distribution
-    x = np.random.normal(0, TRUE_SIGMA, MAX_SHOTS)
-    y = np.random.normal(0, TRUE_SIGMA, MAX_SHOTS)
-
-    # Calculate running ES and MR
-    es_values = []
-    mr_values = []
-
-    for n in range(1, MAX_SHOTS + 1):
-        es_values.append(calculate_es(x[:n], y[:n]))
-        mr_values.append(calculate_mr(x[:n], y[:n]))
-
-    all_es_curves.append(es_values)
-    all_mr_curves.append(mr_values)
-
-# Convert to arrays
-all_es_curves = np.array(all_es_curves)
-all_mr_curves = np.array(all_mr_curves)
+# Generate shots from 2D normal distribution for every run at once
+# (each run's x coordinates, then its y coordinates)
+xy = np.random.normal(0, TRUE_SIGMA, (N_SIMULATIONS, 2, MAX_SHOTS))
+
+# Calculate running ES and MR (radius measured from the aim point)
+curves = prefix_curves(xy.transpose(0, 2, 1))
+all_es_curves = curves.es
+all_mr_curves = curves.mr_aim
 shot_numbers = np.arange(1, MAX_SHOTS + 1)
 
 # Create the plot
@@ -4,7 +4,7 @@ Plot 3: Three-Shot Group Distribution (Notebook 01)
 Demonstrates massive variation in 3-shot groups from a consistent rifle.
 
 Educational Purpose:
-Shows that a true 1.5 MOA rifle produces 3-shot groups ranging from 0.4 to 3.2 MOA,
+Shows that a true 1.5 MOA rifle produces 3-shot groups ranging from 0.15 to 3.0 MOA,
 illustrating why small samples mislead.
 """
 
@@ -12,6 +12,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from group_metrics import extreme_spread
+from group_tables import ratio_mean
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -21,29 +24,18 @@ N_GROUPS = 1000  # Number of 3-shot groups to simulate
 SHOTS_PER_GROUP = 3
 
 # Simulate 1000 three-shot groups
-group_sizes = []
-
-for _ in range(N_GROUPS):
-    # Generate shots from a 2D normal distribution
-    # Convert MOA to standard deviation for 2D normal distribution
-    # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma, so sigma ≈ TRUE_MOA / 3.0
-    sigma = TRUE_MOA / 3.0
-
-    x = np.random.normal(0, sigma, SHOTS_PER_GROUP)
-    y = np.random.normal(0, sigma, SHOTS_PER_GROUP)
-
-    # Calculate group size (extreme spread - max distance between any two shots)
-    max_dist = 0
-    for i in range(SHOTS_PER_GROUP):
-        for j in range(i + 1, SHOTS_PER_GROUP):
-            dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-            max_dist = max(max_dist, dist)
-
-    group_sizes.append(max_dist)
-
-# Convert to numpy array for calculations
-group_sizes = np.array(group_sizes)
+# Convert MOA to standard deviation for 2D normal distribution
+# TRUE_MOA represents expected 5-shot group size
+# so sigma = TRUE_MOA / E[5-shot ES/sigma] from the lookup table
+sigma = TRUE_MOA / ratio_mean('es', 5)
+
+# Draw every group at once: for each group, its x coordinates then its y
+# coordinates, in the same order as drawing one group at a time
+xy = np.random.normal(0, sigma, (N_GROUPS, 2, SHOTS_PER_GROUP))
+shots = xy.transpose(0, 2, 1)
+
+# Calculate group size (extreme spread - max distance between any two shots)
+group_sizes = extreme_spread(shots)
 
 # Calculate statistics
 best_group = np.min(group_sizes)
@@ -12,6 +12,12 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from simulation_cache import cached
+from simulation_studies import simulate_groups
+
+# Keep the simulated groups on disk, keyed by the arguments and the seed
+simulate_groups = cached(simulate_groups)
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -19,31 +25,6 @@ np.random.seed(42)
 TRUE_MOA = 1.5  # True rifle capability
 N_GROUPS = 1000  # Number of groups to simulate for each
 
-
-def simulate_groups(n_groups, shots_per_group, true_moa):
-    """Simulate groups and return their sizes."""
-    group_sizes = []
-    # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma, so sigma ≈ TRUE_MOA / 3.0
-    sigma = true_moa / 3.0
-
-    for _ in range(n_groups):
-        # Generate shots from a 2D normal distribution
-        x = np.random.normal(0, sigma, shots_per_group)
-        y = np.random.normal(0, sigma, shots_per_group)
-
-        # Calculate group size (extreme spread - max distance between any two shots)
-        max_dist = 0
-        for i in range(shots_per_group):
-            for j in range(i + 1, shots_per_group):
-                dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-                max_dist = max(max_dist, dist)
-
-        group_sizes.append(max_dist)
-
-    return np.array(group_sizes)
-
-
 # Simulate both 3-shot and 5-shot groups
 three_shot_groups = simulate_groups(N_GROUPS, 3, TRUE_MOA)
 five_shot_groups = simulate_groups(N_GROUPS, 5, TRUE_MOA)
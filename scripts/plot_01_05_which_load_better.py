@@ -13,6 +13,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from group_metrics import calculate_es
+from group_tables import ratio_mean
+
 # Set random seed for reproducibility
 np.random.seed(108)  # Seed chosen to give representative group sizes
 
@@ -25,19 +28,15 @@ N_GROUPS = 3  # 3 groups to display in 1x3 grid
 def simulate_one_group(true_moa, shots_per_group):
     """Simulate one group and return shot coordinates and group size."""
     # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma
-    sigma = true_moa / 3.0
+    # so sigma = TRUE_MOA / E[5-shot ES/sigma] from the lookup table
+    sigma = true_moa / ratio_mean('es', 5)
 
     # Generate shots from 2D normal distribution
     x = np.random.normal(0, sigma, shots_per_group)
     y = np.random.normal(0, sigma, shots_per_group)
 
     # Calculate group size (extreme spread)
-    max_dist = 0
-    for i in range(shots_per_group):
-        for j in range(i + 1, shots_per_group):
-            dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-            max_dist = max(max_dist, dist)
+    max_dist = calculate_es(x, y)
 
     return x, y, max_dist
 
@@ -13,6 +13,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from sampling_distributions import prob_sd_within, sample_string_stats, sd_pdf
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -24,16 +26,9 @@ SAMPLE_SIZES = [5, 10, 20, 30]  # Different sample sizes to compare
 
 def simulate_sd_measurements(true_sd, sample_size, n_samples):
     """Simulate n_samples measurements of SD using given sample_size."""
-    measured_sds = []
-
-    for _ in range(n_samples):
-        # Generate a sample from normal distribution with true SD
-        sample = np.random.normal(0, true_sd, sample_size)
-        # Calculate sample SD (using ddof=1 for sample SD)
-        measured_sd = np.std(sample, ddof=1)
-        measured_sds.append(measured_sd)
-
-    return np.array(measured_sds)
+    # Sample SD (ddof=1) of each string, drawn from its exact distribution
+    # rather than from sample_size individual shots
+    return sample_string_stats(sample_size, 0, true_sd, n_samples).sd
 
 
 # Create figure with 2x2 subplot grid
@@ -62,6 +57,11 @@ for idx, sample_size in enumerate(SAMPLE_SIZES):
     n, bins, patches = ax.hist(measured_sds, bins=40, color='steelblue',
                                 edgecolor='black', alpha=0.7, linewidth=0.5)
 
+    # Exact sampling distribution of the SD (scaled chi), in histogram counts
+    sd_grid = np.linspace(bins[0], bins[-1], 300)
+    ax.plot(sd_grid, sd_pdf(sd_grid, TRUE_SD, sample_size) * N_SAMPLES * np.diff(bins)[0],
+            color='navy', linewidth=2, label='Exact distribution')
+
     # Add vertical line for true SD
     ax.axvline(TRUE_SD, color='red', linestyle='--', linewidth=2.5,
                label=f'True SD: {TRUE_SD} fps', zorder=10)
@@ -82,7 +82,8 @@ for idx, sample_size in enumerate(SAMPLE_SIZES):
         f'Spread: {max_sd - min_sd:.1f} fps\n'
         f'Std of SDs: {std_of_sds:.1f} fps\n'
         f'\n'
-        f'Within ±20%: {within_20_pct:.0%}'
+        f'Within ±20%: {within_20_pct:.0%}\n'
+        f'  (exact: {prob_sd_within(0.2, TRUE_SD, sample_size):.0%})'
     )
 
     ax.text(0.98, 0.97, stats_text, transform=ax.transAxes,
@@ -12,6 +12,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from velocity_stats import running_stats
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
@@ -24,8 +26,9 @@ N_SHOTS = 100
 shots = np.random.normal(TRUE_MEAN, TRUE_SD, N_SHOTS)
 
 # Calculate running statistics
-running_mean = np.cumsum(shots) / np.arange(1, N_SHOTS + 1)
-running_sd = np.array([np.std(shots[:i+1], ddof=1) for i in range(N_SHOTS)])
+running = running_stats(shots)
+running_mean = running.mean
+running_sd = running.sd
 
 # Create figure with two subplots
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
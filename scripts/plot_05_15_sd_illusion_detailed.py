@@ -13,13 +13,17 @@ import matplotlib.pyplot as plt
 from pathlib import Path
 from scipy import stats
 
+from sampling_distributions import sample_string_stats, sd_cdf, sd_mean, sd_pdf
+from simulation import run_to_precision
+
 # Set random seed for reproducibility
 np.random.seed(42)
 
 # Population parameters
 TRUE_MEAN = 2850  # fps
 TRUE_SD = 15  # fps
-N_TRIALS = 500  # Number of samples to simulate
+INITIAL_TRIALS = 500  # First batch of simulated samples
+PERCENT_TOLERANCE = 1.0  # Simulate until "SD < 10 fps" is known to ±1 percentage point
 
 # Sample sizes to test
 sample_sizes = [5, 10, 20, 30]
@@ -29,28 +33,31 @@ fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 axes = axes.flatten()
 
 for idx, n_shots in enumerate(sample_sizes):
-    # Simulate N_TRIALS samples of size n_shots
-    calculated_sds = []
-
-    for _ in range(N_TRIALS):
-        sample = np.random.normal(TRUE_MEAN, TRUE_SD, n_shots)
-        sample_sd = np.std(sample, ddof=1)
-        calculated_sds.append(sample_sd)
-
-    calculated_sds = np.array(calculated_sds)
+    # Simulate samples of size n_shots until the SD < 10 fps rate is pinned down
+    result = run_to_precision(
+        lambda n_trials: sample_string_stats(n_shots, TRUE_MEAN, TRUE_SD, n_trials).sd,
+        PERCENT_TOLERANCE, quantity=lambda sds: 100 * (sds < 10),
+        initial_trials=INITIAL_TRIALS)
+    calculated_sds = result.values
+    n_trials = result.n_trials
 
     # Calculate statistics
     mean_measured_sd = np.mean(calculated_sds)
-    percent_below_10 = 100 * np.sum(calculated_sds < 10) / N_TRIALS
+    percent_below_10 = result.estimate
     percent_within_20pct = 100 * np.sum(
         (calculated_sds >= TRUE_SD * 0.8) & (calculated_sds <= TRUE_SD * 1.2)
-    ) / N_TRIALS
+    ) / n_trials
 
     # Plot histogram
     ax = axes[idx]
     n, bins, patches = ax.hist(calculated_sds, bins=25, color='steelblue',
                                  edgecolor='black', alpha=0.7, linewidth=0.5)
 
+    # Exact sampling distribution of the SD (scaled chi), in histogram counts
+    sd_grid = np.linspace(0, bins[-1], 300)
+    ax.plot(sd_grid, sd_pdf(sd_grid, TRUE_SD, n_shots) * n_trials * np.diff(bins)[0],
+            color='navy', linewidth=2, label='Exact distribution')
+
     # Add vertical line for true SD
     ax.axvline(TRUE_SD, color='red', linestyle='--', linewidth=2.5,
                label=f'True SD: {TRUE_SD} fps', zorder=10)
@@ -62,15 +69,15 @@ for idx, n_shots in enumerate(sample_sizes):
     # Labels and title
     ax.set_xlabel('Calculated SD (fps)', fontsize=11, fontweight='bold')
     ax.set_ylabel('Frequency', fontsize=11, fontweight='bold')
-    ax.set_title(f'{n_shots}-Shot Samples\n({N_TRIALS} trials)',
+    ax.set_title(f'{n_shots}-Shot Samples\n({n_trials:,} trials)',
                  fontsize=12, fontweight='bold')
 
     # Stats annotation
     stats_text = (
-        f'Mean SD: {mean_measured_sd:.1f} fps\n'
+        f'Mean SD: {mean_measured_sd:.1f} fps (exact {sd_mean(TRUE_SD, n_shots):.1f})\n'
         f'Range: {np.min(calculated_sds):.1f} - {np.max(calculated_sds):.1f} fps\n'
         f'\n'
-        f'SD < 10 fps: {percent_below_10:.0f}%\n'
+        f'SD < 10 fps: {percent_below_10:.0f}% (exact {100 * sd_cdf(10, TRUE_SD, n_shots):.1f}%)\n'
         f'Within ±20%: {percent_within_20pct:.0f}%'
     )
 
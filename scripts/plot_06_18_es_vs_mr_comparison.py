@@ -13,6 +13,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
+from group_metrics import group_metrics
+from group_tables import ratio_mean
+from simulation_cache import cached
+
 # Set random seed for reproducibility
 np.random.seed(789)
 
@@ -22,49 +26,32 @@ MAX_SHOTS = 100  # Maximum number of shots to simulate
 N_TRIALS = 200  # Number of trials to average over
 
 
+@cached
 def simulate_es_and_mr_progression(true_moa, max_shots, n_trials):
     """
     Simulate how ES and MR change as shot count increases.
     Returns arrays of shot counts, average ES, and average MR.
     """
     # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma
-    sigma = true_moa / 3.0
+    # so sigma = TRUE_MOA / E[5-shot ES/sigma] from the lookup table
+    sigma = true_moa / ratio_mean('es', 5)
 
     shot_counts = range(3, max_shots + 1)
     es_values = []
     mr_values = []
 
     for n_shots in shot_counts:
-        es_trial = []
-        mr_trial = []
-
-        for _ in range(n_trials):
-            # Generate shots from 2D normal distribution
-            x = np.random.normal(0, sigma, n_shots)
-            y = np.random.normal(0, sigma, n_shots)
-
-            # Calculate ES (extreme spread - max distance between any two shots)
-            max_dist = 0
-            for i in range(n_shots):
-                for j in range(i + 1, n_shots):
-                    dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-                    max_dist = max(max_dist, dist)
-            es_trial.append(max_dist)
-
-            # Calculate MR (mean radius - average distance from center of group)
-            # First find center of group
-            center_x = np.mean(x)
-            center_y = np.mean(y)
-
-            # Then calculate mean distance from center
-            distances = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-            mean_radius = np.mean(distances)
-            mr_trial.append(mean_radius)
+        # Generate shots from 2D normal distribution for every trial at once
+        # (each trial's x coordinates, then its y coordinates)
+        xy = np.random.normal(0, sigma, (n_trials, 2, n_shots))
+
+        # ES (extreme spread - max distance between any two shots) and
+        # MR (mean radius - average distance from center of group)
+        metrics = group_metrics(xy.transpose(0, 2, 1))
 
         # Average over trials
-        es_values.append(np.mean(es_trial))
-        mr_values.append(np.mean(mr_trial))
+        es_values.append(np.mean(metrics.es))
+        mr_values.append(np.mean(metrics.mr))
 
     return np.array(list(shot_counts)), np.array(es_values), np.array(mr_values)
 
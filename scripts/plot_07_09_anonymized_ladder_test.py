@@ -13,8 +13,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from simulation import MonteCarloKernel
 
 # Simulation parameters
 CHARGE_WEIGHTS = np.arange(41.0, 43.2, 0.2)  # 41.0 to 43.0 in 0.2gr steps (11 charges)
@@ -22,6 +21,27 @@ SHOTS_PER_CHARGE = 3  # Typical ladder test
 TRUE_VELOCITY_SLOPE = 25  # fps per grain (linear relationship)
 TRUE_SD = 12  # fps (shot-to-shot variation)
 N_TRIALS = 6  # Number of different ladder tests to show
+SEED = 42  # Root seed of the kernel's streams
+MAX_NODES = 2  # Apparent nodes annotated per trial
+FLAT_FRACTION = 0.5  # A step is "flat" below this fraction of the true velocity gain
+
+
+def apparent_nodes(measured_velocities, expected_change):
+    """
+    Indices of the flattest steps between neighbouring charges (up to
+    MAX_NODES, flattest first, never two adjacent steps) whose velocity
+    change is under FLAT_FRACTION of the true change: what a shooter would
+    read as a node.
+    """
+    changes = np.abs(np.diff(measured_velocities))
+    nodes = []
+    for idx in np.argsort(changes, kind='stable'):
+        if changes[idx] >= expected_change * FLAT_FRACTION or len(nodes) == MAX_NODES:
+            break
+        if all(abs(idx - other) > 1 for other in nodes):
+            nodes.append(int(idx))
+    return nodes
+
 
 # Create figure with small multiples
 fig, axes = plt.subplots(2, 3, figsize=(14, 9))
@@ -30,24 +50,17 @@ axes = axes.flatten()
 # Store which trials show apparent "nodes" for annotation
 interesting_trials = []
 
+# Generate velocities for all trials (one ladder test per kernel trial)
+base_velocity = 2700  # fps at 41.0 grains
+true_velocities = base_velocity + TRUE_VELOCITY_SLOPE * (CHARGE_WEIGHTS - 41.0)
+shots = MonteCarloKernel(SEED).generate(N_TRIALS, lambda rng, size: rng.normal(
+    true_velocities[:, np.newaxis], TRUE_SD, (size, len(CHARGE_WEIGHTS), SHOTS_PER_CHARGE)))
+# shots: (trial, charge, shot)
+all_measured_velocities = shots.mean(axis=-1)
+
 for trial_idx in range(N_TRIALS):
     ax = axes[trial_idx]
-
-    # Generate velocities for this trial
-    base_velocity = 2700  # fps at 41.0 grains
-    true_velocities = base_velocity + TRUE_VELOCITY_SLOPE * (CHARGE_WEIGHTS - 41.0)
-
-    # Add random variation
-    np.random.seed(42 + trial_idx)  # Different seed for each trial
-    measured_velocities = []
-
-    for charge in CHARGE_WEIGHTS:
-        true_vel = base_velocity + TRUE_VELOCITY_SLOPE * (charge - 41.0)
-        shots = np.random.normal(true_vel, TRUE_SD, SHOTS_PER_CHARGE)
-        avg_vel = np.mean(shots)
-        measured_velocities.append(avg_vel)
-
-    measured_velocities = np.array(measured_velocities)
+    measured_velocities = all_measured_velocities[trial_idx]
 
     # Plot the data
     ax.plot(CHARGE_WEIGHTS, measured_velocities, 'o-', color='steelblue',
@@ -58,50 +71,23 @@ for trial_idx in range(N_TRIALS):
     ax.plot(CHARGE_WEIGHTS, true_velocities, '--', color='red',
             linewidth=1.5, alpha=0.6, label='True relationship')
 
-    # Manual annotations for specific trials
-    # Trial-specific node locations to highlight different "patterns"
-    manual_nodes = {
-        0: [(41.9, 0.3, -20)],  # Trial 1: node at 41.9
-        4: [(42.4, 0.3, -20)],  # Trial 5: additional node at 42.4
-        5: [(41.5, 0.3, -20), (42.9, -0.4, -20)]  # Trial 6: nodes at 41.5 and 42.9
-    }
-
-    # Add manual annotations for specific trials
-    if trial_idx in manual_nodes:
-        for target_charge, x_offset, y_offset in manual_nodes[trial_idx]:
-            # Find the closest charge weight index
-            idx = np.argmin(np.abs(CHARGE_WEIGHTS - target_charge))
-            charge = CHARGE_WEIGHTS[idx]
-            vel = measured_velocities[idx]
-
-            ax.annotate('Apparent\n"node"?',
-                        xy=(charge, vel),
-                        xytext=(charge + x_offset, vel + y_offset),
-                        fontsize=8, fontweight='bold', color='darkgreen',
-                        bbox=dict(boxstyle='round,pad=0.3', facecolor='lightgreen', alpha=0.7),
-                        arrowprops=dict(arrowstyle='->', color='darkgreen', lw=1.5))
+    # Mark the flattest steps, where this trial seems to show a "node"
+    expected_change = TRUE_VELOCITY_SLOPE * 0.2  # 0.2 grain steps
+    nodes = apparent_nodes(measured_velocities, expected_change)
+    for idx in nodes:
+        mid_charge = (CHARGE_WEIGHTS[idx] + CHARGE_WEIGHTS[idx + 1]) / 2
+        mid_vel = (measured_velocities[idx] + measured_velocities[idx + 1]) / 2
+        # Keep the label inside the panel near the heavy end of the ladder
+        x_offset = -0.4 if mid_charge > 42.5 else 0.3
+
+        ax.annotate('Apparent\n"node"?',
+                    xy=(mid_charge, mid_vel),
+                    xytext=(mid_charge + x_offset, mid_vel - 20),
+                    fontsize=8, fontweight='bold', color='darkgreen',
+                    bbox=dict(boxstyle='round,pad=0.3', facecolor='lightgreen', alpha=0.7),
+                    arrowprops=dict(arrowstyle='->', color='darkgreen', lw=1.5))
+    if nodes:
         interesting_trials.append(trial_idx)
-    else:
-        # Auto-detect flat spots for other trials
-        velocity_changes = np.diff(measured_velocities)
-        expected_change = TRUE_VELOCITY_SLOPE * 0.2  # 0.2 grain steps
-
-        # Find "flat" regions (change < 50% of expected)
-        flat_spots = np.where(np.abs(velocity_changes) < expected_change * 0.5)[0]
-
-        if len(flat_spots) > 0:
-            # Annotate the first flat spot
-            idx = flat_spots[0]
-            mid_charge = (CHARGE_WEIGHTS[idx] + CHARGE_WEIGHTS[idx + 1]) / 2
-            mid_vel = (measured_velocities[idx] + measured_velocities[idx + 1]) / 2
-
-            ax.annotate('Apparent\n"node"?',
-                        xy=(mid_charge, mid_vel),
-                        xytext=(mid_charge + 0.3, mid_vel - 20),
-                        fontsize=8, fontweight='bold', color='darkgreen',
-                        bbox=dict(boxstyle='round,pad=0.3', facecolor='lightgreen', alpha=0.7),
-                        arrowprops=dict(arrowstyle='->', color='darkgreen', lw=1.5))
-            interesting_trials.append(trial_idx)
 
     # Labels
     ax.set_xlabel('Charge Weight (grains)', fontsize=9, fontweight='bold')
@@ -13,70 +13,73 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from group_metrics import containment_radius
+from group_tables import ratio_mean
+from simulation import MonteCarloKernel
+from simulation_cache import cached
 
 # Simulation parameters
 N_CHARGES = 3  # Three different charge weights
 SHOTS_PER_CHARGE = 3  # Three shots each, round-robin
 TRUE_MOA = 1.2  # True rifle precision (same for all charges)
 N_TRIALS = 6  # Show multiple trials
+N_CHANCE_TRIALS = 20000  # Trials scored in bulk to estimate the chance rate
+CONVERGENCE_THRESHOLD = 0.7  # Median radius (inches) that "looks converged"
+EXAMPLE_SEED = 52  # Root seed of the example trials
+CHANCE_SEED = 42  # Root seed of the bulk chance-rate trials
 
 # Charge weight labels
 CHARGE_LABELS = ['40.5gr', '41.0gr', '41.5gr']
 CHARGE_COLORS = ['red', 'blue', 'green']
 
+
+def sample_round_robin(rng, size):
+    """
+    Shots of `size` round-robin trials, shape (size, N_CHARGES,
+    SHOTS_PER_CHARGE, 2). Every charge gets its own random center (aim point
+    variation) but the same dispersion; TRUE_MOA is the expected 5-shot
+    group size, so sigma comes from the ES/sigma lookup table.
+    """
+    sigma = TRUE_MOA / ratio_mean('es', 5)
+    centers = rng.normal(0, 0.3, (size, N_CHARGES, 1, 2))
+    return centers + rng.normal(0, sigma, (size, N_CHARGES, SHOTS_PER_CHARGE, 2))
+
+
+@cached(global_rng=False)
+def simulate_convergence_scores(n_trials, seed=CHANCE_SEED):
+    """Score many round-robin trials at once; returns each trial's R50."""
+    shots = MonteCarloKernel(seed).generate(n_trials, sample_round_robin)
+    return containment_radius(shots.reshape(n_trials, -1, 2), 0.5)
+
+
 # Create figure with small multiples
 fig, axes = plt.subplots(2, 3, figsize=(14, 9))
 axes = axes.flatten()
 
 convergence_scores = []
 
+# Simulate shooting - all charges have same true precision
+example_shots = MonteCarloKernel(EXAMPLE_SEED).generate(N_TRIALS, sample_round_robin)
+
 for trial_idx in range(N_TRIALS):
     ax = axes[trial_idx]
 
-    # Set different random seed for each trial
-    np.random.seed(42 + trial_idx * 10)
-
-    # Simulate shooting - all charges have same true precision
-    # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma
-    sigma = TRUE_MOA / 3.0
-
-    all_shots_x = []
-    all_shots_y = []
-
     for charge_idx in range(N_CHARGES):
-        # Each charge has its own random center point (representing aim point variation)
-        # but same dispersion
-        center_x = np.random.normal(0, 0.3)  # Small aim point variation
-        center_y = np.random.normal(0, 0.3)
-
-        # Generate shots
-        x = np.random.normal(center_x, sigma, SHOTS_PER_CHARGE)
-        y = np.random.normal(center_y, sigma, SHOTS_PER_CHARGE)
-
-        all_shots_x.append(x)
-        all_shots_y.append(y)
-
         # Plot shots for this charge
+        x, y = example_shots[trial_idx, charge_idx].T
         ax.scatter(x, y, c=CHARGE_COLORS[charge_idx], s=100,
                    alpha=0.7, edgecolors='black', linewidths=1.5,
                    label=CHARGE_LABELS[charge_idx], marker='o')
 
     # Calculate "convergence score" - how tight are all shots together?
     # Measure by calculating the radius of smallest circle containing 50% of shots
-    all_x = np.concatenate(all_shots_x)
-    all_y = np.concatenate(all_shots_y)
+    all_shots = example_shots[trial_idx].reshape(-1, 2)
 
     # Calculate centroid
-    centroid_x = np.mean(all_x)
-    centroid_y = np.mean(all_y)
+    centroid_x, centroid_y = all_shots.mean(axis=0)
 
-    # Calculate distances from centroid
-    distances = np.sqrt((all_x - centroid_x)**2 + (all_y - centroid_y)**2)
-    median_distance = np.median(distances)
-    max_distance = np.max(distances)
+    # Radius about the centroid that holds 50% of shots (R50)
+    median_distance = containment_radius(all_shots, 0.5)
 
     convergence_scores.append(median_distance)
 
@@ -91,7 +94,7 @@ for trial_idx in range(N_TRIALS):
             markeredgewidth=3, label='Group center')
 
     # Annotate if this is a "lucky" convergent trial
-    if median_distance < 0.7:  # Threshold for "good convergence"
+    if median_distance < CONVERGENCE_THRESHOLD:  # Threshold for "good convergence"
         ax.text(0.5, 0.95, 'Apparent\nConvergence!',
                 transform=ax.transAxes,
                 fontsize=10, fontweight='bold', color='darkgreen',
@@ -122,12 +125,14 @@ fig.suptitle('OCW Round-Robin Illusion: Random Convergence is NOT a Real "Node"\
              fontsize=14, fontweight='bold', y=0.98)
 
 # Add explanatory text
-lucky_trials = sum(1 for score in convergence_scores if score < 0.7)
+lucky_trials = sum(1 for score in convergence_scores if score < CONVERGENCE_THRESHOLD)
+chance_rate = np.mean(simulate_convergence_scores(N_CHANCE_TRIALS) < CONVERGENCE_THRESHOLD)
 explanation = (
     f'True precision: {TRUE_MOA} MOA (all charges)\n'
     f'No real "nodes" - all charges identical\n'
     f'\n'
     f'Trials showing "convergence": {lucky_trials}/{N_TRIALS}\n'
+    f'In {N_CHANCE_TRIALS:,} simulated trials: {chance_rate:.0%}\n'
     f'This is pure random chance!\n'
     f'\n'
     f'Purple circle = 50% of shots\n'
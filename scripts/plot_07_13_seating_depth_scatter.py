@@ -13,8 +13,8 @@ import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from simulation import MonteCarloKernel
+from simulation_studies import simulate_groups
 
 # Simulation parameters
 SEATING_DEPTHS = np.array([0.010, 0.020, 0.030, 0.040, 0.050])  # inches off lands
@@ -22,24 +22,23 @@ SHOTS_PER_DEPTH = 5  # Typical forum test
 TRUE_GROUP_SIZE = 1.0  # MOA (flat response - no real difference)
 N_SMALL_TRIALS = 4  # Number of small-sample trials to show
 N_LARGE_SAMPLE = 30  # Large sample to show truth
+N_LARGE_TRIALS = 5  # Large-sample repeats to show convergence
 
-# Function to simulate group size (Rayleigh distribution approximation)
-def simulate_group_size(true_moa, n_shots):
-    """Simulate extreme spread group size from circular normal distribution."""
-    # TRUE_MOA represents expected 5-shot group size
-    # For 2D normal, E[5-shot ES] ≈ 3.0 * sigma
-    sigma = true_moa / 3.0
-    x = np.random.normal(0, sigma, n_shots)
-    y = np.random.normal(0, sigma, n_shots)
+SMALL_SEED = 42  # Root seed of the small-sample trials
+LARGE_SEED = 100  # Root seed of the large-sample trials
 
-    # Calculate extreme spread
-    max_dist = 0
-    for i in range(n_shots):
-        for j in range(i + 1, n_shots):
-            dist = np.sqrt((x[i] - x[j])**2 + (y[i] - y[j])**2)
-            max_dist = max(max_dist, dist)
 
-    return max_dist
+def seating_trials(n_trials, shots_per_group, seed):
+    """Group sizes of n_trials seating tests, shape (n_trials, depths)."""
+    n_depths = len(SEATING_DEPTHS)
+    sizes = MonteCarloKernel(seed).generate(n_trials, lambda rng, size: simulate_groups(
+        size * n_depths, shots_per_group, TRUE_GROUP_SIZE, rng))
+    return sizes.reshape(n_trials, n_depths)
+
+
+# One group per seating depth in every trial
+small_group_sizes = seating_trials(N_SMALL_TRIALS, SHOTS_PER_DEPTH, SMALL_SEED)
+all_large_group_sizes = seating_trials(N_LARGE_TRIALS, N_LARGE_SAMPLE, LARGE_SEED)
 
 # Create figure with small multiples
 fig = plt.figure(figsize=(14, 10))
@@ -48,16 +47,8 @@ fig = plt.figure(figsize=(14, 10))
 for trial_idx in range(N_SMALL_TRIALS):
     ax = plt.subplot(2, 4, trial_idx + 1)
 
-    # Set different random seed for each trial
-    np.random.seed(42 + trial_idx * 5)
-
-    # Simulate group sizes for each seating depth
-    group_sizes = []
-    for depth in SEATING_DEPTHS:
-        group_size = simulate_group_size(TRUE_GROUP_SIZE, SHOTS_PER_DEPTH)
-        group_sizes.append(group_size)
-
-    group_sizes = np.array(group_sizes)
+    # Group sizes for each seating depth in this trial
+    group_sizes = small_group_sizes[trial_idx]
 
     # Plot the data
     ax.plot(SEATING_DEPTHS, group_sizes, 'o-', color='steelblue',
@@ -94,24 +85,12 @@ for trial_idx in range(N_SMALL_TRIALS):
 ax_large = plt.subplot(2, 1, 2)
 
 # Multiple large samples to show convergence
-n_large_trials = 5
-all_large_group_sizes = []
-
-for trial_idx in range(n_large_trials):
-    np.random.seed(100 + trial_idx)
-
-    large_group_sizes = []
-    for depth in SEATING_DEPTHS:
-        group_size = simulate_group_size(TRUE_GROUP_SIZE, N_LARGE_SAMPLE)
-        large_group_sizes.append(group_size)
-
-    all_large_group_sizes.append(large_group_sizes)
-
+for trial_idx, large_group_sizes in enumerate(all_large_group_sizes):
     # Plot each trial
-    alpha_val = 0.3 if trial_idx < n_large_trials - 1 else 0.8
-    linewidth_val = 1 if trial_idx < n_large_trials - 1 else 2.5
+    alpha_val = 0.3 if trial_idx < N_LARGE_TRIALS - 1 else 0.8
+    linewidth_val = 1 if trial_idx < N_LARGE_TRIALS - 1 else 2.5
     label_val = 'Other trials' if trial_idx == 0 else None
-    if trial_idx == n_large_trials - 1:
+    if trial_idx == N_LARGE_TRIALS - 1:
         label_val = f'Large sample ({N_LARGE_SAMPLE} shots each)'
 
     ax_large.plot(SEATING_DEPTHS, large_group_sizes, 'o-', color='steelblue',
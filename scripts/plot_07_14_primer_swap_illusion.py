@@ -5,16 +5,16 @@ Shows how small samples create false differences between identical primers.
 
 Educational Purpose:
 Demonstrates that testing primers with small samples will show apparent SD
-differences even when primers are identical. About 20% of small trials show
-"amazing" sub-10 fps SD by pure luck. Large samples reveal the truth.
+differences even when primers are identical. About 1 in 11 ten-shot trials
+shows an "amazing" sub-10 fps SD by pure luck. Large samples reveal the truth.
 """
 
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from sampling_distributions import prob_sd_lower, sd_cdf
+from simulation import MonteCarloKernel, make_rng
 
 # Simulation parameters
 TRUE_SD = 15  # fps (both primers are identical)
@@ -23,11 +23,10 @@ SMALL_SAMPLE_SIZE = 10
 LARGE_SAMPLE_SIZE = 50
 N_SMALL_TRIALS = 50  # Many trials to show distribution
 
-# Function to calculate sample SD
-def calculate_sample_sd(true_sd, sample_size):
-    """Simulate sample standard deviation."""
-    samples = np.random.normal(0, true_sd, sample_size)
-    return np.std(samples, ddof=1)
+SMALL_SEED = 42  # Root seed of the small-sample trials
+LARGE_SEED = 1000  # Root seed of the large-sample comparison
+JITTER_SEED = 7  # Horizontal jitter of the plotted points (display only)
+BETTER_FED_SD = 13  # fps, a real 2 fps improvement for the "what if" line
 
 # Create figure with multiple panels
 fig = plt.figure(figsize=(14, 10))
@@ -35,21 +34,11 @@ fig = plt.figure(figsize=(14, 10))
 # Panel 1: Distribution of measured SDs from small samples
 ax1 = plt.subplot(2, 2, (1, 2))
 
-# Simulate many small-sample trials
-cci_small_sds = []
-fed_small_sds = []
-
-for trial in range(N_SMALL_TRIALS):
-    np.random.seed(42 + trial * 2)
-    cci_sd = calculate_sample_sd(TRUE_SD, SMALL_SAMPLE_SIZE)
-    cci_small_sds.append(cci_sd)
-
-    np.random.seed(42 + trial * 2 + 1)
-    fed_sd = calculate_sample_sd(TRUE_SD, SMALL_SAMPLE_SIZE)
-    fed_small_sds.append(fed_sd)
-
-cci_small_sds = np.array(cci_small_sds)
-fed_small_sds = np.array(fed_small_sds)
+# Simulate many small-sample trials: (trial, primer, shot) deviations
+small_samples = MonteCarloKernel(SMALL_SEED).generate(N_SMALL_TRIALS, lambda rng, size: rng.normal(
+    0, TRUE_SD, (size, 2, SMALL_SAMPLE_SIZE)))
+small_sds = np.std(small_samples, axis=-1, ddof=1)
+cci_small_sds, fed_small_sds = small_sds[:, 0], small_sds[:, 1]
 
 # Plot histograms
 bins = np.linspace(0, 30, 31)
@@ -66,6 +55,8 @@ ax1.axvline(TRUE_SD, color='black', linestyle='--', linewidth=2.5,
 amazing_threshold = 10
 n_amazing_cci = np.sum(cci_small_sds < amazing_threshold)
 n_amazing_fed = np.sum(fed_small_sds < amazing_threshold)
+# Exact chance of an "amazing" SD for a single string (scaled chi distribution)
+p_amazing = sd_cdf(amazing_threshold, TRUE_SD, SMALL_SAMPLE_SIZE)
 
 ax1.axvline(amazing_threshold, color='gold', linestyle=':', linewidth=2,
             label=f'"Amazing" threshold (<{amazing_threshold} fps)')
@@ -86,8 +77,9 @@ stats_text = (
     f'CCI: {n_amazing_cci}/{N_SMALL_TRIALS} = {n_amazing_cci/N_SMALL_TRIALS*100:.0f}%\n'
     f'Federal: {n_amazing_fed}/{N_SMALL_TRIALS} = {n_amazing_fed/N_SMALL_TRIALS*100:.0f}%\n'
     f'\n'
-    f'~20% of trials look "amazing"\n'
-    f'by pure luck!'
+    f'Exact chance per string: {p_amazing:.1%}\n'
+    f'Identical primers still look\n'
+    f'"amazing" by pure luck!'
 )
 
 ax1.text(0.98, 0.97, stats_text, transform=ax1.transAxes,
@@ -104,10 +96,9 @@ ax2 = plt.subplot(2, 2, 3)
 differences = np.abs(cci_small_sds - fed_small_sds)
 lucky_trial_idx = np.argmax(differences)
 
-np.random.seed(42 + lucky_trial_idx * 2)
-cci_shots = np.random.normal(2800, TRUE_SD, SMALL_SAMPLE_SIZE)
-np.random.seed(42 + lucky_trial_idx * 2 + 1)
-fed_shots = np.random.normal(2800, TRUE_SD, SMALL_SAMPLE_SIZE)
+cci_shots = 2800 + small_samples[lucky_trial_idx, 0]
+fed_shots = 2800 + small_samples[lucky_trial_idx, 1]
+jitter_rng = make_rng(JITTER_SEED)
 
 # Violin plots
 parts = ax2.violinplot([cci_shots, fed_shots], positions=[1, 2],
@@ -121,9 +112,9 @@ for i, pc in enumerate(parts['bodies']):
     pc.set_linewidth(1.5)
 
 # Add individual points
-ax2.scatter(np.ones(SMALL_SAMPLE_SIZE) + np.random.normal(0, 0.04, SMALL_SAMPLE_SIZE),
+ax2.scatter(np.ones(SMALL_SAMPLE_SIZE) + jitter_rng.normal(0, 0.04, SMALL_SAMPLE_SIZE),
             cci_shots, alpha=0.6, color='red', s=50, edgecolors='darkred', linewidths=1)
-ax2.scatter(2 * np.ones(SMALL_SAMPLE_SIZE) + np.random.normal(0, 0.04, SMALL_SAMPLE_SIZE),
+ax2.scatter(2 * np.ones(SMALL_SAMPLE_SIZE) + jitter_rng.normal(0, 0.04, SMALL_SAMPLE_SIZE),
             fed_shots, alpha=0.6, color='blue', s=50, edgecolors='darkblue', linewidths=1)
 
 # Labels
@@ -140,11 +131,9 @@ ax2.grid(True, alpha=0.3, linestyle=':', linewidth=0.5, axis='y')
 # Panel 3: Large sample showing truth
 ax3 = plt.subplot(2, 2, 4)
 
-# Generate large samples
-np.random.seed(1000)
-cci_large = np.random.normal(2800, TRUE_SD, LARGE_SAMPLE_SIZE)
-np.random.seed(1001)
-fed_large = np.random.normal(2800, TRUE_SD, LARGE_SAMPLE_SIZE)
+# Generate large samples: one trial of both primers
+cci_large, fed_large = MonteCarloKernel(LARGE_SEED).generate(1, lambda rng, size: rng.normal(
+    2800, TRUE_SD, (size, 2, LARGE_SAMPLE_SIZE)))[0]
 
 cci_large_sd = np.std(cci_large, ddof=1)
 fed_large_sd = np.std(fed_large, ddof=1)
@@ -162,10 +151,10 @@ for i, pc in enumerate(parts['bodies']):
 
 # Add individual points (subset for visibility)
 subset_size = 30
-ax3.scatter(np.ones(subset_size) + np.random.normal(0, 0.04, subset_size),
+ax3.scatter(np.ones(subset_size) + jitter_rng.normal(0, 0.04, subset_size),
             cci_large[:subset_size], alpha=0.4, color='red', s=30,
             edgecolors='darkred', linewidths=0.5)
-ax3.scatter(2 * np.ones(subset_size) + np.random.normal(0, 0.04, subset_size),
+ax3.scatter(2 * np.ones(subset_size) + jitter_rng.normal(0, 0.04, subset_size),
             fed_large[:subset_size], alpha=0.4, color='blue', s=30,
             edgecolors='darkblue', linewidths=0.5)
 
@@ -186,21 +175,25 @@ fig.suptitle('Primer Swap Illusion: Same Primers, Different Conclusions from Dif
              fontsize=14, fontweight='bold', y=0.98)
 
 # Add explanatory text
+# Exact chance that a truly better Federal primer measures the lower SD
+small_win = prob_sd_lower(BETTER_FED_SD, TRUE_SD, SMALL_SAMPLE_SIZE)
+large_win = prob_sd_lower(BETTER_FED_SD, TRUE_SD, LARGE_SAMPLE_SIZE)
 explanation = (
-    f'Both primers truly identical: {TRUE_SD} fps SD\n'
-    f'\n'
-    f'Small sample ({SMALL_SAMPLE_SIZE} shots): Often looks different\n'
-    f'Large sample ({LARGE_SAMPLE_SIZE} shots): Converges to truth\n'
-    f'\n'
+    f'Both primers truly identical: {TRUE_SD} fps SD.   '
+    f'Small sample ({SMALL_SAMPLE_SIZE} shots): Often looks different.   '
+    f'Large sample ({LARGE_SAMPLE_SIZE} shots): Converges to truth.\n'
+    f'Even if Federal were truly {BETTER_FED_SD} fps, it would measure the lower SD in only '
+    f'{small_win:.0%} of {SMALL_SAMPLE_SIZE}-shot tests ({large_win:.0%} of '
+    f'{LARGE_SAMPLE_SIZE}-shot tests).   '
     f'Don\'t trust primer comparisons with <30 shots!'
 )
 
-fig.text(0.99, 0.01, explanation, fontsize=8.5,
-         verticalalignment='bottom', horizontalalignment='right',
+fig.text(0.5, 0.01, explanation, fontsize=9, multialignment='center',
+         verticalalignment='bottom', horizontalalignment='center',
          bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.9, edgecolor='black', linewidth=1))
 
 # Tight layout
-plt.tight_layout(rect=[0, 0.03, 1, 0.96])
+plt.tight_layout(rect=[0, 0.06, 1, 0.96])
 
 # Save the figure
 output_path = Path(__file__).parent.parent / 'lessons' / 'static' / 'nb07_plot14_primer_swap_illusion.png'
@@ -16,10 +16,13 @@ This reinforces why you need 30+ shots, not stricter p-values with 5 shots.
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
-from scipy import stats
 
-# Set random seed for reproducibility
-np.random.seed(42)
+from hypothesis_tests import f_test, ttest_ind
+from simulation import MonteCarloKernel
+from simulation_cache import cached
+
+# Seed for reproducibility
+SEED = 42
 
 # Create the figure
 fig = plt.figure(figsize=(16, 10))
@@ -34,9 +37,24 @@ true_sd_identical = 15  # fps, both loads identical
 true_sd_load_a = 15  # fps
 true_sd_load_b = 10  # fps, actually better
 sample_sizes = [5, 10, 20, 30, 50]
-n_simulations = 1000
+rate_tolerance = 0.001  # simulate until each rate is known to ±0.1 percentage point
 alpha = 0.05  # significance level
 
+
+@cached(global_rng=False)
+def rejection_rate(test, sd_a, sd_b, n):
+    """Percent of simulated load comparisons that `test` calls different."""
+    scale = np.array([[sd_a], [sd_b]])
+
+    def simulate(rng, size):
+        # Samples of both loads for a block of comparisons: (size, load, shot)
+        samples = rng.normal(2850, scale, (size, 2, n))
+        return test(samples[:, 0], samples[:, 1]).pvalue < alpha
+
+    result = MonteCarloKernel(SEED).run_to_precision(simulate, rate_tolerance)
+    return result.estimate * 100
+
+
 # Colors
 color_false_alarm = 'red'
 color_missed_opportunity = 'orange'
@@ -45,20 +63,9 @@ color_correct = 'darkgreen'
 # --- Plot 1: False Alarm Rate (Type I Error) ---
 ax1 = fig.add_subplot(gs[0, 0])
 
-false_alarm_rates = []
-for n in sample_sizes:
-    false_alarms = 0
-    for _ in range(n_simulations):
-        # Generate two samples from IDENTICAL loads
-        sample_a = np.random.normal(2850, true_sd_identical, n)
-        sample_b = np.random.normal(2850, true_sd_identical, n)
-
-        # Test if they're "different"
-        _, p_value = stats.ttest_ind(sample_a, sample_b)
-        if p_value < alpha:
-            false_alarms += 1
-
-    false_alarm_rates.append(false_alarms / n_simulations * 100)
+# Two samples from IDENTICAL loads: how often does the t-test call them "different"?
+false_alarm_rates = [rejection_rate(ttest_ind, true_sd_identical, true_sd_identical, n)
+                     for n in sample_sizes]
 
 ax1.bar(sample_sizes, false_alarm_rates, color=color_false_alarm, alpha=0.7,
         edgecolor='darkred', linewidth=2)
@@ -88,28 +95,10 @@ ax1.text(0.95, 0.95,
 # --- Plot 2: Detection Rate (1 - Type II Error) = Statistical Power ---
 ax2 = fig.add_subplot(gs[0, 1])
 
-detection_rates = []
-for n in sample_sizes:
-    detections = 0
-    for _ in range(n_simulations):
-        # Generate two samples from DIFFERENT loads (B is actually better)
-        sample_a = np.random.normal(2850, true_sd_load_a, n)
-        sample_b = np.random.normal(2850, true_sd_load_b, n)
-
-        # Test if we can detect the difference
-        # Use variance test (F-test) since we're testing SD difference
-        var_a = np.var(sample_a, ddof=1)
-        var_b = np.var(sample_b, ddof=1)
-        f_stat = var_a / var_b
-        df1 = n - 1
-        df2 = n - 1
-        p_value = 2 * min(stats.f.cdf(f_stat, df1, df2),
-                         1 - stats.f.cdf(f_stat, df1, df2))
-
-        if p_value < alpha:
-            detections += 1
-
-    detection_rates.append(detections / n_simulations * 100)
+# Two samples from DIFFERENT loads (B is actually better): can we detect it?
+# Use variance test (F-test) since we're testing SD difference
+detection_rates = [rejection_rate(f_test, true_sd_load_a, true_sd_load_b, n)
+                   for n in sample_sizes]
 
 ax2.bar(sample_sizes, detection_rates, color=color_correct, alpha=0.7,
         edgecolor='darkgreen', linewidth=2)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Running (Prefix) Group Metrics
+ES, MR and group center after every shot of a string, without starting over.
+
+Convergence plots ask "what did the group look like after 1, 2, ..., n shots?"
+Recomputing ES from scratch for every prefix costs O(n²) per prefix and O(n³)
+per string. Two tools here avoid that:
+
+- PrefixGroupTracker takes one shot at a time. It keeps the convex hull of
+  the shots so far: a new shot inside the hull cannot change ES, and a shot
+  outside it only has to be compared against the hull vertices (a handful of
+  shots, growing roughly like log n for normal dispersion).
+- prefix_curves() emits the whole prefix curve for a batch of strings at
+  once, shape (n_strings, n_shots, 2) in, (n_strings, n_shots) out. With
+  Numba installed its running-ES loop is compiled (see group_kernels.py).
+
+Usage:
+    from prefix_metrics import PrefixGroupTracker, prefix_curves
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+import group_kernels
+from group_metrics import as_shots, convex_hull
+
+
+class PrefixCurves(NamedTuple):
+    """Running metrics after each shot, from prefix_curves()."""
+    es: np.ndarray           # Extreme spread after shot n, shape (..., n_shots)
+    mr: np.ndarray           # Mean radius about the running center, shape (..., n_shots)
+    mr_aim: np.ndarray       # Mean radius about the aim point, shape (..., n_shots)
+    center: np.ndarray       # Running group center, shape (..., n_shots, 2)
+
+
+class PrefixGroupTracker:
+    """
+    Incremental ES / MR / group center for a single string of shots.
+
+    ES and the group center update in amortized sub-linear time per shot.
+    MR about the aim point updates in O(1). MR about the running center has
+    no exact incremental form (every radius changes when the center moves),
+    so it is computed with one vectorized pass over the stored shots, and
+    only when it is read.
+    """
+
+    __slots__ = ('aim_point', '_shots', '_count', '_sum', '_aim_radius_sum',
+                 '_hull', '_es2')
+
+    def __init__(self, aim_point=(0.0, 0.0), capacity=64):
+        self.aim_point = np.asarray(aim_point, dtype=float)
+        self._shots = np.empty((capacity, 2))
+        self._count = 0
+        self._sum = np.zeros(2)
+        self._aim_radius_sum = 0.0
+        self._hull = np.empty((0, 2))
+        self._es2 = 0.0
+
+    def push(self, x, y):
+        """Add one shot and return the updated ES."""
+        point = np.array([x, y], dtype=float)
+        if self._count == len(self._shots):
+            self._shots = np.concatenate([self._shots, np.empty_like(self._shots)])
+        self._shots[self._count] = point
+        self._count += 1
+        self._sum += point
+        self._aim_radius_sum += float(np.hypot(*(point - self.aim_point)))
+
+        if not self._inside_hull(point):
+            # The farthest shot from a new point is always a hull vertex
+            if len(self._hull):
+                d = self._hull - point
+                self._es2 = max(self._es2, float(np.max(np.einsum('ij,ij->i', d, d))))
+            self._hull = convex_hull(np.vstack([self._hull, point]))
+        return self.es
+
+    def extend(self, shots):
+        """Add several shots, shape (n_shots, 2), one after another."""
+        for x, y in as_shots(shots):
+            self.push(x, y)
+        return self.es
+
+    @property
+    def count(self):
+        return self._count
+
+    @property
+    def es(self):
+        return float(np.sqrt(self._es2))
+
+    @property
+    def center(self):
+        if self._count == 0:
+            return np.full(2, np.nan)
+        return self._sum / self._count
+
+    @property
+    def mr(self):
+        if self._count == 0:
+            return float('nan')
+        offsets = self._shots[:self._count] - self.center
+        return float(np.mean(np.sqrt(np.einsum('ij,ij->i', offsets, offsets))))
+
+    @property
+    def mr_aim(self):
+        if self._count == 0:
+            return float('nan')
+        return self._aim_radius_sum / self._count
+
+    @property
+    def hull(self):
+        """Current convex hull vertices, counter-clockwise."""
+        return self._hull.copy()
+
+    def _inside_hull(self, point):
+        if len(self._hull) < 3:
+            return False
+        edges = np.roll(self._hull, -1, axis=0) - self._hull
+        rel = point - self._hull
+        return bool(np.all(edges[:, 0] * rel[:, 1] - edges[:, 1] * rel[:, 0] >= 0))
+
+
+def prefix_curves(shots, aim_point=(0.0, 0.0)):
+    """
+    Running ES, MR (about the running center and about the aim point) and
+    group center after each shot, for a batch of strings shaped
+    (..., n_shots, 2). Returns a PrefixCurves tuple.
+    """
+    shots = as_shots(shots)
+    batch_shape = shots.shape[:-2]
+    n_shots = shots.shape[-2]
+    flat = shots.reshape(int(np.prod(batch_shape)), n_shots, 2)
+    counts = np.arange(1, n_shots + 1)
+
+    center = np.cumsum(flat, axis=1) / counts[:, np.newaxis]
+
+    aim_offsets = flat - np.asarray(aim_point, dtype=float)
+    aim_radii = np.sqrt(np.einsum('gnk,gnk->gn', aim_offsets, aim_offsets))
+    mr_aim = np.cumsum(aim_radii, axis=1) / counts
+
+    es = _prefix_es(flat)
+    mr = _prefix_mr(flat, center)
+
+    return PrefixCurves(
+        es=es.reshape(batch_shape + (n_shots,)),
+        mr=mr.reshape(batch_shape + (n_shots,)),
+        mr_aim=mr_aim.reshape(batch_shape + (n_shots,)),
+        center=center.reshape(batch_shape + (n_shots, 2)),
+    )
+
+
+def _prefix_es(flat):
+    """
+    Running ES for (n_strings, n_shots, 2). Shot n can only raise ES if
+    |p_n - o| + max_{i<n} |p_i - o| > ES_{n-1} for any fixed point o (here
+    each string's overall center), so most shots are ruled out without
+    measuring a single pairwise distance.
+    """
+    n_strings, n_shots, _ = flat.shape
+    es2 = np.zeros((n_strings, n_shots))
+    if n_shots < 2 or n_strings == 0:
+        return es2
+    if group_kernels.compiled():
+        return group_kernels.prefix_es(np.ascontiguousarray(flat), flat.mean(axis=1))
+
+    offsets = flat - flat.mean(axis=1, keepdims=True)
+    reach = np.sqrt(np.einsum('gnk,gnk->gn', offsets, offsets))
+    prior_reach = np.maximum.accumulate(reach, axis=1)
+
+    current = np.zeros(n_strings)
+    for n in range(1, n_shots):
+        bound = reach[:, n] + prior_reach[:, n - 1]
+        active = np.flatnonzero(bound * bound > current)
+        if len(active):
+            d = flat[active, :n, :] - flat[active, n, np.newaxis, :]
+            farthest = np.max(np.einsum('gnk,gnk->gn', d, d), axis=1)
+            current[active] = np.maximum(current[active], farthest)
+        es2[:, n] = current
+    return np.sqrt(es2)
+
+
+def _prefix_mr(flat, center):
+    """
+    Running MR about the running center. Every radius changes when the
+    center moves, so each prefix needs one pass over its shots; the work is
+    laid out shot-major with reused buffers so each pass is a few
+    contiguous ufunc calls across all strings.
+    """
+    n_strings, n_shots, _ = flat.shape
+    x = np.ascontiguousarray(flat[..., 0].T)
+    y = np.ascontiguousarray(flat[..., 1].T)
+    center_x = np.ascontiguousarray(center[..., 0].T)
+    center_y = np.ascontiguousarray(center[..., 1].T)
+
+    mr = np.empty((n_shots, n_strings))
+    dx_buffer = np.empty((n_shots, n_strings))
+    dy_buffer = np.empty((n_shots, n_strings))
+    for n in range(n_shots):
+        dx = np.subtract(x[:n + 1], center_x[n], out=dx_buffer[:n + 1])
+        dy = np.subtract(y[:n + 1], center_y[n], out=dy_buffer[:n + 1])
+        np.multiply(dx, dx, out=dx)
+        np.multiply(dy, dy, out=dy)
+        np.add(dx, dy, out=dx)
+        np.sqrt(dx, out=dx)
+        mr[n] = dx.sum(axis=0) / (n + 1)
+    return mr.T
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Running Moments
+One-pass, mergeable count / mean / variance / min / max of any quantity.
+
+RunningMoments keeps five numbers (count, mean, M2, min, max), updated with
+Welford's recurrence one value at a time or a whole array at a time, and
+combined across chunks, files or processes with merge() (Chan et al.
+parallel update). It knows nothing about what it summarizes:
+velocity_stats.VelocityStats builds the chronograph summaries on it, and
+the simulation code (simulation.run_to_precision,
+streaming_stats.StreamSummary) uses it for per-trial results.
+
+Usage:
+    from running_moments import RunningMoments
+    moments = RunningMoments()
+    for chunk in chunks:
+        moments.update(chunk)
+    print(moments.mean, moments.sd, moments.sem)
+"""
+
+import numpy as np
+
+
+class RunningMoments:
+    """Welford accumulator for count, mean, M2, min and max."""
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    @classmethod
+    def from_values(cls, values):
+        """Accumulator summarizing an array of values."""
+        moments = cls()
+        moments.update(values)
+        return moments
+
+    def push(self, value):
+        """Add one value (Welford's update)."""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        return self
+
+    def update(self, values):
+        """Add many values at once: summarize them in NumPy, then merge."""
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return self
+        chunk = RunningMoments()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.sum((values - chunk.mean)**2))
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        self._absorb(chunk)
+        return self
+
+    def merge(self, other):
+        """Return a new accumulator combining this one and `other`."""
+        combined = self.copy()
+        combined._absorb(other)
+        return combined
+
+    def copy(self):
+        clone = type(self)()
+        clone.count, clone.mean, clone.m2 = self.count, self.mean, self.m2
+        clone.min, clone.max = self.min, self.max
+        return clone
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1 denominator), NaN below two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def sd(self):
+        """Sample standard deviation, matching pandas' Series.std()."""
+        return float(np.sqrt(self.variance))
+
+    @property
+    def sem(self):
+        """Standard error of the mean."""
+        return self.sd / np.sqrt(self.count) if self.count else float('nan')
+
+    def __repr__(self):
+        return (f"RunningMoments(n={self.count}, mean={self.mean:.4g}, "
+                f"sd={self.sd:.4g})")
+
+    def _absorb(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
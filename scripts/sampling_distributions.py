@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Sampling Distributions of Velocity Statistics
+Exact distribution of the sample SD and sample mean of normal shot strings.
+
+The SD-illusion lessons (plot_01_06, plot_05_15, plot_07_14) simulate
+thousands of strings just to show how widely the measured SD scatters.
+For normally distributed velocities none of that is needed. If a string
+has n shots and true SD σ:
+
+- the sample SD S (ddof=1) is σ · χ_{n-1} / sqrt(n - 1), a scaled chi
+  distribution with E[S] = c(n - 1) · σ (group_metrics.chi_bias_factor);
+- the sample mean is normal with SD σ / sqrt(n), independent of S;
+- (mean - μ) / (S / sqrt(n)) follows Student's t with n - 1 degrees of
+  freedom;
+- for two independent strings, (S_a / σ_a)² / (S_b / σ_b)² follows an F
+  distribution, so the chance that one load measures the lower SD is
+  exact too.
+
+Every function takes arrays for the values, σ and n (they broadcast), so a
+whole table of "P(SD < 10 fps | true 15 fps, n)" is one call.
+
+Because the mean and SD are independent with known distributions (and
+together sufficient for a normal string), simulations that only look at
+each string's mean and SD can draw the pair directly with
+sample_string_stats(): two draws per string whatever its length, instead
+of n shots.
+
+Usage:
+    from sampling_distributions import sd_cdf, sd_quantile, sd_interval
+    sd_cdf(10, sigma=15, n=5)                # P(measured SD < 10 fps) ≈ 0.22
+    sd_quantile([0.05, 0.95], sigma=15, n=10)
+    sd_interval(8.0, n=10)                   # 95% interval for the true SD
+    sds = sample_string_stats(100, 2850, 15, size=10_000_000).sd
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy import stats
+
+from group_metrics import chi_bias_factor
+
+
+class StringStats(NamedTuple):
+    """Mean and SD (ddof=1) of simulated strings."""
+    mean: np.ndarray
+    sd: np.ndarray
+
+
+def sample_string_stats(n, mu, sigma, size=None, rng=np.random):
+    """
+    Mean and SD of `size` simulated n-shot normal strings, drawn from their
+    joint distribution instead of from individual shots. n, mu and sigma may
+    be arrays that broadcast against `size`. `rng` is np.random (the global
+    stream) by default, or any Generator/RandomState.
+    """
+    df = _degrees_of_freedom(n)
+    sigma = np.asarray(sigma, dtype=float)
+    mean = rng.normal(mu, sigma / np.sqrt(df + 1), size)
+    sd = sigma * np.sqrt(rng.chisquare(df, size) / df)
+    return StringStats(mean=mean, sd=sd)
+
+
+def sd_distribution(sigma, n):
+    """Frozen scipy distribution of the sample SD of n shots with true SD sigma."""
+    df = _degrees_of_freedom(n)
+    return stats.chi(df, scale=np.asarray(sigma, dtype=float) / np.sqrt(df))
+
+
+def sd_pdf(sd, sigma, n):
+    """Density of the sample SD at `sd`."""
+    return sd_distribution(sigma, n).pdf(sd)[()]
+
+
+def sd_cdf(sd, sigma, n):
+    """P(sample SD <= sd)."""
+    return sd_distribution(sigma, n).cdf(sd)[()]
+
+
+def sd_quantile(p, sigma, n):
+    """p-quantile(s) of the sample SD."""
+    return sd_distribution(sigma, n).ppf(p)[()]
+
+
+def sd_mean(sigma, n):
+    """E[sample SD]: below sigma by the factor c(n - 1)."""
+    return (np.asarray(sigma, dtype=float) * chi_bias_factor(_degrees_of_freedom(n)))[()]
+
+
+def sd_sd(sigma, n):
+    """Standard deviation of the sample SD."""
+    return (np.asarray(sigma, dtype=float)
+            * np.sqrt(1 - chi_bias_factor(_degrees_of_freedom(n))**2))[()]
+
+
+def prob_sd_within(fraction, sigma, n):
+    """P(sample SD within ±fraction of sigma), e.g. fraction=0.2 for ±20%."""
+    distribution = sd_distribution(sigma, n)
+    sigma = np.asarray(sigma, dtype=float)
+    return (distribution.cdf(sigma * (1 + fraction))
+            - distribution.cdf(sigma * (1 - fraction)))[()]
+
+
+def prob_sd_lower(sigma, other_sigma, n, other_n=None):
+    """
+    P(an n-shot string with true SD sigma measures a lower SD than an
+    other_n-shot string (default n) with true SD other_sigma). Exactly 0.5
+    for identical loads and equal string lengths.
+    """
+    df = _degrees_of_freedom(n)
+    other_df = df if other_n is None else _degrees_of_freedom(other_n)
+    ratio = np.asarray(other_sigma, dtype=float) / np.asarray(sigma, dtype=float)
+    return stats.f.cdf(ratio**2, df, other_df)[()]
+
+
+def sd_interval(sd, n, confidence=0.95):
+    """Two-sided confidence interval (low, high) for the true SD given a measured SD."""
+    df = _degrees_of_freedom(n)
+    sd = np.asarray(sd, dtype=float)
+    alpha = 1 - confidence
+    low = sd * np.sqrt(df / stats.chi2.ppf(1 - alpha / 2, df))
+    high = sd * np.sqrt(df / stats.chi2.ppf(alpha / 2, df))
+    return low[()], high[()]
+
+
+def mean_distribution(mu, sigma, n):
+    """Frozen scipy distribution of the sample mean of n shots."""
+    n = np.asarray(n, dtype=float)
+    return stats.norm(mu, np.asarray(sigma, dtype=float) / np.sqrt(n))
+
+
+def mean_interval(mean, sd, n, confidence=0.95):
+    """Two-sided Student-t confidence interval (low, high) for the true mean."""
+    df = _degrees_of_freedom(n)
+    half_width = (stats.t.ppf(0.5 + confidence / 2, df)
+                  * np.asarray(sd, dtype=float) / np.sqrt(df + 1))
+    mean = np.asarray(mean, dtype=float)
+    return (mean - half_width)[()], (mean + half_width)[()]
+
+
+def _degrees_of_freedom(n):
+    n = np.asarray(n)
+    if np.any(n < 2):
+        raise ValueError("need at least 2 shots per string")
+    return n - 1
+
+
+if __name__ == '__main__':
+    print("P(measured SD < 10 fps) for a true 15 fps load")
+    for n_shots in (3, 5, 10, 20, 30):
+        low, high = sd_quantile([0.05, 0.95], 15, n_shots)
+        print(f"  n={n_shots:2d}  P={sd_cdf(10, 15, n_shots):6.1%}  "
+              f"E[SD]={sd_mean(15, n_shots):5.2f}  90% of SDs in {low:5.2f}-{high:5.2f} fps")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Aim-Point Segmentation
+Assigns unlabeled shot holes on a multi-aimpoint target to their aim points.
+
+A digitized target (like the 5x5 target in lessons/static/300_5x5.jpg) is
+just a list of hole coordinates. Appendix C's composite groups need to know
+which aim point each hole was fired at. Two cases:
+
+- The aim-point grid is known (printed target): every shot goes to its
+  nearest aim point through a KD-tree lookup.
+- The grid is not known: the shots are clustered with vectorized k-means,
+  started from a regular rows x cols grid spanning the shots (which is what
+  a multi-aimpoint target looks like), so the clusters line up with the
+  aim points.
+
+Either result feeds straight into composite.composite_groups().
+
+Usage:
+    from segmentation import composite_from_target
+    result = composite_from_target(holes, rows=5, cols=1)
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from composite import composite_groups
+from group_metrics import as_shots
+
+
+class Segmentation(NamedTuple):
+    """Aim-point assignment for every shot, from segment_target()."""
+    labels: np.ndarray       # Aim point index of each shot, shape (n_shots,)
+    aim_points: np.ndarray   # Aim points (known, or estimated cluster centers), (k, 2)
+    distances: np.ndarray    # Distance from each shot to its aim point
+
+
+def grid_aim_points(rows, cols, spacing, origin=(0.0, 0.0)):
+    """
+    Aim points of a regular grid target, row by row from `origin`.
+    `spacing` is one number or an (x, y) pair; y increases with row.
+    """
+    dx, dy = np.broadcast_to(np.asarray(spacing, dtype=float), (2,))
+    col, row = np.meshgrid(np.arange(cols), np.arange(rows))
+    return np.column_stack([origin[0] + col.ravel() * dx,
+                            origin[1] + row.ravel() * dy])
+
+
+def assign_to_aim_points(shots, aim_points):
+    """Label each shot with its nearest aim point (KD-tree lookup)."""
+    shots = as_shots(shots)
+    aim_points = as_shots(aim_points)
+    distances, labels = cKDTree(aim_points).query(shots)
+    return Segmentation(labels=labels, aim_points=aim_points, distances=distances)
+
+
+def kmeans(shots, initial_centers, max_iter=100, tol=1e-9):
+    """
+    Lloyd's k-means from the given starting centers. Each iteration is one
+    (n_shots, k) distance matrix and a bincount update. A cluster that ends
+    up empty keeps its previous center.
+    """
+    shots = as_shots(shots)
+    centers = as_shots(initial_centers).copy()
+    k = len(centers)
+    for _ in range(max_iter):
+        diff = shots[:, np.newaxis, :] - centers[np.newaxis, :, :]
+        labels = np.argmin(np.einsum('nkd,nkd->nk', diff, diff), axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.stack([np.bincount(labels, weights=shots[:, 0], minlength=k),
+                         np.bincount(labels, weights=shots[:, 1], minlength=k)], axis=-1)
+        occupied = counts > 0
+        updated = centers.copy()
+        updated[occupied] = sums[occupied] / counts[occupied, np.newaxis]
+        moved = np.max(np.abs(updated - centers))
+        centers = updated
+        if moved <= tol:
+            break
+    return centers
+
+
+def estimate_aim_grid(shots, rows, cols):
+    """
+    Estimate the aim points of a rows x cols target from the shots alone:
+    k-means started from a regular grid spanning the shots' bounding box.
+    The estimates are the group centers, which is what a composite needs.
+    """
+    shots = as_shots(shots)
+    low, high = shots.min(axis=0), shots.max(axis=0)
+    span = high - low
+    # Grid cell centers inside the bounding box
+    xs = low[0] + span[0] * (np.arange(cols) + 0.5) / cols
+    ys = low[1] + span[1] * (np.arange(rows) + 0.5) / rows
+    col, row = np.meshgrid(xs, ys)
+    return kmeans(shots, np.column_stack([col.ravel(), row.ravel()]))
+
+
+def segment_target(shots, aim_points=None, rows=None, cols=None):
+    """
+    Assign every shot to an aim point. Pass the known `aim_points`, or the
+    grid shape (`rows`, `cols`) to estimate them from the shots.
+    """
+    if aim_points is None:
+        if rows is None or cols is None:
+            raise ValueError("pass aim_points, or rows and cols to estimate them")
+        aim_points = estimate_aim_grid(shots, rows, cols)
+    return assign_to_aim_points(shots, aim_points)
+
+
+def composite_from_target(shots, aim_points=None, rows=None, cols=None):
+    """Segment an unlabeled target and build its composite group."""
+    segmentation = segment_target(shots, aim_points, rows, cols)
+    return composite_groups(segmentation.labels, shots)
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Kernel
+Seeded random streams and batched draws for every simulation in the project.
+
+The plot scripts used to call the global np.random.seed() and, to get
+"different" trials, reseed it inside loops (42 + trial_idx, ...). Global
+state is slow to reseed, is shared by everything in the process, and cannot
+be split across workers reproducibly. This module replaces it with:
+
+- MonteCarloKernel: one root seed, expanded through numpy's SeedSequence
+  into independent streams, one per fixed-size block of trials. Block b
+  always gets the same stream no matter which process draws it or in what
+  order, so results depend only on the root seed. Each block is drawn as one
+  batched tensor.
+- MonteCarloKernel.run(): the same blocks fanned out across a process
+  pool. Block results are reduced in block order, so the output is
+  bit-identical for any number of workers (including one).
+- run_to_precision(): keeps drawing batches of trials until the confidence
+  interval of the estimated quantity is narrower than a tolerance, instead
+  of a hard-coded trial count. MonteCarloKernel.run_to_precision() does the
+  same with the kernel's block streams.
+- MonteCarloKernel.stream(): folds each block into a constant-memory
+  summary (streaming_stats.StreamSummary) as soon as it is drawn, for
+  runs far too long to keep every result.
+- Variance reduction, each reporting the reduction it achieved against
+  plain independent draws with the same number of evaluations:
+  common_random_numbers() replays the same streams in every compared
+  scenario, antithetic() pairs each normal draw z with -z, and sobol()
+  uses replicated scrambled Sobol points (scipy.stats.qmc) for smooth
+  integrands such as hit probability.
+
+Usage:
+    from simulation import MonteCarloKernel
+    kernel = MonteCarloKernel(seed=42)
+    shots = kernel.shot_groups(n_trials=100_000, n_shots=5, sigma=0.5)
+    es = kernel.run(1_000_000, simulate_es)   # simulate_es(rng, size) at module level
+"""
+
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from running_moments import RunningMoments
+
+DEFAULT_SEED = 42
+
+# Trials per random stream. Fixed so a given seed always produces the same
+# trials, however the blocks are later split between workers.
+DEFAULT_BLOCK_SIZE = 65_536
+
+# Safety cap for adaptive runs
+DEFAULT_MAX_TRIALS = 10_000_000
+
+
+class PrecisionResult(NamedTuple):
+    """Outcome of an adaptive run, from run_to_precision()."""
+    estimate: float        # Mean of the per-trial quantity
+    half_width: float      # Confidence-interval half-width of the estimate
+    n_trials: int          # Trials used
+    converged: bool        # False if max_trials was reached before the tolerance
+    values: np.ndarray     # Everything the sampler returned, in draw order
+
+
+class VarianceReport(NamedTuple):
+    """Estimate from a variance-reduced run and how much it saved."""
+    estimate: np.ndarray              # Mean (for CRN: difference from scenario 0)
+    standard_error: np.ndarray        # Standard error achieved
+    naive_standard_error: np.ndarray  # Same evaluations drawn independently
+    variance_reduction: np.ndarray    # naive variance / achieved variance
+    n_trials: int                     # Evaluations per scenario
+    values: np.ndarray                # Per-trial values (per scenario for CRN)
+
+
+class MonteCarloKernel:
+    """Root seed plus block size; hands out reproducible per-block streams."""
+
+    __slots__ = ('seed', 'block_size')
+
+    def __init__(self, seed=DEFAULT_SEED, block_size=DEFAULT_BLOCK_SIZE):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.seed = seed
+        self.block_size = int(block_size)
+
+    def __repr__(self):
+        return f"MonteCarloKernel(seed={self.seed}, block_size={self.block_size})"
+
+    def seed_sequence(self, block_index):
+        """SeedSequence of one block: child `block_index` of the root seed."""
+        return np.random.SeedSequence(self.seed, spawn_key=(int(block_index),))
+
+    def block_rng(self, block_index):
+        """Generator for one block of trials."""
+        return np.random.Generator(np.random.PCG64(self.seed_sequence(block_index)))
+
+    def blocks(self, n_trials):
+        """(block_index, start, stop) for each block covering n_trials."""
+        for block_index, start in enumerate(range(0, n_trials, self.block_size)):
+            yield block_index, start, min(start + self.block_size, n_trials)
+
+    def generate(self, n_trials, sampler):
+        """
+        Draw `n_trials` trials as one tensor. `sampler(rng, size)` must
+        return an array whose first axis has length `size`; it is called
+        once per block with that block's stream.
+        """
+        return self.run(n_trials, sampler, max_workers=1)
+
+    def run(self, n_trials, simulate, reduce=None, max_workers=None):
+        """
+        Call simulate(rng, size) once per block, across `max_workers`
+        processes (all cores by default; 1 runs in this process), and
+        return reduce(block_results) with the results in block order.
+
+        The default reduction concatenates arrays, or each field of a tuple
+        of arrays, along the first axis. Because every block has a fixed
+        stream and the reduction order is fixed, the output does not depend
+        on the number of workers. For a process pool, `simulate` must be
+        picklable: a module-level function or a functools.partial of one.
+        """
+        tasks = [(self.seed, block_index, stop - start)
+                 for block_index, start, stop in self.blocks(n_trials)]
+        if not tasks:
+            tasks = [(self.seed, 0, 0)]  # Still return an empty result of the right shape
+        return (reduce or concatenate_blocks)(_run_tasks(simulate, tasks, max_workers))
+
+    def run_to_precision(self, simulate, tolerance, quantity=None, confidence=0.95,
+                         max_trials=DEFAULT_MAX_TRIALS, max_workers=1):
+        """
+        Adaptive run(): draw whole blocks, continuing with the next block
+        indices, until the estimate meets `tolerance` (see run_to_precision).
+        The values match run() over the same number of trials.
+        """
+        next_block = 0
+
+        def sample(n_trials):
+            nonlocal next_block
+            n_blocks = -(-n_trials // self.block_size)
+            tasks = [(self.seed, block_index, self.block_size)
+                     for block_index in range(next_block, next_block + n_blocks)]
+            next_block += n_blocks
+            return concatenate_blocks(_run_tasks(simulate, tasks, max_workers))
+
+        return run_to_precision(sample, tolerance, quantity, confidence,
+                                initial_trials=self.block_size, max_trials=max_trials)
+
+    def stream(self, n_trials, simulate, summary, max_workers=1):
+        """
+        Fold simulate(rng, size) for every block into `summary` (an empty
+        streaming_stats.StreamSummary, or anything with empty(), update()
+        and merge()) and return the combined summary. Each block is
+        summarized and merged in block order, then discarded, so memory
+        stays at one block per worker and the result does not depend on
+        the number of workers.
+        """
+        tasks = [(self.seed, block_index, stop - start)
+                 for block_index, start, stop in self.blocks(n_trials)]
+        summarize = functools.partial(_summarize_block, simulate, summary)
+        workers = min(max_workers or os.cpu_count() or 1, max(len(tasks), 1))
+        if workers == 1:
+            for task in tasks:
+                summary = summary.merge(_run_block(summarize, *task))
+            return summary
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(_run_block, *zip(*[(summarize,) + task for task in tasks])):
+                summary = summary.merge(partial)
+        return summary
+
+    def common_random_numbers(self, n_trials, simulate, scenarios):
+        """
+        Compare scenarios on common random numbers: simulate(rng, size,
+        scenario) is run for every scenario on the same block streams, so
+        the noise shared between scenarios cancels in their differences.
+        The report is for each scenario's difference from scenarios[0].
+        """
+        values = np.stack([
+            self.generate(n_trials, lambda rng, size: simulate(rng, size, scenario))
+            for scenario in scenarios])
+        differences = values[1:] - values[0]
+        achieved = differences.var(axis=1, ddof=1) / n_trials
+        naive = (values[1:].var(axis=1, ddof=1) + values[0].var(ddof=1)) / n_trials
+        return _variance_report(differences.mean(axis=1), achieved, naive, n_trials, values)
+
+    def antithetic(self, n_pairs, transform, shape=()):
+        """
+        Antithetic estimate of E[transform(Z)] for standard normal Z of the
+        given per-trial shape: each draw z is paired with -z. Works best
+        when transform is monotone in z (mean velocity, point of impact);
+        for even functions (ES, SD) the pairs are identical and the report
+        shows a reduction of 0.5.
+        """
+        z = self.normal(n_pairs, shape)
+        plus, minus = transform(z), transform(-z)
+        pair_means = (plus + minus) / 2
+        achieved = pair_means.var(ddof=1) / n_pairs
+        naive = np.concatenate([plus, minus]).var(ddof=1) / (2 * n_pairs)
+        return _variance_report(pair_means.mean(), achieved, naive, 2 * n_pairs,
+                                np.stack([plus, minus], axis=1))
+
+    def sobol(self, n_points, transform, dimension, n_replicates=16):
+        """
+        Randomized quasi-Monte Carlo estimate of E[transform(U)], U uniform
+        on [0, 1)^dimension. Each of `n_replicates` independent scrambles
+        contributes n_points Sobol points (rounded up to a power of two);
+        the spread of the replicate means gives the standard error. Use
+        normal_from_uniform() inside transform for Gaussian inputs.
+        """
+        from scipy.stats import qmc
+
+        m = max(0, math.ceil(math.log2(n_points)))
+        values = np.stack([
+            transform(qmc.Sobol(dimension, scramble=True,
+                                seed=self.block_rng(replicate)).random_base2(m))
+            for replicate in range(n_replicates)])
+        means = values.mean(axis=1)
+        achieved = means.var(ddof=1) / n_replicates
+        naive = values.var(ddof=1) / values.size
+        return _variance_report(means.mean(), achieved, naive, values.size, values)
+
+    def normal(self, n_trials, shape=(), loc=0.0, scale=1.0):
+        """Normal draws shaped (n_trials, *shape)."""
+        shape = tuple(np.atleast_1d(shape)) if shape != () else ()
+        return self.generate(
+            n_trials, lambda rng, size: rng.normal(loc, scale, (size,) + shape))
+
+    def shot_groups(self, n_trials, n_shots, sigma, groups_per_trial=None,
+                    center=(0.0, 0.0)):
+        """
+        Circular-normal shot groups shaped (n_trials, n_shots, 2), or
+        (n_trials, groups_per_trial, n_shots, 2).
+        """
+        shape = ((groups_per_trial,) if groups_per_trial else ()) + (n_shots, 2)
+        return self.normal(n_trials, shape, scale=sigma) + np.asarray(center, dtype=float)
+
+    def velocity_strings(self, n_trials, n_shots, mean, sd, strings_per_trial=None):
+        """
+        Chronograph strings shaped (n_trials, n_shots), or
+        (n_trials, strings_per_trial, n_shots). `mean` may be an array that
+        broadcasts against the string axis (e.g. one mean per charge weight).
+        """
+        if strings_per_trial:
+            shape = (strings_per_trial, n_shots)
+            mean = np.asarray(mean, dtype=float)[..., np.newaxis]
+        else:
+            shape = (n_shots,)
+        return mean + self.normal(n_trials, shape, scale=sd)
+
+    def string_stats(self, n_trials, n_shots, mean, sd):
+        """
+        Mean and SD of chronograph strings as a StringStats pair, each
+        shaped (n_trials,) plus the broadcast shape of n_shots, mean and sd.
+        Drawn without the individual shots (see
+        sampling_distributions.sample_string_stats), so the cost does not
+        grow with n_shots.
+        """
+        from sampling_distributions import sample_string_stats
+
+        shape = np.broadcast(n_shots, mean, sd).shape
+        return self.generate(n_trials, lambda rng, size: sample_string_stats(
+            n_shots, mean, sd, (size,) + shape, rng))
+
+
+def run_to_precision(sample, tolerance, quantity=None, confidence=0.95,
+                     initial_trials=1000, max_trials=DEFAULT_MAX_TRIALS):
+    """
+    Estimate the mean of a per-trial quantity to within ±`tolerance`.
+
+    sample(n) returns at least n new trials, first axis = trials (any of
+    the per-script simulate_* functions, wrapped in a lambda). quantity(values)
+    maps them to one number per trial; by default the values themselves.
+    Use a boolean quantity for rates, e.g. `lambda sds: sds < 10`.
+
+    Batches start at `initial_trials` and grow towards the count the
+    current spread says is needed (at most doubling the total each round).
+    The interval is the normal approximation, estimate ± z * SD / sqrt(n);
+    for rare events make sure `initial_trials` sees a few of them.
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    running = RunningMoments()
+    batches = []
+    n_next = initial_trials
+    while True:
+        values = np.asarray(sample(n_next))
+        batches.append(values)
+        per_trial = values if quantity is None else quantity(values)
+        running.update(np.asarray(per_trial, dtype=float))
+        half_width = z * running.sem if running.count > 1 else math.inf
+        converged = half_width <= tolerance
+        if converged or running.count >= max_trials:
+            break
+        needed = math.ceil((z * running.sd / tolerance)**2) - running.count
+        n_next = int(min(max(needed, initial_trials), running.count, max_trials - running.count))
+    return PrecisionResult(estimate=running.mean, half_width=half_width,
+                           n_trials=running.count, converged=converged,
+                           values=np.concatenate(batches))
+
+
+def normal_from_uniform(u):
+    """Standard normal quantiles of uniforms in (0, 1), for sobol() integrands."""
+    from scipy.special import ndtri
+
+    return ndtri(np.clip(u, 1e-12, 1 - 1e-12))
+
+
+def _variance_report(estimate, achieved, naive, n_trials, values):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduction = naive / achieved
+    return VarianceReport(estimate=estimate, standard_error=np.sqrt(achieved),
+                          naive_standard_error=np.sqrt(naive),
+                          variance_reduction=reduction, n_trials=n_trials, values=values)
+
+
+def _run_tasks(simulate, tasks, max_workers):
+    """Results of _run_block for every task, in task order."""
+    workers = min(max_workers or os.cpu_count() or 1, len(tasks))
+    if workers == 1:
+        return [_run_block(simulate, *task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_block, simulate, *task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def _summarize_block(simulate, template, rng, size):
+    return template.empty().update(simulate(rng, size))
+
+
+def _run_block(simulate, seed, block_index, size):
+    return simulate(MonteCarloKernel(seed).block_rng(block_index), size)
+
+
+def concatenate_blocks(results):
+    """
+    Join per-block results along the first axis. Tuples (and NamedTuples)
+    of arrays are joined field by field.
+    """
+    first = results[0]
+    if isinstance(first, tuple):
+        fields = [np.concatenate(parts) for parts in zip(*results)]
+        return type(first)(*fields) if hasattr(first, '_fields') else tuple(fields)
+    return np.concatenate(results)
+
+
+def make_rng(seed=DEFAULT_SEED):
+    """A single Generator seeded through SeedSequence."""
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed)))
+
+
+def spawn_rngs(seed, n_streams):
+    """`n_streams` independent Generators spawned from one root seed."""
+    return [np.random.Generator(np.random.PCG64(child))
+            for child in np.random.SeedSequence(seed).spawn(n_streams)]
+
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Simulation Result Cache
+Content-addressed, size-bounded on-disk cache for simulation functions.
+
+Re-running a plot script used to repeat its whole simulation even when only
+a label or a color changed. Decorating the simulation function with
+@cached stores its result as a compressed .npz file, keyed by a SHA-256
+hash of:
+
+- the function's source code,
+- the module-level constants and helper functions it refers to, and the
+  constants those helpers (functions of the same module) refer to in
+  turn (so changing TRUE_MOA or a tolerance invalidates the entry, but
+  restyling the figure does not),
+- the shared code and data it may use: every library module in scripts/
+  (everything but the plot_ scripts) and the files in data/simulated,
+  so editing group_metrics.py or regenerating the ratio table invalidates
+  the results computed with the old version,
+- its arguments (arrays by dtype, shape and bytes; functions by source),
+- the seed: the global np.random state at call time. The state after the
+  call is stored too and restored on a hit, so later draws in the script
+  come out exactly as if the function had run. (A RandomState or
+  Generator passed as an argument is keyed by its state but is not
+  advanced on a hit.) Functions that draw only from explicitly seeded
+  streams (simulation.MonteCarloKernel) use @cached(global_rng=False),
+  which leaves the global state out of the key.
+
+Results may be arrays, scalars, tuples / NamedTuples or dicts of those.
+Files live in .cache/simulations at the repository root (override with the
+SIMULATION_CACHE_DIR environment variable). When the directory grows past
+MAX_CACHE_BYTES, the least recently used entries are deleted. Set
+SIMULATION_CACHE=0 to bypass the cache entirely.
+
+Anything else a result depends on (an installed package, a file outside
+the repository) is not hashed. After changing it, bump CACHE_FORMAT or run
+    python scripts/simulation_cache.py --clear
+
+Usage:
+    from simulation_cache import cached
+
+    @cached
+    def simulate_groups(n_groups, shots_per_group, true_moa):
+        ...
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import os
+import types
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path(os.environ.get(
+    'SIMULATION_CACHE_DIR', Path(__file__).parent.parent / '.cache' / 'simulations'))
+MAX_CACHE_BYTES = int(os.environ.get('SIMULATION_CACHE_MAX_BYTES', 2 * 2**30))
+# Bumped whenever the key or file layout changes; bumping it by hand
+# invalidates every entry
+CACHE_FORMAT = 2
+
+# Shared code and data hashed into every key (relative to the repository root)
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEPENDENCY_PATTERNS = ('scripts/*.py', 'data/simulated/*')
+EXCLUDED_PATTERNS = ('scripts/plot_*.py',)
+
+_SIMPLE_TYPES = (bool, int, float, complex, str, bytes, type(None), np.generic)
+
+# path -> ((mtime_ns, size), SHA-256) of each dependency file read so far
+_file_digests = {}
+
+
+def cached(function=None, *, global_rng=True, cache_dir=None, max_bytes=None):
+    """
+    Decorator caching a simulation function's result on disk. Use as
+    @cached, or @cached(global_rng=False, ...) for functions that do not
+    touch the global np.random state.
+    """
+    if function is None:
+        return functools.partial(cached, global_rng=global_rng, cache_dir=cache_dir,
+                                 max_bytes=max_bytes)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if os.environ.get('SIMULATION_CACHE', '1') == '0':
+            return function(*args, **kwargs)
+        directory = Path(cache_dir or CACHE_DIR)
+        key = cache_key(function, args, kwargs, global_rng)
+        path = directory / f'{function.__name__}-{key}.npz'
+
+        if path.exists():
+            try:
+                result, state = _load(path)
+            except (OSError, ValueError, KeyError):
+                path.unlink(missing_ok=True)  # Corrupt or stale entry
+            else:
+                os.utime(path)  # Mark as recently used
+                if global_rng:
+                    np.random.set_state(state)
+                return result
+
+        result = function(*args, **kwargs)
+        _save(path, result, np.random.get_state())
+        evict(directory, MAX_CACHE_BYTES if max_bytes is None else max_bytes)
+        return result
+
+    wrapper.cache_key = lambda *args, **kwargs: cache_key(function, args, kwargs, global_rng)
+    return wrapper
+
+
+def cache_key(function, args, kwargs, global_rng=True):
+    """Hex digest identifying one call of `function` (see module docstring)."""
+    digest = hashlib.sha256()
+    digest.update(f'format={CACHE_FORMAT}'.encode())
+    digest.update(dependency_fingerprint().encode())
+    _feed(digest, function)
+    for name, value in sorted(_global_values(function).items()):
+        digest.update(name.encode())
+        _feed(digest, value, shallow=True)
+    _feed(digest, (function.__defaults__, function.__kwdefaults__))
+    _feed(digest, args)
+    _feed(digest, sorted(kwargs.items()))
+    if global_rng:
+        _feed(digest, np.random.get_state())
+    return digest.hexdigest()[:32]
+
+
+def dependency_fingerprint(root=None):
+    """Hex digest of the shared modules and data files (DEPENDENCY_PATTERNS)."""
+    root = Path(root or REPO_ROOT)
+    excluded = {path for pattern in EXCLUDED_PATTERNS for path in root.glob(pattern)}
+    paths = sorted({path for pattern in DEPENDENCY_PATTERNS for path in root.glob(pattern)
+                    if path.is_file()} - excluded)
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(_file_digest(path))
+    return digest.hexdigest()
+
+
+def evict(directory=None, max_bytes=MAX_CACHE_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes."""
+    directory = Path(directory or CACHE_DIR)
+    if not directory.exists():
+        return
+    entries = []
+    for path in directory.glob('*.npz'):
+        try:
+            info = path.stat()
+        except FileNotFoundError:  # Removed by another process
+            continue
+        entries.append((info.st_mtime, info.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def clear_cache(directory=None):
+    """Delete every cached result."""
+    evict(directory, max_bytes=0)
+
+
+def cache_size(directory=None):
+    """Bytes currently used by the cache."""
+    directory = Path(directory or CACHE_DIR)
+    return sum(path.stat().st_size for path in directory.glob('*.npz'))
+
+
+def _file_digest(path):
+    """SHA-256 of a file's contents, re-read only when its size or mtime changes."""
+    info = path.stat()
+    stamp = (info.st_mtime_ns, info.st_size)
+    known = _file_digests.get(path)
+    if known is None or known[0] != stamp:
+        known = (stamp, hashlib.sha256(path.read_bytes()).digest())
+        _file_digests[path] = known
+    return known[1]
+
+
+def _global_values(function):
+    """
+    Module-level values `function` reads, by name, including those read
+    through the plain functions of its own module that it calls (followed
+    to any depth). Modules are left out.
+    """
+    values = {}
+    visited = set()
+    pending = [function]
+    while pending:
+        current = pending.pop()
+        if id(current) in visited:
+            continue
+        visited.add(id(current))
+        for name in _global_names(current.__code__):
+            if name not in current.__globals__:
+                continue
+            value = current.__globals__[name]
+            if isinstance(value, types.ModuleType):
+                continue
+            values[name] = value
+            helper = inspect.unwrap(value) if callable(value) else value
+            if (isinstance(helper, types.FunctionType)
+                    and helper.__globals__ is function.__globals__):
+                pending.append(helper)
+    return values
+
+
+def _global_names(code):
+    """Global names used by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for constant in code.co_consts:
+        if isinstance(constant, types.CodeType):
+            names |= _global_names(constant)
+    return names
+
+
+def _feed(digest, value, shallow=False):
+    """
+    Add a canonical encoding of `value` to the hash. With shallow=True
+    (module-level dependencies) only data and source code are hashed;
+    anything else is identified by its type.
+    """
+    digest.update(type(value).__name__.encode())
+    if isinstance(value, np.ndarray):
+        digest.update(f'{value.dtype.str}{value.shape}'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, _SIMPLE_TYPES):
+        digest.update(repr(value).encode())
+    elif isinstance(value, (tuple, list)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            _feed(digest, item, shallow)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            _feed(digest, key, shallow)
+            _feed(digest, value[key], shallow)
+    elif callable(value) and hasattr(value, '__code__'):
+        try:
+            digest.update(inspect.getsource(value).encode())
+        except (OSError, TypeError):
+            digest.update(value.__code__.co_code)
+        digest.update(repr([constant for constant in value.__code__.co_consts
+                            if not isinstance(constant, types.CodeType)]).encode())
+    elif isinstance(value, np.random.RandomState):
+        _feed(digest, value.get_state(), shallow)
+    elif isinstance(value, np.random.Generator):
+        _feed(digest, value.bit_generator.state, shallow)
+    elif isinstance(value, functools.partial):
+        _feed(digest, (value.func, value.args, sorted(value.keywords.items())), shallow)
+    elif shallow or isinstance(value, type):
+        digest.update(getattr(value, '__qualname__', '').encode())
+    else:
+        digest.update(repr(value).encode())
+
+
+def _save(path, result, state):
+    """Write result and RNG state atomically (temporary file, then rename)."""
+    arrays = {'rng_state': np.array(state[1]),
+              'rng_meta': np.array(state[2:], dtype=float)}
+    if isinstance(result, tuple):
+        kind = type(result)
+        arrays['kind'] = np.array(f'{kind.__module__}:{kind.__qualname__}'
+                                  if hasattr(result, '_fields') else 'tuple')
+        for index, item in enumerate(result):
+            arrays[f'item_{index}'] = np.asarray(item)
+    elif isinstance(result, dict):
+        arrays['kind'] = np.array('dict')
+        for key, item in result.items():
+            arrays[f'key_{key}'] = np.asarray(item)
+    else:
+        arrays['kind'] = np.array('value')
+        arrays['value'] = np.asarray(result)
+
+    for name, array in arrays.items():
+        if array.dtype == object:
+            raise TypeError(f"cannot cache {name!r}: only numeric and string arrays are stored")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(temporary, 'wb') as file:
+        np.savez_compressed(file, **arrays)
+    os.replace(temporary, path)
+
+
+def _load(path):
+    """Result and RNG state from a file written by _save()."""
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data['kind'])
+        pos, has_gauss, cached_gaussian = data['rng_meta']
+        state = ('MT19937', data['rng_state'], int(pos), int(has_gauss), float(cached_gaussian))
+        if kind == 'value':
+            return _restore(data['value']), state
+        if kind == 'dict':
+            return {name[len('key_'):]: _restore(data[name])
+                    for name in data.files if name.startswith('key_')}, state
+        count = sum(name.startswith('item_') for name in data.files)
+        items = [_restore(data[f'item_{index}']) for index in range(count)]
+    if kind == 'tuple':
+        return tuple(items), state
+    module, qualname = kind.split(':')
+    try:
+        result_type = functools.reduce(getattr, qualname.split('.'),
+                                       importlib.import_module(module))
+    except (ImportError, AttributeError):
+        return tuple(items), state
+    return result_type(*items), state
+
+
+def _restore(array):
+    """0-d arrays come back as Python scalars, everything else as arrays."""
+    return array.item() if array.ndim == 0 else array
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Inspect or clear the simulation cache.')
+    parser.add_argument('--clear', action='store_true', help='Delete every cached result')
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache()
+    size = cache_size() if CACHE_DIR.exists() else 0
+    print(f"{CACHE_DIR}: {size / 2**20:.1f} MiB (limit {MAX_CACHE_BYTES / 2**20:.0f} MiB)")
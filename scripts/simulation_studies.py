@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Shot Group Simulations
+The group simulations behind the lesson plots, importable on their own.
+
+These functions used to live inside the plot scripts, where they could only
+run with the script's module-level constants (TRUE_MOA, SHOTS_PER_GROUP,
+GROUPS_PER_SET, ...) and could not be imported without drawing the figure.
+Every scenario parameter is now an argument, and the random source is the
+`rng` argument: np.random (the global stream the plots seed) by default, or
+any Generator/RandomState, e.g. one per cell of a parameter sweep.
+
+Usage:
+    from simulation_studies import simulate_group_sets
+    sets = simulate_group_sets(1.5, 5, 10, 1000, rng=np.random.default_rng(1))
+    bias = 1 - sets.min(axis=1).mean() / 1.5
+"""
+
+import numpy as np
+
+from group_metrics import extreme_spread
+from group_tables import ratio_mean
+
+
+def simulate_groups(n_groups, shots_per_group, true_moa, rng=np.random):
+    """
+    Simulate groups and return their sizes (extreme spread), shape (n_groups,).
+    true_moa is the expected 5-shot group size; sigma comes from the ES/σ
+    lookup table.
+    """
+    sigma = true_moa / ratio_mean('es', 5)
+
+    # Generate shots from a 2D normal distribution, all groups at once
+    # (each group's x coordinates, then its y coordinates)
+    xy = rng.normal(0, sigma, (n_groups, 2, shots_per_group))
+
+    # Calculate group size (extreme spread - max distance between any two shots)
+    return extreme_spread(xy.transpose(0, 2, 1))
+
+
+def simulate_group_sets(true_moa, shots_per_group, groups_per_set, n_sets, rng=np.random):
+    """
+    Simulate n_sets sets of groups and return their sizes, shape
+    (n_sets, groups_per_set). true_moa is the expected 5-shot group size;
+    sigma comes from the ES/σ lookup table.
+    """
+    sigma = true_moa / ratio_mean('es', 5)
+
+    # Generate shots from 2D normal distribution for every group at once
+    # (each group's x coordinates, then its y coordinates)
+    xy = rng.normal(0, sigma, (n_sets, groups_per_set, 2, shots_per_group))
+
+    # Calculate group size (extreme spread)
+    return extreme_spread(np.swapaxes(xy, -1, -2))
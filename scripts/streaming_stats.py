@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Streaming Simulation Summaries
+Constant-memory histograms, moments and quantiles for very long simulations.
+
+Studying rare tails (how often does a 1.5 MOA rifle print a 0.5 MOA
+best-of-10 group?) takes 10^8 or more simulated groups, far more than can
+be kept in memory. A StreamSummary folds results in chunk by chunk and
+keeps only:
+
+- a fixed-bin Histogram (plus under/overflow counts), which gives exact
+  tail fractions at the bin edges;
+- running moments (count, mean, SD, min, max) in a RunningMoments Welford
+  accumulator;
+- a QuantileSketch with bounded relative error (logarithmic buckets, as in
+  DDSketch): every quantile is within ±relative_accuracy of a true sample
+  quantile, whatever the trial count.
+
+All three merge exactly, so chunks can be summarized in separate processes
+and combined afterwards (see MonteCarloKernel.stream in simulation.py).
+
+Usage:
+    from streaming_stats import StreamSummary
+    summary = StreamSummary(np.linspace(0, 4, 401))
+    for chunk in chunks:
+        summary.update(chunk)
+    print(summary.fraction_below(0.5), summary.quantile(0.01))
+"""
+
+import math
+
+import numpy as np
+
+from running_moments import RunningMoments
+
+DEFAULT_RELATIVE_ACCURACY = 0.005
+
+
+class Histogram:
+    """Counts in fixed bins, plus values below the first and above the last edge."""
+
+    __slots__ = ('edges', 'counts', 'underflow', 'overflow')
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        if self.edges.ndim != 1 or len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("edges must be at least two increasing values")
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def count(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def update(self, values):
+        """Add an array of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        self.counts += np.histogram(values, bins=self.edges)[0]
+        self.underflow += int(np.count_nonzero(values < self.edges[0]))
+        self.overflow += int(np.count_nonzero(values > self.edges[-1]))
+        return self
+
+    def merge(self, other):
+        """Return a new histogram combining this one and `other` (same edges)."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("histograms have different bin edges")
+        combined = self.empty()
+        combined.counts = self.counts + other.counts
+        combined.underflow = self.underflow + other.underflow
+        combined.overflow = self.overflow + other.overflow
+        return combined
+
+    def empty(self):
+        return Histogram(self.edges)
+
+    def fraction_below(self, x):
+        """
+        Fraction of values below x: exact at bin edges, linearly
+        interpolated inside a bin.
+        """
+        cumulative = np.concatenate([[self.underflow], self.underflow + np.cumsum(self.counts)])
+        below = np.interp(x, self.edges, cumulative,
+                          left=self.underflow, right=cumulative[-1])
+        return below / self.count if self.count else float('nan')
+
+    def density(self):
+        """Counts normalized like plt.hist(density=True), for plotting."""
+        return self.counts / (self.count * np.diff(self.edges))
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative error `relative_accuracy`.
+    Value v > 0 goes to bucket ceil(log_gamma(v)), gamma = (1 + a) / (1 - a);
+    negative values use a mirrored set of buckets. Memory grows only with
+    the log of the value range, not with the number of values.
+    """
+
+    __slots__ = ('relative_accuracy', 'gamma', 'positive', 'negative', 'zero_count')
+
+    # Values closer to zero than this are counted as zero
+    MIN_VALUE = 1e-12
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.positive = _Buckets()
+        self.negative = _Buckets()
+        self.zero_count = 0
+
+    @property
+    def count(self):
+        return self.positive.total + self.negative.total + self.zero_count
+
+    def update(self, values):
+        """Add an array of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        log_gamma = math.log(self.gamma)
+        for buckets, magnitudes in ((self.positive, values[values > self.MIN_VALUE]),
+                                    (self.negative, -values[values < -self.MIN_VALUE])):
+            if len(magnitudes):
+                buckets.add(np.ceil(np.log(magnitudes) / log_gamma).astype(np.int64))
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.MIN_VALUE))
+        return self
+
+    def merge(self, other):
+        """Return a new sketch combining this one and `other` (same accuracy)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("sketches have different relative accuracy")
+        combined = self.empty()
+        combined.positive = self.positive.merged(other.positive)
+        combined.negative = self.negative.merged(other.negative)
+        combined.zero_count = self.zero_count + other.zero_count
+        return combined
+
+    def empty(self):
+        return QuantileSketch(self.relative_accuracy)
+
+    def quantile(self, p):
+        """Approximate p-quantile(s), p in [0, 1]."""
+        p = np.asarray(p, dtype=float)
+        if self.count == 0:
+            return np.full(p.shape, np.nan)[()]
+        # Buckets in increasing value order: negatives (largest magnitude
+        # first), zero, positives
+        neg_index, neg_counts = self.negative.items()
+        pos_index, pos_counts = self.positive.items()
+        values = np.concatenate([-self._bucket_value(neg_index[::-1]), [0.0],
+                                 self._bucket_value(pos_index)])
+        counts = np.concatenate([neg_counts[::-1], [self.zero_count], pos_counts])
+        cumulative = np.cumsum(counts)
+        rank = np.floor(p * (self.count - 1))
+        return values[np.searchsorted(cumulative, rank, side='right')][()]
+
+    def _bucket_value(self, index):
+        # Midpoint (in relative terms) of (gamma^(i-1), gamma^i]
+        return 2 * self.gamma**index.astype(float) / (self.gamma + 1)
+
+
+class StreamSummary:
+    """Histogram, running moments and quantile sketch of one quantity."""
+
+    __slots__ = ('histogram', 'moments', 'sketch')
+
+    def __init__(self, edges, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.histogram = Histogram(edges)
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(relative_accuracy)
+
+    def update(self, values):
+        """Fold one chunk of values in."""
+        values = np.asarray(values, dtype=float).ravel()
+        self.histogram.update(values)
+        self.moments.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        """Return a new summary combining this one and `other`."""
+        combined = self.empty()
+        combined.histogram = self.histogram.merge(other.histogram)
+        combined.moments = self.moments.merge(other.moments)
+        combined.sketch = self.sketch.merge(other.sketch)
+        return combined
+
+    def empty(self):
+        """Summary with the same bins and accuracy and no values."""
+        return StreamSummary(self.histogram.edges, self.sketch.relative_accuracy)
+
+    @property
+    def count(self):
+        return self.moments.count
+
+    @property
+    def mean(self):
+        return self.moments.mean
+
+    @property
+    def sd(self):
+        return self.moments.sd
+
+    def quantile(self, p):
+        return self.sketch.quantile(p)
+
+    def fraction_below(self, x):
+        return self.histogram.fraction_below(x)
+
+    def __repr__(self):
+        return (f"StreamSummary(n={self.count}, mean={self.mean:.4g}, sd={self.sd:.4g}, "
+                f"median={self.quantile(0.5):.4g})")
+
+
+class _Buckets:
+    """Dense int64 counts for a contiguous range of bucket indices."""
+
+    __slots__ = ('offset', 'counts')
+
+    def __init__(self, offset=0, counts=None):
+        self.offset = offset
+        self.counts = np.zeros(0, dtype=np.int64) if counts is None else counts
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def add(self, indices):
+        low, high = int(indices.min()), int(indices.max())
+        self._cover(low, high)
+        self.counts += np.bincount(indices - self.offset, minlength=len(self.counts))
+
+    def merged(self, other):
+        result = _Buckets(self.offset, self.counts.copy())
+        if len(other.counts):
+            result._cover(other.offset, other.offset + len(other.counts) - 1)
+            start = other.offset - result.offset
+            result.counts[start:start + len(other.counts)] += other.counts
+        return result
+
+    def items(self):
+        """Bucket indices and counts of the occupied range."""
+        return np.arange(self.offset, self.offset + len(self.counts)), self.counts
+
+    def _cover(self, low, high):
+        """Grow the dense range to include indices low..high."""
+        if not len(self.counts):
+            self.offset, self.counts = low, np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_low = min(low, self.offset)
+        new_high = max(high, self.offset + len(self.counts) - 1)
+        if new_low == self.offset and new_high == self.offset + len(self.counts) - 1:
+            return
+        counts = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        counts[self.offset - new_low:self.offset - new_low + len(self.counts)] = self.counts
+        self.offset, self.counts = new_low, counts
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweeps
+Runs a simulation over a grid of scenario parameters and returns a tidy table.
+
+The plot scripts each show one scenario (TRUE_MOA = 1.5, GROUPS_PER_SET = 10,
+...). sweep() evaluates a simulation function from simulation_studies.py
+on every combination of the given parameter values:
+
+- cells run in parallel across a process pool;
+- every cell gets its own random stream, derived from the root seed and the
+  cell's parameters (not its position in the grid), so a cell gives the
+  same answer in any sweep that contains it;
+- every cell's summary is cached on disk (simulation_cache), so extending
+  a grid only computes the new cells;
+- the result is a pandas DataFrame with one row per cell: the parameters,
+  then the summary columns.
+
+Run the best-group bias response surface from the command line:
+    python scripts/sweep.py --sets 20000 --out bias_surface.csv
+
+Usage:
+    from simulation_studies import simulate_group_sets
+    from sweep import sweep, best_group_bias
+    table = sweep(simulate_group_sets,
+                  {'true_moa': [1.0, 1.5], 'shots_per_group': [3, 5], 'groups_per_set': [5, 10]},
+                  fixed={'n_sets': 20_000}, summarize=best_group_bias)
+"""
+
+import hashlib
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulation_cache import cached
+
+DEFAULT_SEED = 20240601
+
+
+def sweep(function, grid, fixed=None, summarize=None, seed=DEFAULT_SEED,
+          max_workers=None, cache=True):
+    """
+    Run function(**fixed, **cell, rng=...) for every cell of `grid` (a dict
+    of parameter name -> list of values) and summarize each result with
+    summarize(values, params) -> dict of numbers (default: mean, sd, n).
+    `function` and `summarize` must be module-level functions when more
+    than one worker is used.
+    """
+    import pandas as pd
+
+    names = list(grid)
+    cells = [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+    tasks = [(function, {**(fixed or {}), **cell}, summarize or summarize_values, seed)
+             for cell in cells]
+    run = _cached_cell if cache else _run_cell
+
+    workers = min(max_workers or os.cpu_count() or 1, max(len(tasks), 1))
+    if workers == 1:
+        summaries = [run(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(run, *zip(*tasks)))
+    return pd.DataFrame([{**cell, **summary} for cell, summary in zip(cells, summaries)])
+
+
+def cell_rng(seed, params):
+    """Generator for one cell, determined by the root seed and the parameter values."""
+    text = repr(sorted((name, _plain(value)) for name, value in params.items()))
+    words = np.frombuffer(hashlib.sha256(text.encode()).digest()[:16], dtype=np.uint32)
+    return np.random.Generator(np.random.PCG64(
+        np.random.SeedSequence(seed, spawn_key=tuple(int(w) for w in words))))
+
+
+def summarize_values(values, params):
+    """Mean, SD and count of everything the simulation returned."""
+    values = np.asarray(values, dtype=float)
+    return {'mean': values.mean(), 'sd': values.std(ddof=1), 'n': values.size}
+
+
+def best_group_bias(group_sets, params):
+    """
+    Best-group statistics of simulate_group_sets() output, shape
+    (n_sets, groups_per_set): mean best group, mean of all groups and the
+    optimistic bias of reporting the best one.
+    """
+    best = group_sets.min(axis=1)
+    return {
+        'mean_best': best.mean(),
+        'mean_all': group_sets.mean(),
+        'bias_pct': 100 * (1 - best.mean() / params['true_moa']),
+        'best_se': best.std(ddof=1) / np.sqrt(len(best)),
+    }
+
+
+def _run_cell(function, params, summarize, seed):
+    values = function(**params, rng=cell_rng(seed, params))
+    return {name: _plain(value) for name, value in summarize(values, params).items()}
+
+
+@cached(global_rng=False)
+def _cached_cell(function, params, summarize, seed):
+    return _run_cell(function, params, summarize, seed)
+
+
+def _plain(value):
+    """NumPy scalars as Python numbers, so keys and tables look the same either way."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+if __name__ == '__main__':
+    import argparse
+
+    from simulation_studies import simulate_group_sets
+
+    parser = argparse.ArgumentParser(description='Best-group bias response surface.')
+    parser.add_argument('--sets', type=int, default=20_000, help='Sets simulated per cell')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--out', help='Write the table to this CSV file')
+    args = parser.parse_args()
+
+    table = sweep(simulate_group_sets,
+                  {'true_moa': [1.0, 1.5, 2.0],
+                   'shots_per_group': [3, 5, 10],
+                   'groups_per_set': [2, 3, 5, 10, 20]},
+                  fixed={'n_sets': args.sets}, summarize=best_group_bias,
+                  max_workers=args.workers)
+    print(table.to_string(index=False, float_format='{:.3f}'.format))
+    if args.out:
+        table.to_csv(args.out, index=False)
+        print(f"Saved: {args.out}")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Target Scan Hole Detection
+Finds bullet holes in a scanned or photographed target and reports
+calibrated shot coordinates.
+
+Pipeline:
+1. Read the image and convert it to grayscale in [0, 1].
+2. Threshold it (Otsu's method on the gray-level histogram unless a
+   threshold is given). Holes are assumed darker than the paper; pass
+   dark_holes=False for backlit scans where holes show up bright.
+3. Label connected components (scipy.ndimage) and measure each one's area,
+   bounding box and centroid with bincount-style reductions.
+4. Keep components whose area fits a bullet hole and which fill their
+   bounding box like a round hole does. This drops printed lines, aim
+   squares and specks.
+5. Convert pixel centroids to inches from a scale reference (the scan DPI,
+   or two marks a known distance apart) and an origin.
+
+The output uses the long-format schema used elsewhere in the project:
+    group_id, shot_id, x_inches, y_inches
+Shots are grouped by aim point through segmentation.py when a grid is given.
+
+Touching holes that merge into one blob are reported as a single shot.
+
+Batch mode processes a directory of scans across a process pool:
+    python scripts/target_scan.py scans/ --dpi 300 --hole-diameter 0.308 --out shots/
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from scipy import ndimage
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp')
+
+# Hole area accepted, as a multiple of the nominal caliber area. Paper
+# closes up around the bullet, so real holes are often smaller than the
+# caliber; merged pairs can approach twice the area.
+MIN_AREA_FACTOR = 0.2
+MAX_AREA_FACTOR = 3.0
+# A disk fills π/4 ≈ 0.79 of its bounding box; thin lines fill far less.
+MIN_FILL_RATIO = 0.45
+
+
+class Holes(NamedTuple):
+    """Holes detected in one image, from detect_holes()."""
+    rows: np.ndarray         # Centroid row (pixels, down from the top)
+    cols: np.ndarray         # Centroid column (pixels, right from the left)
+    areas: np.ndarray        # Area in pixels
+    threshold: float         # Gray level separating holes from paper (dark class is below it)
+
+
+def read_grayscale(path):
+    """Read an image file as a 2-D float array in [0, 1]."""
+    import matplotlib.image as mpimg
+
+    image = np.asarray(mpimg.imread(path))
+    if np.issubdtype(image.dtype, np.integer):  # JPEG and TIFF come back as 8- or 16-bit counts
+        image = image / np.iinfo(image.dtype).max
+    image = image.astype(float)
+    if image.ndim == 3:
+        # Drop alpha, then luminance-weight the color channels
+        image = image[..., :3] @ np.array([0.299, 0.587, 0.114])
+    return image
+
+
+def otsu_threshold(image, bins=256):
+    """
+    Gray level that best splits the image histogram into two classes: the
+    upper edge of the last bin of the dark class, so `image < threshold` is
+    exactly that class. NaN for a blank or uniform image, which has only
+    one class, so no pixel is on either side of it.
+    """
+    counts, edges = np.histogram(image, bins=bins, range=(0.0, 1.0))
+    centers = (edges[:-1] + edges[1:]) / 2
+    weight_low = np.cumsum(counts)
+    weight_high = weight_low[-1] - weight_low
+    sum_low = np.cumsum(counts * centers)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_low = sum_low / weight_low
+        mean_high = (sum_low[-1] - sum_low) / weight_high
+        between = weight_low * weight_high * (mean_low - mean_high)**2
+    if not np.any(between > 0):
+        return np.nan
+    return float(edges[np.nanargmax(between) + 1])
+
+
+def detect_holes(image, pixels_per_inch, hole_diameter=0.308, threshold=None,
+                 dark_holes=True, min_area=None, max_area=None,
+                 min_fill=MIN_FILL_RATIO):
+    """
+    Find hole-like connected components in a grayscale image.
+
+    Area limits default to MIN_AREA_FACTOR..MAX_AREA_FACTOR times the area
+    of a `hole_diameter` (inches) circle at `pixels_per_inch`.
+    """
+    image = np.asarray(image, dtype=float)
+    if threshold is None:
+        threshold = otsu_threshold(image)
+    mask = image < threshold if dark_holes else image >= threshold
+    mask = ndimage.binary_opening(mask)  # Remove single-pixel specks
+
+    labels, n_components = ndimage.label(mask)
+    if n_components == 0:
+        empty = np.zeros(0)
+        return Holes(rows=empty, cols=empty, areas=empty, threshold=threshold)
+
+    flat = labels.ravel()
+    rows, cols = np.indices(labels.shape)
+    areas = np.bincount(flat, minlength=n_components + 1).astype(float)
+    row_sum = np.bincount(flat, weights=rows.ravel(), minlength=n_components + 1)
+    col_sum = np.bincount(flat, weights=cols.ravel(), minlength=n_components + 1)
+    slices = ndimage.find_objects(labels)
+    box_area = np.array([0.0] + [(s[0].stop - s[0].start) * (s[1].stop - s[1].start)
+                                 for s in slices])
+
+    nominal_area = np.pi * (hole_diameter * pixels_per_inch / 2)**2
+    if min_area is None:
+        min_area = MIN_AREA_FACTOR * nominal_area
+    if max_area is None:
+        max_area = MAX_AREA_FACTOR * nominal_area
+
+    keep = np.zeros(n_components + 1, dtype=bool)
+    keep[1:] = ((areas[1:] >= min_area) & (areas[1:] <= max_area)
+                & (areas[1:] / box_area[1:] >= min_fill))
+    return Holes(rows=row_sum[keep] / areas[keep], cols=col_sum[keep] / areas[keep],
+                 areas=areas[keep], threshold=threshold)
+
+
+def scale_from_reference(point_a, point_b, distance_inches):
+    """Pixels per inch from two (row, col) marks a known distance apart."""
+    (row_a, col_a), (row_b, col_b) = point_a, point_b
+    return float(np.hypot(row_b - row_a, col_b - col_a)) / distance_inches
+
+
+def holes_to_inches(holes, pixels_per_inch, origin=None, image_shape=None):
+    """
+    Shot coordinates in inches, shape (n, 2), x to the right and y up.
+    `origin` is the (row, col) pixel of (0, 0); the image center by default.
+    """
+    if origin is None:
+        if image_shape is None:
+            raise ValueError("pass origin or image_shape")
+        origin = ((image_shape[0] - 1) / 2, (image_shape[1] - 1) / 2)
+    x = (holes.cols - origin[1]) / pixels_per_inch
+    y = (origin[0] - holes.rows) / pixels_per_inch
+    return np.column_stack([x, y])
+
+
+def scan_target(path, pixels_per_inch, hole_diameter=0.308, origin=None,
+                aim_points=None, rows=None, cols=None, **detect_options):
+    """
+    Full pipeline for one scan. Returns a DataFrame with columns
+    group_id, shot_id, x_inches, y_inches. Shots are grouped by aim point
+    when `aim_points` or a `rows` x `cols` grid is given, otherwise they
+    all belong to group 0.
+    """
+    import pandas as pd
+
+    image = read_grayscale(path)
+    holes = detect_holes(image, pixels_per_inch, hole_diameter, **detect_options)
+    shots = holes_to_inches(holes, pixels_per_inch, origin, image.shape)
+
+    if len(shots) and (aim_points is not None or (rows and cols)):
+        from segmentation import segment_target
+        group_id = segment_target(shots, aim_points, rows, cols).labels
+    else:
+        group_id = np.zeros(len(shots), dtype=int)
+
+    order = np.lexsort((shots[:, 0], group_id))
+    group_id, shots = group_id[order], shots[order]
+    starts = np.searchsorted(group_id, group_id)
+    return pd.DataFrame({
+        'group_id': group_id,
+        'shot_id': np.arange(len(group_id)) - starts,
+        'x_inches': shots[:, 0],
+        'y_inches': shots[:, 1],
+    })
+
+
+def scan_directory(directory, output_dir, pixels_per_inch, max_workers=None,
+                   **scan_options):
+    """
+    Run scan_target() on every image in `directory` across a process pool
+    and write one `<image>_shots.csv` per scan into `output_dir`. Returns
+    the written paths in sorted image order.
+    """
+    images = sorted(p for p in Path(directory).iterdir()
+                    if p.suffix.lower() in IMAGE_SUFFIXES)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    outputs = [output_dir / f'{image.stem}_shots.csv' for image in images]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_scan_to_csv, image, output, pixels_per_inch, scan_options)
+                   for image, output in zip(images, outputs)]
+        for future in futures:
+            future.result()
+    return outputs
+
+
+def _scan_to_csv(image, output, pixels_per_inch, scan_options):
+    scan_target(image, pixels_per_inch, **scan_options).to_csv(output, index=False)
+    return output
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Detect bullet holes in target scans.')
+    parser.add_argument('directory', help='Folder of scanned target images')
+    parser.add_argument('--dpi', type=float, required=True,
+                        help='Scan resolution in pixels per inch')
+    parser.add_argument('--hole-diameter', type=float, default=0.308,
+                        help='Bullet diameter in inches (default 0.308)')
+    parser.add_argument('--rows', type=int, help='Aim-point grid rows')
+    parser.add_argument('--cols', type=int, help='Aim-point grid columns')
+    parser.add_argument('--out', default='shots', help='Output folder for CSV files')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    args = parser.parse_args()
+
+    written = scan_directory(args.directory, args.out, args.dpi,
+                             max_workers=args.workers,
+                             hole_diameter=args.hole_diameter,
+                             rows=args.rows, cols=args.cols)
+    for path in written:
+        print(f"Saved: {path}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Streaming Velocity Statistics
+One-pass, mergeable count / mean / SD / ES for chronograph strings.
+
+Running curves used to recompute np.std() on every prefix of a string, which
+is quadratic, and the templates summarize full pandas Series every time.
+VelocityStats keeps only six numbers (count, mean, M2, min, max and the
+derived ES) using Welford's update (it is a running_moments.RunningMoments
+with chronograph extras), so a million-shot chronograph log can be
+summarized with constant memory. Partial results from separate files or
+sessions combine with merge() (Chan et al. parallel update).
+
+Two modes:
+- push one shot at a time (VelocityStats.push), or fold a whole array in
+  one vectorized step (VelocityStats.update);
+- running_stats() returns the cumulative mean / SD / ES after every shot of
+  one or many strings at once.
+
+Usage:
+    from velocity_stats import VelocityStats, running_stats, summarize_csv
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from running_moments import RunningMoments
+
+
+class VelocityStats(RunningMoments):
+    """Welford accumulator for count, mean, M2, min and max of velocities, plus ES."""
+
+    __slots__ = ()
+
+    @property
+    def es(self):
+        """Extreme spread (max - min)."""
+        return self.max - self.min if self.count else float('nan')
+
+    def summary(self):
+        """Dict with the same columns as the template summary tables."""
+        return {
+            'n': self.count,
+            'Mean': self.mean if self.count else float('nan'),
+            'SD': self.sd,
+            'ES': self.es,
+            'Min': self.min if self.count else float('nan'),
+            'Max': self.max if self.count else float('nan'),
+        }
+
+    def __repr__(self):
+        return (f"VelocityStats(n={self.count}, mean={self.mean:.1f}, "
+                f"sd={self.sd:.2f}, es={self.es:.1f})")
+
+
+class RunningStats(NamedTuple):
+    """Cumulative statistics after each shot, from running_stats()."""
+    count: np.ndarray        # 1, 2, ..., n_shots
+    mean: np.ndarray         # Running mean, shape (..., n_shots)
+    sd: np.ndarray           # Running sample SD (NaN after one shot)
+    es: np.ndarray           # Running extreme spread (max - min)
+
+
+def running_stats(values):
+    """
+    Running mean, sample SD and ES after every shot of each string, for an
+    array shaped (..., n_shots). One cumulative pass, O(n) per string.
+
+    This is Welford's recurrence, vectorized along the shot axis: the
+    running means come from one cumulative sum, each shot's M2 increment
+    (x_k - mean_{k-1}) * (x_k - mean_k) is then computed for all shots at
+    once, and M2 is the cumulative sum of those non-negative increments.
+    Values are taken relative to each string's first shot so the large
+    common offset in velocities (~2,800 fps) does not eat precision.
+    """
+    values = np.asarray(values, dtype=float)
+    count = np.arange(1, values.shape[-1] + 1)
+
+    shifted = values - values[..., :1]
+    mean = np.cumsum(shifted, axis=-1) / count
+    previous_mean = np.concatenate([np.zeros_like(mean[..., :1]), mean[..., :-1]], axis=-1)
+    m2 = np.cumsum((shifted - previous_mean) * (shifted - mean), axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sd = np.sqrt(m2 / (count - 1))
+    sd[..., 0] = np.nan
+    mean += values[..., :1]
+
+    es = np.maximum.accumulate(values, axis=-1) - np.minimum.accumulate(values, axis=-1)
+    return RunningStats(count=count, mean=mean, sd=sd, es=es)
+
+
+def summarize_csv(path, value_column, group_column=None, chunksize=1_000_000):
+    """
+    Summarize a chronograph log too large to load at once.
+
+    Reads `path` in chunks of `chunksize` rows and folds each into a
+    VelocityStats accumulator. Returns a single accumulator, or a dict of
+    accumulators keyed by `group_column` (e.g. load or charge weight).
+    """
+    import pandas as pd
+
+    columns = [value_column] + ([group_column] if group_column else [])
+    if group_column is None:
+        total = VelocityStats()
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            total.update(chunk[value_column].dropna().to_numpy())
+        return total
+
+    totals = {}
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+        chunk = chunk.dropna()
+        for label, values in chunk.groupby(group_column)[value_column]:
+            totals.setdefault(label, VelocityStats()).update(values.to_numpy())
+    return totals
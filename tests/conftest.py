@@ -0,0 +1,21 @@
+"""
+The modules under test live in scripts/ and import each other by bare name
+(scripts/ is on sys.path when a script runs), so the tests do the same.
+Simulation results are cached in a per-session temporary directory, never
+in the repository's .cache/.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory, monkeypatch):
+    import simulation_cache
+
+    monkeypatch.setattr(simulation_cache, 'CACHE_DIR',
+                        tmp_path_factory.getbasetemp() / 'simulation_cache')
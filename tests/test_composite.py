@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from composite import composite_from_csv, composite_groups, segment_extreme_spread
+
+
+def brute_force_es(shots):
+    if len(shots) < 2:
+        return 0.0
+    pairs = shots[:, np.newaxis] - shots[np.newaxis]
+    return np.sqrt((pairs**2).sum(axis=-1)).max()
+
+
+@pytest.fixture(scope='module')
+def range_days():
+    """Ragged groups from two sessions that reuse group ids, rows shuffled."""
+    rng = np.random.default_rng(13)
+    rows = []
+    for session in ('spring', 'fall'):
+        for group_id, n_shots in enumerate([1, 3, 5, 5, 10, 20]):
+            center = rng.normal(0, 2, 2)
+            for shot in center + rng.normal(0, 0.5, (n_shots, 2)):
+                rows.append((session, group_id, *shot))
+    table = pd.DataFrame(rows, columns=['session', 'group_id', 'x_inches', 'y_inches'])
+    return table.sample(frac=1, random_state=1).reset_index(drop=True)
+
+
+def test_matches_a_loop_over_groups(range_days):
+    shots = range_days[['x_inches', 'y_inches']].to_numpy()
+    result = composite_groups(range_days.group_id.to_numpy(), shots,
+                              by=range_days.session.to_numpy())
+    assert list(result.composite_labels) == ['fall', 'spring']
+    np.testing.assert_array_equal(result.n_groups, [6, 6])
+
+    for c, session in enumerate(result.composite_labels):
+        in_session = range_days.session == session
+        pooled, pooled_ss, dof = [], 0.0, 0
+        for group_id, group in range_days[in_session].groupby('group_id'):
+            g = np.flatnonzero((result.group_composite == c) & (result.group_labels == group_id))
+            assert len(g) == 1
+            points = group[['x_inches', 'y_inches']].to_numpy()
+            centered = points - points.mean(axis=0)
+            radii = np.hypot(*centered.T)
+            assert result.group_n[g[0]] == len(points)
+            np.testing.assert_allclose(result.group_centers[g[0]], points.mean(axis=0))
+            assert result.group_es[g[0]] == pytest.approx(brute_force_es(points), rel=1e-12)
+            assert result.group_mr[g[0]] == pytest.approx(radii.mean(), rel=1e-12, abs=1e-15)
+            np.testing.assert_allclose(result.shots[group.index], centered, atol=1e-12)
+            pooled.append(centered)
+            pooled_ss += (radii**2).sum()
+            dof += len(points) - 1
+
+        pooled = np.concatenate(pooled)
+        assert result.n_shots[c] == len(pooled)
+        assert result.es[c] == pytest.approx(brute_force_es(pooled), rel=1e-12)
+        assert result.mr[c] == pytest.approx(np.hypot(*pooled.T).mean(), rel=1e-12)
+        assert result.sigma[c] == pytest.approx(np.sqrt(pooled_ss / (2 * dof)), rel=1e-12)
+
+
+def test_single_shot_groups_have_no_sigma(range_days):
+    spring = range_days[range_days.session == 'spring']
+    result = composite_groups(spring.group_id, spring[['x_inches', 'y_inches']])
+    assert len(result.composite_labels) == 1
+    assert np.isnan(result.group_sigma[result.group_n == 1]).all()
+    assert result.group_es[result.group_n == 1].tolist() == [0.0]
+
+
+def test_segment_es_with_empty_segments():
+    rng = np.random.default_rng(14)
+    shots = rng.normal(size=(40, 2))
+    codes = rng.choice([0, 2, 3], size=40)
+    es = segment_extreme_spread(shots, codes, 5)
+    expected = [brute_force_es(shots[codes == k]) for k in range(5)]
+    np.testing.assert_allclose(es, expected, rtol=1e-12)
+
+
+def test_from_csv(tmp_path, range_days):
+    path = tmp_path / 'shots.csv'
+    range_days.to_csv(path, index=False)
+    from_file = composite_from_csv(path, by='session')
+    direct = composite_groups(range_days.group_id.to_numpy(),
+                              range_days[['x_inches', 'y_inches']].to_numpy(),
+                              by=range_days.session.to_numpy())
+    np.testing.assert_allclose(from_file.es, direct.es)
+    np.testing.assert_allclose(from_file.sigma, direct.sigma)
+    with pytest.raises(ValueError):
+        composite_groups([0], np.zeros((1, 3, 2)))
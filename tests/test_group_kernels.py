@@ -0,0 +1,69 @@
+"""
+Without Numba installed the kernels are the plain Python functions, so the
+dispatch to them (and their arithmetic) is tested by forcing the backend.
+"""
+
+import numpy as np
+import pytest
+
+import group_kernels
+from group_metrics import enclosing_circle, extreme_spread
+from prefix_metrics import prefix_curves
+
+
+@pytest.fixture
+def kernel_backend(monkeypatch):
+    monkeypatch.setattr(group_kernels, '_backend', 'numba')
+
+
+@pytest.fixture
+def numpy_backend(monkeypatch):
+    monkeypatch.setattr(group_kernels, '_backend', 'numpy')
+
+
+def reference(function, *args, **kwargs):
+    saved, group_kernels._backend = group_kernels._backend, 'numpy'
+    try:
+        return function(*args, **kwargs)
+    finally:
+        group_kernels._backend = saved
+
+
+@pytest.mark.parametrize('method', ['pairs', 'hull'])
+def test_extreme_spread_kernels_match_numpy(kernel_backend, method):
+    shots = np.random.default_rng(1).normal(size=(20, 12, 2))
+    np.testing.assert_allclose(extreme_spread(shots, method),
+                               reference(extreme_spread, shots, method), rtol=1e-12)
+
+
+def test_welzl_kernel_matches_numpy(kernel_backend):
+    shots = np.random.default_rng(2).normal(size=(15, 20, 2))
+    circle = enclosing_circle(shots)
+    expected = reference(enclosing_circle, shots)
+    np.testing.assert_allclose(circle.radius, expected.radius, rtol=1e-12)
+    np.testing.assert_allclose(circle.center, expected.center, atol=1e-12)
+
+
+def test_prefix_es_kernel_matches_numpy(kernel_backend):
+    shots = np.random.default_rng(3).normal(size=(10, 25, 2))
+    np.testing.assert_allclose(prefix_curves(shots).es,
+                               reference(prefix_curves, shots).es, rtol=1e-12)
+
+
+@pytest.mark.parametrize('backend', ['kernel_backend', 'numpy_backend'])
+@pytest.mark.parametrize('shape', [(0, 2), (3, 0, 2), (0, 5, 2), (0, 80, 2)])
+def test_empty_input(request, backend, shape):
+    request.getfixturevalue(backend)
+    shots = np.zeros(shape)
+    for method in ('pairs', 'hull'):
+        np.testing.assert_array_equal(extreme_spread(shots, method), np.zeros(shape[:-2]))
+    assert prefix_curves(shots).es.shape == shape[:-1]
+    np.testing.assert_array_equal(enclosing_circle(shots).radius, np.zeros(shape[:-2]))
+
+
+def test_backend_selection(monkeypatch):
+    with pytest.raises(ValueError):
+        group_kernels.set_backend('cuda')
+    monkeypatch.setattr(group_kernels, '_backend', None)
+    monkeypatch.setenv(group_kernels.BACKEND_VARIABLE, 'numba')
+    assert group_kernels.get_backend() in group_kernels.available_backends()
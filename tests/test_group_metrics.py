@@ -0,0 +1,265 @@
+import itertools
+
+import numpy as np
+import pytest
+
+import group_kernels
+import group_metrics
+from group_metrics import (chi_bias_factor, containment_radius, convex_hull, enclosing_circle,
+                           enclosing_diameter, estimate_sigma, extreme_spread, mean_radius,
+                           shape_metrics)
+
+
+def reference_enclosing_radius(points):
+    """Smallest circle through 2 (as diameter) or 3 points that holds them all."""
+    best = np.inf
+    candidates = [((p + q) / 2) for p, q in itertools.combinations(points, 2)]
+    for a, b, c in itertools.combinations(points, 3):
+        d = 2 * ((b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0]))
+        if d == 0:
+            continue
+        b2 = (b[0] - a[0])**2 + (b[1] - a[1])**2
+        c2 = (c[0] - a[0])**2 + (c[1] - a[1])**2
+        candidates.append(a + np.array([(c[1] - a[1]) * b2 - (b[1] - a[1]) * c2,
+                                        (b[0] - a[0]) * c2 - (c[0] - a[0]) * b2]) / d)
+    for center in candidates:
+        best = min(best, max(np.hypot(*(p - center)) for p in points))
+    return best
+
+
+@pytest.fixture
+def groups():
+    return np.random.default_rng(11).normal(size=(60, 7, 2))
+
+
+def test_enclosing_circle_matches_reference(groups):
+    circle = enclosing_circle(groups)
+    expected = [reference_enclosing_radius(group) for group in groups]
+    np.testing.assert_allclose(circle.radius, expected, rtol=1e-12)
+    reach = np.hypot(*np.moveaxis(groups - circle.center[:, np.newaxis], -1, 0)).max(axis=-1)
+    np.testing.assert_allclose(reach, circle.radius, rtol=1e-12)
+
+
+def test_enclosing_circle_brute_force_and_welzl_agree(groups, monkeypatch):
+    brute = enclosing_circle(groups)
+    monkeypatch.setattr(group_metrics, 'ENCLOSING_BRUTE_FORCE_MAX', 2)
+    welzl = enclosing_circle(groups)
+    np.testing.assert_allclose(welzl.radius, brute.radius, rtol=1e-9)
+    np.testing.assert_allclose(welzl.center, brute.center, atol=1e-9)
+
+
+def test_enclosing_circle_chunking_is_invisible(groups, monkeypatch):
+    whole = enclosing_circle(groups)
+    monkeypatch.setattr(group_metrics, 'PAIR_CHUNK_SIZE', 500)
+    sliced = enclosing_circle(groups)
+    np.testing.assert_array_equal(sliced.radius, whole.radius)
+    np.testing.assert_array_equal(sliced.center, whole.center)
+
+
+def test_enclosing_diameter_bounds(groups):
+    diameter = enclosing_diameter(groups)
+    es = extreme_spread(groups)
+    assert np.all(diameter >= es - 1e-12)
+    assert np.all(diameter <= 2 / np.sqrt(3) * es + 1e-12)
+
+
+def test_enclosing_circle_of_empty_and_single_shot_groups():
+    empty = enclosing_circle(np.zeros((3, 0, 2)))
+    np.testing.assert_array_equal(empty.radius, np.zeros(3))
+    np.testing.assert_array_equal(empty.center, np.zeros((3, 2)))
+    single = enclosing_circle([[1.5, -2.0]])
+    assert single.radius == 0
+    np.testing.assert_array_equal(single.center, [1.5, -2.0])
+
+
+def reference_minimal_containment(points, count):
+    """Smallest enclosing circle over every subset of `count` shots."""
+    return min(enclosing_circle(points[list(subset)]).radius
+               for subset in itertools.combinations(range(len(points)), count))
+
+
+def test_minimal_containment_is_exact(groups, monkeypatch):
+    fractions = [0.2, 0.5, 0.9, 1.0]
+    radius = containment_radius(groups[:20], fractions, about='minimal')
+    counts = np.ceil(np.array(fractions) * 7 - 1e-9).astype(int)
+    expected = [[reference_minimal_containment(group, k) for k in counts]
+                for group in groups[:20]]
+    np.testing.assert_allclose(radius, expected, rtol=1e-12)
+
+    monkeypatch.setattr(group_metrics, 'PAIR_CHUNK_SIZE', 40)
+    np.testing.assert_array_equal(containment_radius(groups[:20], fractions, about='minimal'),
+                                  radius)
+
+
+def test_containment_radius_orders_and_fixed_centers(groups):
+    minimal = containment_radius(groups, 0.5, about='minimal')
+    about_center = containment_radius(groups, 0.5)
+    assert np.all(minimal <= about_center + 1e-12)
+    np.testing.assert_allclose(containment_radius(groups, 1.0, about='minimal'),
+                               enclosing_circle(groups).radius)
+    centered = groups - groups.mean(axis=1, keepdims=True)
+    radii = np.sort(np.hypot(centered[..., 0], centered[..., 1]), axis=-1)
+    np.testing.assert_allclose(about_center, radii[:, 3])
+    np.testing.assert_allclose(containment_radius(groups, 1 / 7, about='minimal'), 0)
+
+
+@pytest.mark.parametrize('angle', [0.0, 0.3, np.pi / 2, 2.0])
+def test_shape_metrics_of_a_rotated_ellipse(angle):
+    a, b = 3.0, 1.0  # Semi-axes
+    t = np.linspace(0, 2 * np.pi, 100_000, endpoint=False)
+    ellipse = np.column_stack([a * np.cos(t), b * np.sin(t)])
+    rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+    shots = ellipse @ rotation.T + [4.0, -2.0]
+
+    shape = shape_metrics(shots)
+    cos2, sin2 = np.cos(angle)**2, np.sin(angle)**2
+    width = 2 * np.sqrt(a**2 * cos2 + b**2 * sin2)
+    height = 2 * np.sqrt(a**2 * sin2 + b**2 * cos2)
+    assert shape.width == pytest.approx(width, rel=1e-8)
+    assert shape.height == pytest.approx(height, rel=1e-8)
+    assert shape.aspect_ratio == pytest.approx(height / width, rel=1e-8)
+    assert shape.figure_of_merit == pytest.approx((width + height) / 2, rel=1e-8)
+    # Points spread evenly in t put variance (a²cos² + b²sin²) / 2 on x
+    ddof = len(t) / (len(t) - 1)
+    assert shape.sd_x == pytest.approx(np.sqrt(ddof * (a**2 * cos2 + b**2 * sin2) / 2), rel=1e-8)
+    assert shape.sd_y == pytest.approx(np.sqrt(ddof * (a**2 * sin2 + b**2 * cos2) / 2), rel=1e-8)
+
+
+def test_shape_metrics_of_degenerate_groups():
+    groups = np.array([[[1.0, 2.0]] * 3,                     # One hole
+                       [[0.0, 0.0], [0.0, 1.0], [0.0, 3.0]],  # Vertical line
+                       [[0.0, 0.0], [1.0, 0.0], [3.0, 0.0]]])  # Horizontal line
+    shape = shape_metrics(groups)
+    np.testing.assert_array_equal(shape.width, [0, 0, 3])
+    np.testing.assert_array_equal(shape.height, [0, 3, 0])
+    np.testing.assert_array_equal(shape.aspect_ratio, [1, np.inf, 0])
+    np.testing.assert_array_equal(shape.sd_x[[0, 1]], 0)
+
+    single = shape_metrics([[1.0, 2.0]])
+    assert single.aspect_ratio == 1.0
+    assert np.isnan(single.sd_x) and np.isnan(single.sd_y)
+
+
+@pytest.mark.parametrize('n_shots', [2, 3, 5])
+def test_rayleigh_sigma_is_unbiased_for_small_groups(n_shots):
+    shots = np.random.default_rng(n_shots).normal(0, 1.5, (200_000, n_shots, 2))
+    sigma = estimate_sigma(shots)
+    assert sigma.rayleigh_sigma.mean() == pytest.approx(1.5, rel=0.005)
+    assert sigma.rayleigh_sigma_raw.mean() == pytest.approx(
+        1.5 * chi_bias_factor(2 * (n_shots - 1)), rel=0.005)
+    np.testing.assert_allclose(sigma.rsd, np.sqrt(2) * sigma.rayleigh_sigma_raw)
+
+
+def test_covariance_ellipse_matches_eigh():
+    rng = np.random.default_rng(16)
+    cov = np.array([[4.0, 1.5], [1.5, 1.0]])
+    shots = rng.multivariate_normal([1.0, -1.0], cov, size=(20, 50))
+    shots[0] = rng.normal(0, 1, (50, 2)) * [0.5, 2.0]  # Vertical major axis
+
+    sigma = estimate_sigma(shots)
+    for group, sd_major, sd_minor, angle, got in zip(shots, sigma.sd_major, sigma.sd_minor,
+                                                      sigma.angle, sigma.cov):
+        expected = np.cov(group.T)
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+        values, vectors = np.linalg.eigh(expected)
+        assert sd_minor == pytest.approx(np.sqrt(values[0]), rel=1e-10)
+        assert sd_major == pytest.approx(np.sqrt(values[1]), rel=1e-10)
+        direction = np.array([np.cos(angle), np.sin(angle)])
+        assert abs(direction @ vectors[:, 1]) == pytest.approx(1.0, abs=1e-10)
+        assert -np.pi / 2 < angle <= np.pi / 2
+    assert abs(sigma.angle[0]) == pytest.approx(np.pi / 2, abs=0.3)
+    assert np.median(sigma.angle[1:]) == pytest.approx(0.5 * np.arctan2(3.0, 3.0), abs=0.1)
+
+
+def test_estimate_sigma_needs_two_shots():
+    with pytest.raises(ValueError):
+        estimate_sigma(np.zeros((4, 1, 2)))
+
+
+DEGENERATE_GROUPS = {
+    'two shots': [[0.0, 0.0], [3.0, 4.0]],
+    'one hole': [[1.0, 2.0]] * 3,
+    'two holes': [[0.0, 0.0], [1.0, 1.0], [0.0, 0.0], [1.0, 1.0], [1.0, 1.0]],
+    'collinear triple': [[0.0, 0.0], [2.0, 1.0], [1.0, 0.5]],
+    'vertical line': [[0.0, 3.0], [0.0, -1.0], [0.0, 0.5], [0.0, 2.0]],
+    'collinear 50': np.outer(np.random.default_rng(17).permutation(50), [1.5, -0.5]),
+    'square with repeats': [[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0]] * 20
+                           + [[0.5, 0.5], [0.5, 0.0]],
+}
+
+
+def assert_is_hull_of(hull, points):
+    """CCW, strictly convex, built from the points and holding all of them."""
+    assert all(any(np.array_equal(v, p) for p in points) for v in hull)
+    if len(hull) < 3:
+        return
+    edges = np.roll(hull, -1, axis=0) - hull
+    following = np.roll(edges, -1, axis=0)
+    assert np.all(edges[:, 0] * following[:, 1] - edges[:, 1] * following[:, 0] > 0)
+    rel = points[:, np.newaxis] - hull[np.newaxis]
+    assert np.all(edges[:, 0] * rel[..., 1] - edges[:, 1] * rel[..., 0] >= -1e-12)
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'numba'])
+@pytest.mark.parametrize('n_shots', [2, 3, 50, 500])
+def test_hull_es_matches_pairs(monkeypatch, backend, n_shots):
+    monkeypatch.setattr(group_kernels, '_backend', backend)
+    shots = np.random.default_rng(n_shots).normal(size=(6, n_shots, 2)) * [1.0, 0.3]
+    np.testing.assert_allclose(extreme_spread(shots, 'hull'), extreme_spread(shots, 'pairs'),
+                               rtol=1e-12)
+    for group in shots:
+        assert_is_hull_of(convex_hull(group), group)
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'numba'])
+@pytest.mark.parametrize('name', list(DEGENERATE_GROUPS))
+def test_hull_es_matches_pairs_on_degenerate_groups(monkeypatch, backend, name):
+    monkeypatch.setattr(group_kernels, '_backend', backend)
+    group = np.asarray(DEGENERATE_GROUPS[name], dtype=float)
+    assert extreme_spread(group, 'hull') == pytest.approx(extreme_spread(group, 'pairs'),
+                                                          rel=1e-12, abs=0)
+    hull = convex_hull(group)
+    assert_is_hull_of(hull, group)
+    assert len(hull) == {'one hole': 1, 'square with repeats': 4}.get(name, 2)
+
+
+def brute_force_group(group, aim_point):
+    """ES, MR, aim-point MR and center of one group with a double loop over its shots."""
+    shots = [shot for shot in group if not np.isnan(shot).any()]
+    if not shots:
+        return 0.0, np.nan, np.nan, np.full(2, np.nan)
+    es = 0.0
+    for i in range(len(shots)):
+        for j in range(i + 1, len(shots)):
+            es = max(es, np.hypot(*(shots[i] - shots[j])))
+    center = np.mean(shots, axis=0)
+    mr = np.mean([np.hypot(*(shot - center)) for shot in shots])
+    mr_aim = np.mean([np.hypot(*(shot - aim_point)) for shot in shots])
+    return es, mr, mr_aim, center
+
+
+@pytest.mark.parametrize('backend', ['numpy', 'numba'])
+@pytest.mark.parametrize('n_shots', [1, 2, 5, 70])
+def test_batched_metrics_match_a_loop_over_groups(monkeypatch, backend, n_shots):
+    monkeypatch.setattr(group_kernels, '_backend', backend)
+    rng = np.random.default_rng(n_shots)
+    shots = rng.normal(0, 1, (3, 4, n_shots, 2))
+    kept = rng.integers(0, n_shots + 1, size=(3, 4))  # Ragged groups padded with NaN
+    kept[0, :2] = n_shots, 0
+    shots[np.arange(n_shots) >= kept[..., np.newaxis]] = np.nan
+    aim_point = np.array([0.3, -0.1])
+
+    metrics = group_metrics.group_metrics(shots, aim_point)
+    es = {method: extreme_spread(shots, method) for method in ('auto', 'pairs', 'hull')}
+    mr = mean_radius(shots)
+    mr_aim = mean_radius(shots, about='aim', aim_point=aim_point)
+    for index in np.ndindex(shots.shape[:-2]):
+        expected = brute_force_group(shots[index], aim_point)
+        for method in es:
+            assert es[method][index] == pytest.approx(expected[0], rel=1e-12, abs=0)
+        assert metrics.es[index] == pytest.approx(expected[0], rel=1e-12, abs=0)
+        for got in (metrics.mr[index], mr[index]):
+            np.testing.assert_allclose(got, expected[1], rtol=1e-12, atol=1e-15)
+        for got in (metrics.mr_aim[index], mr_aim[index]):
+            np.testing.assert_allclose(got, expected[2], rtol=1e-12)
+        np.testing.assert_allclose(metrics.center[index], expected[3], rtol=1e-12)
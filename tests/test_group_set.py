@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import group_set
+from group_metrics import extreme_spread, mean_radius
+from group_set import GroupSet
+
+
+@pytest.fixture
+def ragged():
+    rng = np.random.default_rng(7)
+    counts = rng.integers(1, 12, 40)
+    ids = np.repeat(np.arange(len(counts)) * 3, counts)
+    shots = rng.normal(size=(len(ids), 2))
+    order = rng.permutation(len(ids))
+    return ids[order], shots[order]
+
+
+def test_metrics_match_per_group_reference(ragged, monkeypatch):
+    ids, shots = ragged
+    monkeypatch.setattr(group_set, 'WORKING_CHUNK_SHOTS', 17)  # force many slices
+    groups = GroupSet.from_long(ids, shots)
+
+    np.testing.assert_array_equal(groups.labels, np.unique(ids))
+    for label, group, es, mr, center in zip(groups.labels, groups, groups.extreme_spread(),
+                                            groups.mean_radius(), groups.centers()):
+        expected = shots[ids == label].astype(np.float32).astype(float)
+        np.testing.assert_array_equal(group, expected.astype(np.float32))
+        assert es == pytest.approx(extreme_spread(expected), abs=1e-12)
+        assert mr == pytest.approx(mean_radius(expected), abs=1e-12)
+        np.testing.assert_allclose(center, expected.mean(axis=0), atol=1e-12)
+
+
+def test_batch_round_trip_and_views(tmp_path):
+    shots = np.random.default_rng(1).normal(size=(6, 5, 2))
+    groups = GroupSet.from_batch(shots)
+
+    assert groups.is_uniform()
+    assert np.shares_memory(groups[2], groups.coords)
+    np.testing.assert_array_equal(groups.as_batch(), shots.astype(np.float32))
+
+    groups.save(tmp_path / 'groups.npz')
+    loaded = GroupSet.load(tmp_path / 'groups.npz')
+    np.testing.assert_array_equal(loaded.coords, groups.coords)
+    np.testing.assert_array_equal(loaded.offsets, groups.offsets)
+    np.testing.assert_array_equal(loaded.labels, groups.labels)
+
+
+def test_memory_is_eight_bytes_per_shot_and_sixteen_per_group():
+    groups = GroupSet.from_batch(np.zeros((1000, 10, 2)))
+    assert groups.nbytes == 8 * groups.n_shots + 16 * len(groups) + 8
+
+
+def test_rejects_bad_offsets():
+    with pytest.raises(ValueError):
+        GroupSet(np.zeros((4, 2)), [0, 3, 2, 4])
+    with pytest.raises(ValueError):
+        GroupSet(np.zeros((4, 2)), [0, 2], labels=['a', 'b'])
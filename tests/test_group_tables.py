@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+import group_tables
+from group_tables import (TABLE_VERSION, es_from_sigma, load_tables, ratio_mean,
+                          ratio_quantile, ratio_sd, sigma_from_es)
+
+
+def test_stored_table_is_current_and_records_its_settings():
+    table = load_tables()
+    assert int(table['version']) == TABLE_VERSION
+    assert int(table['seed']) == group_tables.DEFAULT_SEED
+    assert int(table['n_strings']) == group_tables.DEFAULT_STRINGS
+    assert int(table['chunk_size']) > 0
+
+
+def test_two_shot_es_is_rayleigh():
+    # The difference of two shots is normal with per-axis variance 2
+    exact = stats.rayleigh(scale=np.sqrt(2))
+    se = exact.std() / np.sqrt(group_tables.DEFAULT_STRINGS)
+    assert ratio_mean('es', 2) == pytest.approx(exact.mean(), abs=4 * se)
+    assert ratio_sd('es', 2) == pytest.approx(exact.std(), rel=0.01)
+    assert ratio_quantile('es', 2, 0.5) == pytest.approx(exact.median(), rel=0.01)
+
+
+def test_mean_radius_matches_brute_force():
+    shots = np.random.default_rng(3).standard_normal((200_000, 10, 2))
+    centered = shots - shots.mean(axis=1, keepdims=True)
+    mr = np.hypot(centered[..., 0], centered[..., 1]).mean(axis=1)
+    assert ratio_mean('mr', 10) == pytest.approx(mr.mean(), rel=0.005)
+
+
+def test_interpolation_and_conversions():
+    assert ratio_mean('es', 5.5) == pytest.approx((ratio_mean('es', 5) + ratio_mean('es', 6)) / 2)
+    np.testing.assert_allclose(ratio_quantile('es', [3, 5], [0.1, 0.9]).shape, (2, 2))
+    assert sigma_from_es(es_from_sigma(0.7, 5), 5) == pytest.approx(0.7)
+    with pytest.raises(ValueError):
+        ratio_mean('es', 1)
+    with pytest.raises(ValueError):
+        ratio_mean('cep', 5)
+
+
+def test_stale_version_is_rejected(tmp_path):
+    with np.load(group_tables.TABLE_PATH) as data:
+        table = {key: data[key] for key in data.files}
+    table['version'] = np.int64(TABLE_VERSION - 1)
+    stale = tmp_path / 'stale.npz'
+    np.savez(stale, **table)
+    with pytest.raises(ValueError, match='table version'):
+        load_tables(stale)
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from hypothesis_tests import f_test, levene, rejection_rate, ttest_ind
+
+
+@pytest.fixture(scope='module')
+def samples():
+    rng = np.random.default_rng(10)
+    return rng.normal(100, 4, (200, 8)), rng.normal(101, 6, (200, 12))
+
+
+@pytest.mark.parametrize('equal_var', [True, False])
+def test_ttest_matches_scipy(samples, equal_var):
+    a, b = samples
+    result = ttest_ind(a, b, equal_var=equal_var)
+    expected = stats.ttest_ind(a, b, axis=-1, equal_var=equal_var)
+    np.testing.assert_allclose(result.statistic, expected.statistic, rtol=1e-10)
+    np.testing.assert_allclose(result.pvalue, expected.pvalue, rtol=1e-8)
+
+    along_rows = ttest_ind(a.T, b.T, axis=0, equal_var=equal_var)
+    np.testing.assert_allclose(along_rows.pvalue, result.pvalue, rtol=1e-12)
+
+
+@pytest.mark.parametrize('center', ['median', 'mean'])
+def test_levene_matches_scipy(samples, center):
+    a, b = samples
+    c = a[:, :5] * 1.5
+    result = levene(a, b, c, center=center)
+    for i in range(0, len(a), 37):
+        expected = stats.levene(a[i], b[i], c[i], center=center)
+        assert result.statistic[i] == pytest.approx(expected.statistic, rel=1e-10)
+        assert result.pvalue[i] == pytest.approx(expected.pvalue, rel=1e-8)
+
+
+def test_f_test_against_direct_formula(samples):
+    a, b = samples
+    result = f_test(a, b)
+    for i in range(0, len(a), 37):
+        f = a[i].var(ddof=1) / b[i].var(ddof=1)
+        tail = min(stats.f.cdf(f, 7, 11), stats.f.sf(f, 7, 11))
+        assert result.statistic[i] == pytest.approx(f, rel=1e-12)
+        assert result.pvalue[i] == pytest.approx(min(2 * tail, 1.0), rel=1e-10)
+
+
+def test_false_alarm_rate_is_alpha():
+    rng = np.random.default_rng(11)
+    a, b = rng.normal(0, 1, (2, 40_000, 10))
+    for test in (ttest_ind, f_test):
+        assert rejection_rate(test(a, b).pvalue) == pytest.approx(0.05, abs=0.005)
+    # The median-centered (Brown-Forsythe) test is conservative in small samples
+    assert 0.03 < rejection_rate(levene(a, b).pvalue) <= 0.05
+
+
+def test_levene_validation(samples):
+    with pytest.raises(ValueError):
+        levene(samples[0])
+    with pytest.raises(ValueError):
+        levene(*samples, center='trimmed')
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from group_metrics import extreme_spread
+from order_statistics import group_size_distribution
+
+N_GROUPS = 200_000
+
+
+@pytest.fixture(scope='module')
+def two_shot():
+    return group_size_distribution(2, n_groups=N_GROUPS)
+
+
+def test_two_shot_es_is_rayleigh(two_shot):
+    # Two-shot ES is Rayleigh with scale sqrt(2); the best of k is Rayleigh
+    # with scale sqrt(2 / k)
+    exact = stats.rayleigh(scale=np.sqrt(2))
+    assert two_shot.mean() == pytest.approx(exact.mean(), rel=0.005)
+    x = np.array([0.5, 1.0, 2.0, 3.0])
+    np.testing.assert_allclose(two_shot.cdf(x), exact.cdf(x), atol=0.003)
+
+    k = np.array([2, 5, 20])
+    best = two_shot.order_statistic(k)
+    np.testing.assert_allclose(best.mean(), np.sqrt(np.pi / k), rtol=0.005)
+    np.testing.assert_allclose(best.cdf(0.5), stats.rayleigh(scale=np.sqrt(2 / k)).cdf(0.5),
+                               atol=0.003)
+
+
+def test_ranks_against_brute_force_sets():
+    distribution = group_size_distribution(5, n_groups=N_GROUPS)
+    sets = extreme_spread(np.random.default_rng(4).standard_normal((40_000, 6, 5, 2)))
+    ordered = np.sort(sets, axis=1)
+    for rank in (1, 3, 6):
+        statistic = distribution.order_statistic(6, rank)
+        assert statistic.mean() == pytest.approx(ordered[:, rank - 1].mean(), rel=0.01)
+        assert statistic.quantile(0.5) == pytest.approx(
+            np.median(ordered[:, rank - 1]), rel=0.015)
+
+
+def test_order_statistic_validation(two_shot):
+    with pytest.raises(ValueError):
+        two_shot.order_statistic(3, 4)
+    with pytest.raises(ValueError):
+        group_size_distribution(1)
+    with pytest.raises(ValueError):
+        group_size_distribution(5, metric='cep')
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from group_metrics import extreme_spread
+from prefix_metrics import PrefixGroupTracker, prefix_curves
+
+
+def brute_force_prefixes(string, aim_point):
+    """ES, MR, aim-point MR and center of every prefix, each from scratch."""
+    es, mr, mr_aim, center = [], [], [], []
+    for n in range(1, len(string) + 1):
+        prefix = string[:n]
+        pairs = prefix[:, np.newaxis] - prefix[np.newaxis]
+        es.append(np.sqrt((pairs**2).sum(axis=-1)).max())
+        center.append(prefix.mean(axis=0))
+        mr.append(np.hypot(*(prefix - center[-1]).T).mean())
+        mr_aim.append(np.hypot(*(prefix - aim_point).T).mean())
+    return np.array(es), np.array(mr), np.array(mr_aim), np.array(center)
+
+
+@pytest.fixture(scope='module')
+def strings():
+    rng = np.random.default_rng(12)
+    return rng.normal(0, 1, (3, 4, 30, 2)) * [1.0, 0.4]
+
+
+def test_prefix_curves_match_brute_force(strings):
+    aim_point = (0.5, -0.2)
+    curves = prefix_curves(strings, aim_point)
+    assert curves.es.shape == (3, 4, 30)
+    assert curves.center.shape == (3, 4, 30, 2)
+    for index in np.ndindex(strings.shape[:2]):
+        expected = brute_force_prefixes(strings[index], np.array(aim_point))
+        for got, want in zip((curves.es, curves.mr, curves.mr_aim, curves.center), expected):
+            np.testing.assert_allclose(got[index], want, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(curves.es[..., -1], extreme_spread(strings), rtol=1e-12)
+
+
+def test_tracker_matches_prefix_curves(strings):
+    string = strings[0, 0]
+    curves = prefix_curves(string)
+    tracker = PrefixGroupTracker(capacity=4)  # Forces the buffer to grow
+    for n, (x, y) in enumerate(string):
+        assert tracker.push(x, y) == pytest.approx(curves.es[n], rel=1e-12)
+        assert tracker.mr == pytest.approx(curves.mr[n], rel=1e-12)
+        assert tracker.mr_aim == pytest.approx(curves.mr_aim[n], rel=1e-12)
+        np.testing.assert_allclose(tracker.center, curves.center[n], rtol=1e-12)
+    assert tracker.count == len(string)
+    assert len(tracker.hull) < len(string)
+
+
+def test_empty_tracker():
+    tracker = PrefixGroupTracker()
+    assert tracker.es == 0.0
+    assert np.isnan(tracker.mr)
+    assert np.isnan(tracker.mr_aim)
+    assert np.isnan(tracker.center).all()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from sampling_distributions import (mean_interval, prob_sd_lower, prob_sd_within,
+                                    sample_string_stats, sd_cdf, sd_interval, sd_mean,
+                                    sd_quantile, sd_sd)
+
+
+@pytest.fixture(scope='module')
+def simulated_sds():
+    strings = np.random.default_rng(9).normal(2850, 15, (400_000, 10))
+    return strings.std(axis=1, ddof=1)
+
+
+def test_sd_distribution_matches_simulation(simulated_sds):
+    se = 1 / np.sqrt(len(simulated_sds))
+    assert sd_cdf(10, 15, 10) == pytest.approx(np.mean(simulated_sds < 10), abs=4 * se)
+    assert sd_cdf(10, 15, 10) == pytest.approx(0.0886, abs=5e-4)
+    assert sd_mean(15, 10) == pytest.approx(simulated_sds.mean(), rel=2e-3)
+    assert sd_sd(15, 10) == pytest.approx(simulated_sds.std(), rel=5e-3)
+    assert prob_sd_within(0.2, 15, 10) == pytest.approx(
+        np.mean(np.abs(simulated_sds - 15) <= 3), abs=4 * se)
+    np.testing.assert_allclose(sd_quantile([0.05, 0.95], 15, 10),
+                               np.quantile(simulated_sds, [0.05, 0.95]), rtol=5e-3)
+
+
+def test_sd_is_scaled_chi_square():
+    n = np.array([3, 5, 20])
+    sd = np.array([10.0, 12.0, 16.0])
+    expected = stats.chi2.cdf((n - 1) * sd**2 / 15**2, n - 1)
+    np.testing.assert_allclose(sd_cdf(sd, 15, n), expected, rtol=1e-12)
+    np.testing.assert_allclose(sd_cdf(sd_quantile(0.3, 15, n), 15, n), 0.3, rtol=1e-10)
+
+
+def test_intervals_cover_at_nominal_rate():
+    rng = np.random.default_rng(2)
+    strings = rng.normal(100, 4, (20_000, 8))
+    low, high = sd_interval(strings.std(axis=1, ddof=1), 8)
+    assert np.mean((low < 4) & (4 < high)) == pytest.approx(0.95, abs=0.01)
+    low, high = mean_interval(strings.mean(axis=1), strings.std(axis=1, ddof=1), 8)
+    assert np.mean((low < 100) & (100 < high)) == pytest.approx(0.95, abs=0.01)
+
+
+def test_needs_two_shots():
+    with pytest.raises(ValueError):
+        sd_cdf(10, 15, 1)
+
+
+def test_sampled_string_stats_match_shot_level_strings():
+    drawn = sample_string_stats(10, 2850, 15, size=400_000, rng=np.random.default_rng(5))
+    strings = np.random.default_rng(6).normal(2850, 15, (400_000, 10))
+    for sampled, direct in ((drawn.mean, strings.mean(axis=1)),
+                            (drawn.sd, strings.std(axis=1, ddof=1))):
+        assert stats.ks_2samp(sampled, direct).pvalue > 1e-3
+    assert sample_string_stats(5, 0, np.array([1.0, 2.0]), size=(3, 2)).sd.shape == (3, 2)
+
+
+def test_prob_sd_lower_matches_simulation():
+    assert prob_sd_lower(15, 15, 10) == pytest.approx(0.5, abs=1e-12)
+    rng = np.random.default_rng(7)
+    better = rng.normal(0, 13, (200_000, 10)).std(axis=1, ddof=1)
+    other = rng.normal(0, 15, (200_000, 20)).std(axis=1, ddof=1)
+    assert prob_sd_lower(13, 15, 10, 20) == pytest.approx(np.mean(better < other), abs=0.004)
+    assert prob_sd_lower(13, 15, 50) > prob_sd_lower(13, 15, 10) > 0.5
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from composite import composite_groups
+from segmentation import (assign_to_aim_points, composite_from_target, grid_aim_points, kmeans,
+                          segment_target)
+
+ROWS, COLS, SPACING = 5, 2, (3.0, 2.0)
+
+
+@pytest.fixture(scope='module')
+def target():
+    """One 5-shot group per aim point of a known 5x2 grid, shots in shuffled order."""
+    rng = np.random.default_rng(15)
+    aim_points = grid_aim_points(ROWS, COLS, SPACING, origin=(1.0, 1.0))
+    labels = np.repeat(np.arange(len(aim_points)), 5)
+    offsets = rng.normal(0, 0.25, (len(labels), 2))
+    order = rng.permutation(len(labels))
+    return aim_points, labels[order], (aim_points[labels] + offsets)[order]
+
+
+def test_grid_layout():
+    points = grid_aim_points(2, 3, 1.5, origin=(1.0, -1.0))
+    np.testing.assert_allclose(points, [[1, -1], [2.5, -1], [4, -1],
+                                        [1, 0.5], [2.5, 0.5], [4, 0.5]])
+
+
+def test_known_grid_matches_brute_force_nearest(target):
+    aim_points, _, shots = target
+    segmentation = assign_to_aim_points(shots, aim_points)
+    distances = np.hypot(*(shots[:, np.newaxis] - aim_points[np.newaxis]).transpose(2, 0, 1))
+    np.testing.assert_array_equal(segmentation.labels, distances.argmin(axis=1))
+    np.testing.assert_allclose(segmentation.distances, distances.min(axis=1))
+
+
+def test_estimated_grid_recovers_the_groups(target):
+    aim_points, labels, shots = target
+    segmentation = segment_target(shots, rows=ROWS, cols=COLS)
+    np.testing.assert_array_equal(aim_points[segmentation.labels], aim_points[labels])
+    group_centers = np.array([shots[labels == k].mean(axis=0) for k in range(len(aim_points))])
+    np.testing.assert_allclose(segmentation.aim_points, group_centers, atol=1e-9)
+
+    result = composite_from_target(shots, rows=ROWS, cols=COLS)
+    expected = composite_groups(labels, shots)
+    assert result.es[0] == pytest.approx(expected.es[0], rel=1e-12)
+    assert result.sigma[0] == pytest.approx(expected.sigma[0], rel=1e-12)
+
+
+def test_kmeans_keeps_empty_clusters_in_place():
+    shots = np.array([[0.0, 0.0], [0.2, 0.0], [5.0, 5.0]])
+    centers = kmeans(shots, [[0.0, 0.0], [5.0, 5.0], [50.0, 50.0]])
+    np.testing.assert_allclose(centers, [[0.1, 0.0], [5.0, 5.0], [50.0, 50.0]])
+
+
+def test_needs_aim_points_or_grid(target):
+    with pytest.raises(ValueError):
+        segment_target(target[2], rows=ROWS)
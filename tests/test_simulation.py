@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from sampling_distributions import sd_mean
+from simulation import MonteCarloKernel, normal_from_uniform, run_to_precision
+from streaming_stats import StreamSummary
+
+
+def standard_normal(rng, size):
+    return rng.standard_normal(size)
+
+
+def test_blocks_have_fixed_streams():
+    kernel = MonteCarloKernel(7, block_size=1000)
+    values = kernel.generate(2500, standard_normal)
+    assert values.shape == (2500,)
+    np.testing.assert_array_equal(values[1000:2000], kernel.block_rng(1).standard_normal(1000))
+    np.testing.assert_array_equal(values[2000:], kernel.block_rng(2).standard_normal(500))
+    np.testing.assert_array_equal(values, MonteCarloKernel(7, block_size=1000).generate(
+        2500, standard_normal))
+    assert not np.array_equal(values, MonteCarloKernel(8, block_size=1000).generate(
+        2500, standard_normal))
+    assert kernel.generate(0, standard_normal).shape == (0,)
+
+
+def test_results_do_not_depend_on_workers():
+    kernel = MonteCarloKernel(3, block_size=500)
+    serial = kernel.run(2200, standard_normal, max_workers=1)
+    np.testing.assert_array_equal(kernel.run(2200, standard_normal, max_workers=2), serial)
+
+    edges = np.linspace(-4, 4, 41)
+    streamed = kernel.stream(2200, standard_normal, StreamSummary(edges), max_workers=2)
+    assert streamed.count == 2200
+    assert streamed.mean == pytest.approx(serial.mean(), rel=1e-12)
+    np.testing.assert_array_equal(streamed.histogram.counts, np.histogram(serial, edges)[0])
+
+
+def test_run_to_precision_meets_tolerance():
+    kernel = MonteCarloKernel(5, block_size=2000)
+    result = kernel.run_to_precision(lambda rng, size: rng.normal(3.0, 2.0, size), 0.02)
+    assert result.converged
+    assert result.half_width <= 0.02
+    assert result.n_trials % 2000 == 0
+    assert abs(result.estimate - 3.0) < 3 * result.half_width
+    np.testing.assert_array_equal(result.values, kernel.run(
+        result.n_trials, lambda rng, size: rng.normal(3.0, 2.0, size), max_workers=1))
+
+    rng = np.random.default_rng(0)
+    capped = run_to_precision(lambda n: rng.random(n), 1e-6, initial_trials=100, max_trials=400)
+    assert not capped.converged
+    assert capped.n_trials == 400
+    with pytest.raises(ValueError):
+        run_to_precision(lambda n: rng.random(n), 0)
+
+
+def test_common_random_numbers_share_draws():
+    def measured_sd(rng, size, sigma):
+        return sigma * rng.standard_normal((size, 10)).std(axis=1, ddof=1)
+
+    report = MonteCarloKernel(11).common_random_numbers(20_000, measured_sd, [15, 13])
+    assert report.values.shape == (2, 20_000)
+    # Shared draws make the difference exactly -2/15 of the first scenario
+    np.testing.assert_allclose(report.values[1] - report.values[0], -2 / 15 * report.values[0])
+    assert report.estimate[0] == pytest.approx(-2 * sd_mean(1, 10), abs=3 * report.standard_error[0])
+    assert report.variance_reduction[0] > 50
+    assert report.naive_standard_error[0] == pytest.approx(
+        np.sqrt(report.values.var(axis=1, ddof=1).sum() / 20_000))
+
+
+def test_antithetic_pairs_cancel_linear_noise():
+    kernel = MonteCarloKernel(12)
+    linear = kernel.antithetic(5000, lambda z: 3 + 2 * z.mean(axis=1), shape=5)
+    assert linear.estimate == pytest.approx(3, abs=1e-12)
+    assert linear.n_trials == 10_000
+    even = kernel.antithetic(5000, lambda z: z.std(axis=1, ddof=1), shape=5)
+    assert even.variance_reduction == pytest.approx(0.5, rel=1e-3)  # Identical pairs
+
+
+def test_sobol_mean_sd_against_exact():
+    report = MonteCarloKernel(13).sobol(
+        1000, lambda u: normal_from_uniform(u).std(axis=1, ddof=1), 5)
+    assert report.values.shape == (16, 1024)
+    assert report.estimate == pytest.approx(sd_mean(1, 5), abs=4 * report.standard_error)
+    assert report.variance_reduction > 20
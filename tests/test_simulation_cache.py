@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+from typing import NamedTuple
+
+import numpy as np
+import pytest
+
+import simulation_cache
+from simulation_cache import cache_size, cached, clear_cache, evict
+
+SCALE = 2.0
+OFFSET = 2.0  # Read only by the helper below
+# Call log; a namespace is keyed by type only, so appending to it keeps keys stable
+calls = SimpleNamespace(log=[])
+
+
+class Pair(NamedTuple):
+    low: np.ndarray
+    high: float
+
+
+@cached
+def draw(n):
+    calls.log.append(n)
+    return np.random.normal(size=n) * SCALE
+
+
+def shifted(values):
+    return values - OFFSET
+
+
+@cached(global_rng=False)
+def shifted_total(values):
+    calls.log.append(len(values))
+    return float(shifted(values).sum())
+
+
+@cached(global_rng=False)
+def summary(values):
+    calls.log.append(len(values))
+    return Pair(low=np.sort(values)[:2], high=float(values.max()))
+
+
+@pytest.fixture(autouse=True)
+def _fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(simulation_cache, 'CACHE_DIR', tmp_path)
+    calls.log.clear()
+
+
+def test_hit_replays_result_and_global_state():
+    np.random.seed(5)
+    first = draw(4)
+    after_first = np.random.random()
+
+    np.random.seed(5)
+    second = draw(4)
+    np.testing.assert_array_equal(first, second)
+    assert np.random.random() == after_first
+    assert calls.log == [4]
+
+
+def test_key_follows_constants_arguments_and_seed(monkeypatch):
+    np.random.seed(1)
+    key = draw.cache_key(3)
+    assert draw.cache_key(4) != key
+    np.random.seed(2)
+    assert draw.cache_key(3) != key
+    np.random.seed(1)
+    monkeypatch.setitem(draw.__wrapped__.__globals__, 'SCALE', 3.0)
+    assert draw.cache_key(3) != key
+
+
+def test_key_follows_constants_read_by_helpers(monkeypatch):
+    values = np.arange(3.0)
+    assert shifted_total(values) == -3.0
+    monkeypatch.setitem(shifted_total.__wrapped__.__globals__, 'OFFSET', 20.0)
+    assert shifted_total(values) == -57.0
+    assert calls.log == [3, 3]
+
+
+def test_key_follows_shared_code_and_data(tmp_path, monkeypatch):
+    root = tmp_path / 'repo'
+    (root / 'scripts').mkdir(parents=True)
+    (root / 'data' / 'simulated').mkdir(parents=True)
+    library = root / 'scripts' / 'group_metrics.py'
+    library.write_text('A = 1\n')
+    table = root / 'data' / 'simulated' / 'table.npz'
+    table.write_bytes(b'v1')
+    plot = root / 'scripts' / 'plot_01_01_example.py'
+    plot.write_text('TITLE = "a"\n')
+    monkeypatch.setattr(simulation_cache, 'REPO_ROOT', root)
+
+    key = summary.cache_key(np.arange(5.0))
+    plot.write_text('TITLE = "b"\n')  # Plot scripts are not shared dependencies
+    assert summary.cache_key(np.arange(5.0)) == key
+    library.write_text('A = 2\n')
+    assert summary.cache_key(np.arange(5.0)) != key
+    key = summary.cache_key(np.arange(5.0))
+    table.write_bytes(b'v2')
+    assert summary.cache_key(np.arange(5.0)) != key
+    key = summary.cache_key(np.arange(5.0))
+    monkeypatch.setattr(simulation_cache, 'CACHE_FORMAT', simulation_cache.CACHE_FORMAT + 1)
+    assert summary.cache_key(np.arange(5.0)) != key
+
+
+def test_named_tuples_round_trip_without_touching_global_state():
+    values = np.array([3.0, 1.0, 2.0])
+    np.random.seed(0)
+    first = summary(values)
+    np.random.seed(1)
+    second = summary(values)
+    assert isinstance(second, Pair)
+    np.testing.assert_array_equal(first.low, second.low)
+    assert second.high == 3.0
+    assert calls.log == [3]
+
+
+def test_disabled_cache_always_runs(monkeypatch):
+    monkeypatch.setenv('SIMULATION_CACHE', '0')
+    summary(np.ones(2))
+    summary(np.ones(2))
+    assert calls.log == [2, 2]
+
+
+def test_eviction_and_clear(tmp_path):
+    for n in range(1, 4):
+        summary(np.arange(float(n + 2)))
+    assert cache_size(tmp_path) > 0
+    evict(tmp_path, max_bytes=cache_size(tmp_path) - 1)
+    assert len(list(tmp_path.glob('*.npz'))) == 2
+    clear_cache(tmp_path)
+    assert cache_size(tmp_path) == 0
+
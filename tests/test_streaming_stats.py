@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from streaming_stats import Histogram, QuantileSketch, StreamSummary
+
+EDGES = np.linspace(-3, 3, 121)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(8)
+    return np.concatenate([rng.normal(size=50_000), rng.lognormal(2, 1, 1000), [0.0, -1e-15]])
+
+
+def test_histogram_matches_numpy(values):
+    histogram = Histogram(EDGES)
+    for chunk in np.array_split(values, 7):
+        histogram.update(chunk)
+    np.testing.assert_array_equal(histogram.counts, np.histogram(values, EDGES)[0])
+    assert histogram.underflow == np.sum(values < EDGES[0])
+    assert histogram.overflow == np.sum(values > EDGES[-1])
+    for edge in EDGES[::10]:
+        assert histogram.fraction_below(edge) == pytest.approx(np.mean(values < edge), abs=1e-12)
+
+
+@pytest.mark.parametrize('accuracy', [0.01, 0.002])
+def test_sketch_quantiles_within_relative_accuracy(values, accuracy):
+    sketch = QuantileSketch(accuracy)
+    for chunk in np.array_split(values, 5):
+        sketch.update(chunk)
+    ordered = np.sort(values)
+    for p in (0.0, 0.001, 0.1, 0.5, 0.9, 0.999, 1.0):
+        exact = ordered[int(np.floor(p * (len(values) - 1)))]
+        assert abs(sketch.quantile(p) - exact) <= accuracy * abs(exact) + 1e-12
+
+
+def test_merge_equals_one_pass(values):
+    halves = np.array_split(values, 2)
+    merged = StreamSummary(EDGES).update(halves[0]).merge(StreamSummary(EDGES).update(halves[1]))
+    whole = StreamSummary(EDGES).update(values)
+    assert merged.count == whole.count == len(values)
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.sd == pytest.approx(values.std(ddof=1), rel=1e-10)
+    np.testing.assert_array_equal(merged.histogram.counts, whole.histogram.counts)
+    np.testing.assert_array_equal(merged.quantile([0.01, 0.5, 0.99]),
+                                  whole.quantile([0.01, 0.5, 0.99]))
+
+
+def test_empty_summary():
+    summary = StreamSummary(EDGES)
+    assert summary.count == 0
+    assert np.isnan(summary.quantile(0.5))
+    assert np.isnan(summary.fraction_below(0.0))
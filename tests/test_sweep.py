@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from simulation_studies import simulate_group_sets, simulate_groups
+from sweep import best_group_bias, cell_rng, sweep
+
+
+def test_cells_do_not_depend_on_the_rest_of_the_grid():
+    small = sweep(simulate_group_sets, {'true_moa': [1.0], 'groups_per_set': [3]},
+                  fixed={'shots_per_group': 5, 'n_sets': 2000},
+                  summarize=best_group_bias, max_workers=1, cache=False)
+    large = sweep(simulate_group_sets, {'true_moa': [1.0, 1.5], 'groups_per_set': [2, 3]},
+                  fixed={'shots_per_group': 5, 'n_sets': 2000},
+                  summarize=best_group_bias, max_workers=1, cache=False)
+    row = large[(large.true_moa == 1.0) & (large.groups_per_set == 3)]
+    assert len(large) == 4
+    assert row.mean_best.item() == small.mean_best.item()
+
+
+def test_cell_matches_a_direct_run():
+    params = {'true_moa': 1.5, 'shots_per_group': 5, 'groups_per_set': 10, 'n_sets': 500}
+    table = sweep(simulate_group_sets, {'groups_per_set': [10]}, fixed=params,
+                  summarize=best_group_bias, max_workers=1)
+    direct = simulate_group_sets(**params, rng=cell_rng(20240601, params))
+    assert table.mean_best.item() == pytest.approx(direct.min(axis=1).mean(), rel=1e-12)
+
+    cached = sweep(simulate_group_sets, {'groups_per_set': [10]}, fixed=params,
+                   summarize=best_group_bias, max_workers=1)
+    assert cached.equals(table)
+
+
+def test_cell_rng_is_order_independent():
+    a = cell_rng(1, {'x': 1, 'y': np.int64(2)}).random()
+    b = cell_rng(1, {'y': 2, 'x': 1}).random()
+    assert a == b
+    assert cell_rng(2, {'x': 1, 'y': 2}).random() != a
+
+
+def test_simulations_are_calibrated_to_five_shot_es():
+    rng = np.random.default_rng(0)
+    assert simulate_groups(200_000, 5, 1.5, rng).mean() == pytest.approx(1.5, rel=0.005)
+    sets = simulate_group_sets(1.5, 5, 4, 50_000, rng)
+    assert sets.shape == (50_000, 4)
+    assert sets.mean() == pytest.approx(1.5, rel=0.005)
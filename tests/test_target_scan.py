@@ -0,0 +1,75 @@
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from target_scan import detect_holes, holes_to_inches, otsu_threshold, read_grayscale, scan_target
+
+PPI = 100
+DIAMETER = 0.308
+
+
+def synthetic_target(holes, ink, paper=1.0, size=400, line=True):
+    """Noise-free two-tone target: round holes of gray level `ink` on `paper`."""
+    image = np.full((size, size), paper)
+    rows, cols = np.indices(image.shape)
+    radius = DIAMETER * PPI / 2
+    for row, col in holes:
+        image[(rows - row)**2 + (cols - col)**2 <= radius**2] = ink
+    if line:
+        image[:, 200] = ink  # A printed line, one pixel wide
+    return image
+
+
+@pytest.mark.parametrize('ink', [0.0, 0.1, 0.3])
+def test_clean_two_tone_target(ink):
+    centers = [(100.0, 100.0), (100.0, 300.0), (250.0, 150.0), (320.0, 320.0)]
+    image = synthetic_target(centers, ink)
+
+    holes = detect_holes(image, PPI, DIAMETER)
+
+    assert ink < holes.threshold <= 1.0
+    assert len(holes.rows) == len(centers)
+    found = sorted(zip(holes.rows, holes.cols))
+    np.testing.assert_allclose(found, sorted(centers), atol=1e-9)
+
+
+def test_backlit_target():
+    image = synthetic_target([(120.0, 80.0), (300.0, 260.0)], ink=1.0, paper=0.2, line=False)
+    holes = detect_holes(image, PPI, DIAMETER, dark_holes=False)
+    assert len(holes.rows) == 2
+
+
+def test_otsu_splits_two_classes():
+    image = np.concatenate([np.full(500, 0.25), np.full(1500, 0.8)])
+    threshold = otsu_threshold(image)
+    assert 0.25 < threshold <= 0.8
+    assert np.sum(image < threshold) == 500
+
+
+@pytest.mark.parametrize('level', [0.0, 0.6, 1.0])
+def test_uniform_scan_has_no_holes(level, tmp_path):
+    image = np.full((50, 60), level)
+    assert np.isnan(otsu_threshold(image))
+    for dark_holes in (True, False):
+        assert len(detect_holes(image, PPI, DIAMETER, dark_holes=dark_holes).rows) == 0
+
+    path = tmp_path / 'blank.png'
+    plt.imsave(path, image, cmap='gray', vmin=0, vmax=1)
+    assert len(scan_target(path, PPI, DIAMETER)) == 0
+
+
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16])
+def test_integer_images_scale_by_their_bit_depth(dtype, monkeypatch):
+    top = np.iinfo(dtype).max
+    counts = np.array([[0, top // 2], [top, top]], dtype=dtype)
+    monkeypatch.setattr(mpimg, 'imread', lambda path: counts)
+    np.testing.assert_allclose(read_grayscale('scan.tif'), counts / top)
+    assert read_grayscale('scan.tif').max() == 1.0
+
+
+def test_inches_from_pixels():
+    image = synthetic_target([(199.5, 299.5)], ink=0.0, line=False)
+    holes = detect_holes(image, PPI, DIAMETER)
+    shots = holes_to_inches(holes, PPI, image_shape=image.shape)
+    np.testing.assert_allclose(shots, [[1.0, 0.0]], atol=1e-9)
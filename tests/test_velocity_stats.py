@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from running_moments import RunningMoments
+from velocity_stats import VelocityStats, running_stats
+
+
+@pytest.fixture
+def velocities():
+    return np.random.default_rng(4).normal(2850, 12, 500)
+
+
+def test_push_update_and_merge_agree(velocities):
+    pushed = VelocityStats()
+    for v in velocities:
+        pushed.push(v)
+    updated = VelocityStats.from_values(velocities)
+    merged = VelocityStats.from_values(velocities[:123]).merge(
+        VelocityStats.from_values(velocities[123:]))
+
+    for stats in (pushed, updated, merged):
+        assert stats.count == len(velocities)
+        assert stats.mean == pytest.approx(velocities.mean(), rel=1e-12)
+        assert stats.sd == pytest.approx(velocities.std(ddof=1), rel=1e-9)
+        assert stats.es == velocities.max() - velocities.min()
+
+
+def test_merge_returns_same_type_and_leaves_inputs(velocities):
+    a = VelocityStats.from_values(velocities[:10])
+    b = VelocityStats.from_values(velocities[10:])
+    combined = a.merge(b)
+    assert isinstance(combined, VelocityStats)
+    assert a.count == 10 and b.count == len(velocities) - 10
+
+
+def test_empty_accumulator():
+    stats = VelocityStats()
+    assert stats.count == 0
+    assert np.isnan(stats.sd) and np.isnan(stats.es)
+    assert VelocityStats().merge(stats).count == 0
+
+
+def test_running_moments_is_generic(velocities):
+    moments = RunningMoments.from_values(velocities)
+    assert not hasattr(moments, 'es')
+    assert moments.sem == pytest.approx(velocities.std(ddof=1) / np.sqrt(len(velocities)))
+
+
+def test_running_stats_matches_prefix_brute_force():
+    strings = np.random.default_rng(5).normal(2850, 15, (7, 40))
+    curves = running_stats(strings)
+    for n in range(1, 41):
+        prefix = strings[:, :n]
+        np.testing.assert_allclose(curves.mean[:, n - 1], prefix.mean(axis=1), rtol=1e-13)
+        np.testing.assert_allclose(curves.es[:, n - 1], np.ptp(prefix, axis=1))
+        if n > 1:
+            np.testing.assert_allclose(curves.sd[:, n - 1], prefix.std(axis=1, ddof=1),
+                                       rtol=1e-10)
+    assert np.all(np.isnan(curves.sd[:, 0]))
+
+
+def test_running_stats_keeps_precision_at_large_offset():
+    # SD of 0.01 on a 1e9 offset: naive sums of squares lose every digit
+    values = 1e9 + np.random.default_rng(6).normal(0, 0.01, 1000)
+    curves = running_stats(values)
+    assert curves.sd[-1] == pytest.approx(values.std(ddof=1), rel=1e-6)